@@ -0,0 +1,267 @@
+"""partition enrollments (hash on course_id or range on created_at)
+
+Revision ID: 20261019_0001
+Revises: 20241128_0001
+Create Date: 2026-10-19 12:00:00.000000
+
+Rebuilds ``enrollments`` as a Postgres declaratively partitioned table. The
+strategy is chosen at migration time::
+
+    alembic -x enrollments_partitioning=hash -x enrollments_partitions=16 upgrade head
+    alembic -x enrollments_partitioning=range -x enrollments_months_ahead=12 upgrade head
+
+(or ``ENROLLMENTS_PARTITIONING`` / ``ENROLLMENTS_PARTITIONS`` /
+``ENROLLMENTS_MONTHS_AHEAD`` in the environment). ``hash`` is the default.
+
+* ``hash``: partitions by ``course_id``. ``uq_enrollment_course_email`` stays
+  a real unique constraint because it contains the partition key, and every
+  route query filters on ``course_id`` so it touches a single partition.
+* ``range``: monthly partitions by ``created_at`` plus a default partition,
+  for time-based retention (detach/drop old months). Postgres cannot enforce
+  ``(course_id, email)`` uniqueness across range partitions, so a trigger
+  maintains ``enrollment_keys`` whose primary key carries the
+  ``uq_enrollment_course_email`` name. Lookups by course scan every month's
+  ``course_id`` index, so prefer ``hash`` unless retention is the goal.
+
+Range mode never rejects an insert: rows past the last month land in the
+default partition. Add months ahead of time (``CREATE TABLE ... PARTITION
+OF enrollments FOR VALUES FROM ... TO ...``) before rows for them arrive,
+since Postgres refuses a new partition whose range already has rows in the
+default one.
+
+The application stays online. The partitioned table is built next to the old
+one as ``enrollments_partitioned``, a trigger mirrors every write on the old
+table into it, and existing rows are copied with
+:func:`app.db.online_migrations.batched_copy`. Only the final swap (drop the
+old table, rename the new one) takes an exclusive lock, with a short
+``lock_timeout``; if it times out, run the migration again. SQLite databases
+are left as-is.
+"""
+
+import os
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import context, op
+from app.db.online_migrations import batched_copy
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0001"
+down_revision: Union[str, None] = "20241128_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, course_id, name, email, notes, progress_percent, created_at"
+
+# How long the final swap waits for its exclusive lock before giving up.
+SWAP_LOCK_TIMEOUT = "5s"
+
+COLUMN_DDL = """
+    id VARCHAR(36) NOT NULL,
+    course_id VARCHAR(36) NOT NULL
+        CONSTRAINT enrollments_course_id_fkey
+        REFERENCES courses (id) ON DELETE CASCADE,
+    name VARCHAR(80) NOT NULL,
+    email VARCHAR(320) NOT NULL,
+    notes VARCHAR(500),
+    progress_percent INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+"""
+
+
+def _option(name: str, default: str) -> str:
+    x_args = context.get_x_argument(as_dictionary=True)
+    return x_args.get(name, os.getenv(name.upper(), default))
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _column_values(record: str) -> str:
+    return ", ".join(f"{record}.{column}" for column in COLUMNS.split(", "))
+
+
+def _create_hash_partitions(partitions: int) -> None:
+    for remainder in range(partitions):
+        op.execute(
+            f"CREATE TABLE enrollments_p{remainder:02d} "
+            "PARTITION OF enrollments_partitioned "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        )
+
+
+def _create_range_partitions(months_ahead: int) -> None:
+    oldest = op.get_bind().scalar(sa.text("SELECT min(created_at) FROM enrollments"))
+    today = date.today()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), months_ahead)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE enrollments_y{month:%Y}m{month:%m} "
+            "PARTITION OF enrollments_partitioned "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') "
+            f"TO ('{upper:%Y-%m-%d} 00:00:00+00')"
+        )
+        month = upper
+    op.execute(
+        "CREATE TABLE enrollments_default PARTITION OF enrollments_partitioned DEFAULT"
+    )
+    op.execute(
+        "CREATE INDEX ix_enrollments_course_id ON enrollments_partitioned (course_id)"
+    )
+
+
+def _enforce_unique_keys_with_trigger() -> None:
+    op.execute("""
+        CREATE TABLE enrollment_keys (
+            course_id VARCHAR(36) NOT NULL
+                REFERENCES courses (id) ON DELETE CASCADE,
+            email VARCHAR(320) NOT NULL,
+            CONSTRAINT uq_enrollment_course_email_keys PRIMARY KEY (course_id, email)
+        )
+    """)
+    op.execute("""
+        CREATE FUNCTION enrollments_maintain_keys() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM enrollment_keys
+                WHERE course_id = OLD.course_id AND email = OLD.email;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO enrollment_keys (course_id, email)
+                VALUES (NEW.course_id, NEW.email);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER enrollments_maintain_keys
+        AFTER INSERT OR DELETE OR UPDATE OF course_id, email ON enrollments_partitioned
+        FOR EACH ROW EXECUTE FUNCTION enrollments_maintain_keys()
+    """)
+
+
+def _mirror_writes() -> None:
+    """Copy every write on the old table into the new one from now on."""
+    op.execute(f"""
+        CREATE FUNCTION enrollments_mirror() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM enrollments_partitioned
+                WHERE id = OLD.id AND course_id = OLD.course_id
+                    AND created_at = OLD.created_at;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO enrollments_partitioned ({COLUMNS})
+                VALUES ({_column_values("NEW")});
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+    op.execute("""
+        CREATE TRIGGER enrollments_mirror
+        AFTER INSERT OR UPDATE OR DELETE ON enrollments
+        FOR EACH ROW EXECUTE FUNCTION enrollments_mirror()
+    """)
+
+
+def _swap(strategy: str) -> None:
+    """Replace the old table with the copy, under a brief exclusive lock."""
+    op.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+    op.execute("LOCK TABLE enrollments IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TABLE enrollments")
+    op.execute("DROP FUNCTION enrollments_mirror()")
+    op.execute("ALTER TABLE enrollments_partitioned RENAME TO enrollments")
+    op.execute(
+        "ALTER TABLE enrollments "
+        "RENAME CONSTRAINT enrollments_partitioned_pkey TO enrollments_pkey"
+    )
+    if strategy == "hash":
+        op.execute(
+            "ALTER TABLE enrollments RENAME CONSTRAINT "
+            "uq_enrollment_course_email_partitioned TO uq_enrollment_course_email"
+        )
+    else:
+        op.execute(
+            "ALTER TABLE enrollment_keys RENAME CONSTRAINT "
+            "uq_enrollment_course_email_keys TO uq_enrollment_course_email"
+        )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    strategy = _option("enrollments_partitioning", "hash")
+    if strategy not in {"hash", "range"}:
+        raise ValueError(f"Unknown enrollments_partitioning: {strategy!r}")
+
+    # Leftovers of an earlier attempt that stopped before the swap.
+    op.execute("DROP FUNCTION IF EXISTS enrollments_mirror() CASCADE")
+    op.execute("DROP TABLE IF EXISTS enrollments_partitioned, enrollment_keys")
+    op.execute("DROP FUNCTION IF EXISTS enrollments_maintain_keys()")
+
+    if strategy == "hash":
+        op.execute(f"""
+            CREATE TABLE enrollments_partitioned (
+                {COLUMN_DDL},
+                CONSTRAINT enrollments_partitioned_pkey PRIMARY KEY (id, course_id),
+                CONSTRAINT uq_enrollment_course_email_partitioned
+                    UNIQUE (course_id, email)
+            ) PARTITION BY HASH (course_id)
+        """)
+        _create_hash_partitions(int(_option("enrollments_partitions", "16")))
+    else:
+        op.execute(f"""
+            CREATE TABLE enrollments_partitioned (
+                {COLUMN_DDL},
+                CONSTRAINT enrollments_partitioned_pkey PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """)
+        _create_range_partitions(int(_option("enrollments_months_ahead", "12")))
+        _enforce_unique_keys_with_trigger()
+    _mirror_writes()
+
+    batched_copy("enrollments", "enrollments_partitioned", COLUMNS.split(", "))
+    _swap(strategy)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TABLE IF EXISTS enrollment_keys")
+    op.execute("DROP FUNCTION IF EXISTS enrollments_maintain_keys() CASCADE")
+    op.execute("ALTER TABLE enrollments RENAME TO enrollments_partitioned")
+    op.execute(
+        "ALTER TABLE enrollments_partitioned "
+        "DROP CONSTRAINT IF EXISTS uq_enrollment_course_email"
+    )
+    op.execute(
+        "ALTER TABLE enrollments_partitioned "
+        "RENAME CONSTRAINT enrollments_pkey TO enrollments_partitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE enrollments_partitioned RENAME CONSTRAINT "
+        "enrollments_course_id_fkey TO enrollments_partitioned_course_id_fkey"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_enrollments_course_id")
+    op.execute(f"""
+        CREATE TABLE enrollments (
+            {COLUMN_DDL},
+            CONSTRAINT enrollments_pkey PRIMARY KEY (id),
+            CONSTRAINT uq_enrollment_course_email UNIQUE (course_id, email)
+        )
+    """)
+    op.execute(
+        f"INSERT INTO enrollments ({COLUMNS}) SELECT {COLUMNS} FROM enrollments_partitioned"
+    )
+    op.execute("DROP TABLE enrollments_partitioned")
@@ -0,0 +1,49 @@
+"""soft-delete courses and track background purges
+
+Revision ID: 20261019_0002
+Revises: 20261019_0001
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0002"
+down_revision: Union[str, None] = "20261019_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "courses",
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # No foreign key: the purge record outlives the course row it tracks.
+    op.create_table(
+        "course_purges",
+        sa.Column("course_id", sa.String(length=36), primary_key=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column(
+            "enrollments_deleted", sa.Integer(), server_default="0", nullable=False
+        ),
+        sa.Column("labs_deleted", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "requested_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.String(length=500), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("course_purges")
+    op.drop_column("courses", "deleted_at")
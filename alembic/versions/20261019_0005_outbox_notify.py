@@ -0,0 +1,46 @@
+"""notify listeners of committed outbox events
+
+Revision ID: 20261019_0005
+Revises: 20261019_0004
+Create Date: 2026-10-19 16:00:00.000000
+
+Postgres delivers ``NOTIFY`` only when the inserting transaction commits, so
+change hubs listening on ``outbox_events`` learn exactly which rows became
+visible. SQLite databases are left as-is (hubs poll there).
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0005"
+down_revision: Union[str, None] = "20261019_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("""
+        CREATE FUNCTION outbox_events_notify() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('outbox_events', NEW.id::text);
+            RETURN NULL;
+        END
+        $$
+    """)
+    op.execute("""
+        CREATE TRIGGER outbox_events_notify
+        AFTER INSERT ON outbox_events
+        FOR EACH ROW EXECUTE FUNCTION outbox_events_notify()
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS outbox_events_notify ON outbox_events")
+    op.execute("DROP FUNCTION IF EXISTS outbox_events_notify()")
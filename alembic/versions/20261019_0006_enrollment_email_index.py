@@ -0,0 +1,33 @@
+"""index enrollments by normalized learner email
+
+Revision ID: 20261019_0006
+Revises: 20261019_0005
+Create Date: 2026-10-19 18:00:00.000000
+
+Backs ``GET /learners/{email}/enrollments``. On a partitioned ``enrollments``
+table Postgres creates the index on every partition.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0006"
+down_revision: Union[str, None] = "20261019_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_enrollments_email_lower",
+        "enrollments",
+        [sa.text("lower(email)"), "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_enrollments_email_lower", table_name="enrollments")
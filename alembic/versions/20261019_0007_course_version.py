@@ -0,0 +1,33 @@
+"""add a version column to courses for optimistic concurrency
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19 20:00:00.000000
+
+``PATCH /courses/{id}`` serves the version as the ETag and, given
+``If-Match``, updates only while the row still has that version. Existing
+rows start at version 1.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0007"
+down_revision: Union[str, None] = "20261019_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "courses",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("courses", "version")
@@ -1 +1,6 @@
 """LabForge API - FastAPI Application Package."""
+
+import time
+
+# Reference point for measuring cold-start import time.
+IMPORT_STARTED_AT = time.perf_counter()
@@ -2,9 +2,15 @@
 
 from fastapi import APIRouter
 
-from app.api.routes import courses
+from app.api.routes import admin, catalog, courses, events, jobs, learners
 
 api_router = APIRouter()
+# Registered ahead of the course routes so /courses/events is not a course id.
+api_router.include_router(events.router, prefix="/courses", tags=["Courses"])
 api_router.include_router(courses.router, prefix="/courses", tags=["Courses"])
+api_router.include_router(catalog.router, prefix="/catalog", tags=["Catalog"])
+api_router.include_router(learners.router, prefix="/learners", tags=["Learners"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
 __all__ = ["api_router"]
@@ -0,0 +1,124 @@
+"""Shared query parameter parsing for API routes."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Callable
+from enum import Enum
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+from app.schemas.courses import CourseStatus
+from app.schemas.labs import LabResourceType
+
+EXPANDABLE_RELATIONS = frozenset({"labs", "enrollments"})
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def split_csv(raw: str | None) -> list[str]:
+    """Split a comma-separated query value into trimmed, non-empty items."""
+    if not raw:
+        return []
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+def parse_expand(
+    expand: str | None = Query(
+        None,
+        description="Comma-separated related records to embed: labs, enrollments.",
+    ),
+) -> frozenset[str]:
+    """Validate the ``expand`` query parameter."""
+    requested = frozenset(split_csv(expand))
+    unknown = requested - EXPANDABLE_RELATIONS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown expand value(s): {', '.join(sorted(unknown))}",
+        )
+    return requested
+
+
+def parse_course_filters(
+    status: CourseStatus | None = Query(None, description="Only this status."),
+    difficulty: str | None = Query(
+        None,
+        pattern="^(beginner|intermediate|advanced)$",
+        description="Only this difficulty.",
+    ),
+    category: str | None = Query(None, description="Only this category."),
+    tag: str | None = Query(None, description="Only courses with this tag."),
+    resource_type: LabResourceType | None = Query(
+        None, description="Only courses with a lab of this resource type."
+    ),
+) -> dict[str, str]:
+    """Collect the catalog filters shared by course listing and facets."""
+    filters = {
+        "status": status,
+        "difficulty": difficulty,
+        "category": category,
+        "tag": tag,
+        "resource_type": resource_type,
+    }
+    return {
+        name: value.value if isinstance(value, Enum) else value
+        for name, value in filters.items()
+        if value is not None
+    }
+
+
+def fields_parser(model: type[BaseModel]) -> Callable[..., frozenset[str] | None]:
+    """Build a dependency validating a ``fields`` sparse fieldset for ``model``."""
+    allowed = frozenset(model.model_fields)
+
+    def parse_fields(
+        fields: str | None = Query(
+            None,
+            description="Comma-separated fields to return: "
+            + ", ".join(model.model_fields),
+        ),
+    ) -> frozenset[str] | None:
+        if fields is None:
+            return None
+        requested = frozenset(split_csv(fields))
+        if not requested:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="fields must name at least one field",
+            )
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown field(s): {', '.join(sorted(unknown))}",
+            )
+        return requested
+
+    return parse_fields
+
+
+def encode_cursor(*key: str) -> str:
+    """Encode the sort key of a page's last row as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(raw: str, size: int) -> list[str]:
+    """Decode a cursor from :func:`encode_cursor` holding ``size`` values."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        key = None
+    if (
+        not isinstance(key, list)
+        or len(key) != size
+        or not all(isinstance(value, str) for value in key)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor",
+        )
+    return key
@@ -1,5 +1,5 @@
 """Route modules for the LabForge API."""
 
-from app.api.routes import courses
+from app.api.routes import admin, catalog, courses, events, jobs
 
-__all__ = ["courses"]
+__all__ = ["admin", "catalog", "courses", "events", "jobs"]
@@ -0,0 +1,49 @@
+"""Operational endpoints for inspecting a running worker."""
+
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core.config import settings
+from app.db.slow_queries import slow_query_log
+from app.schemas.admin import AdmissionMetrics, SlowQueryReport
+
+router = APIRouter()
+
+bearer = HTTPBearer(auto_error=False)
+
+
+def require_admin_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer),
+) -> None:
+    """Admit only requests bearing ``ADMIN_TOKEN``; hide the route without one."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.admin_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/admission", response_model=AdmissionMetrics)
+async def admission_metrics(request: Request) -> AdmissionMetrics:
+    """Report admission queue depth and rejection counters for this worker."""
+    return AdmissionMetrics(**request.app.state.admission.snapshot())
+
+
+@router.get(
+    "/slow-queries",
+    response_model=SlowQueryReport,
+    dependencies=[Depends(require_admin_token)],
+)
+async def slow_queries() -> SlowQueryReport:
+    """List the most recent slow statements recorded by this worker."""
+    return SlowQueryReport(
+        threshold_ms=slow_query_log.threshold_ms,
+        entries=slow_query_log.snapshot(),
+    )
@@ -0,0 +1,86 @@
+"""Public catalog served from the pre-rendered snapshot file."""
+
+import gzip
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.api.params import split_csv
+from app.db.catalog import build_catalog_snapshot, snapshot_path, snapshot_state
+from app.db.session import get_session_factory
+from app.schemas import CoursePublic
+
+router = APIRouter()
+
+CACHE_CONTROL = "public, no-cache"
+
+
+def _decompressed(path: Path) -> bytes:
+    return gzip.decompress(path.read_bytes())
+
+
+def _weak(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _none_match(if_none_match: str | None, etag: str) -> bool:
+    """Whether ``If-None-Match`` lists ``etag`` (or is ``*``).
+
+    GET revalidation uses the weak comparison: a ``W/`` prefix is ignored.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _weak(etag) in {_weak(tag) for tag in split_csv(if_none_match)}
+
+
+@router.get(
+    "",
+    response_class=FileResponse,
+    responses={
+        200: {
+            "model": list[CoursePublic],
+            "description": "Published courses, gzip-encoded.",
+        },
+        304: {"description": "The client's copy (If-None-Match) is current."},
+    },
+)
+async def get_catalog(
+    request: Request,
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> Response:
+    """List published courses from the snapshot file, without a database query.
+
+    The snapshot is only rendered here if it does not exist yet (first request
+    after a fresh deploy); afterwards this process's catalog snapshotter keeps
+    it current.
+    """
+    path = snapshot_path()
+    try:
+        stat_result, etag = await run_in_threadpool(snapshot_state, path)
+    except FileNotFoundError:
+        async with sessions() as session:
+            await build_catalog_snapshot(session)
+        stat_result, etag = await run_in_threadpool(snapshot_state, path)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if "gzip" not in request.headers.get("accept-encoding", ""):
+        # Rare for real clients; decompress rather than keep a second file.
+        body = await run_in_threadpool(_decompressed, path)
+        return Response(body, media_type="application/json", headers=headers)
+    return FileResponse(
+        path,
+        media_type="application/json",
+        stat_result=stat_result,
+        headers={**headers, "Content-Encoding": "gzip"},
+    )
@@ -2,29 +2,90 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
+from app.api.params import (
+    fields_parser,
+    parse_course_filters,
+    parse_expand,
+    split_csv,
+)
+from app.db import queries
+from app.db.facets import FacetIndex
+from app.db.models import Base
 from app.db.models import Course as CourseModel
+from app.db.models import CoursePurge as CoursePurgeModel
 from app.db.models import Enrollment as EnrollmentModel
 from app.db.models import LabExercise as LabExerciseModel
+from app.db.prerequisites import (
+    PrerequisiteCycleError,
+    PrerequisiteGraph,
+    prerequisite_ids,
+)
+from app.db.purge import PURGE_JOB
 from app.db.session import get_session
+from app.db.similarity import SimilarityIndex
+from app.jobs import enqueue
+from app.outbox import record_event
 from app.schemas import (
+    Course,
+    CourseBatchGetRequest,
+    CourseBatchItem,
+    CourseBatchResponse,
     CourseCreate,
+    CourseDetail,
+    CourseFacets,
     CoursePublic,
+    CoursePurgeState,
+    CoursePurgeStatus,
+    CourseSummary,
     CourseUpdate,
     Enrollment,
     EnrollmentCreate,
+    EnrollmentSummary,
+    FacetCount,
     LabExercise,
     LabExerciseCreate,
+    OutboxEventType,
+    SimilarCourse,
 )
+from app.schemas.common import APIModel, dump_trusted, sparse_model, trusted_fields
+from app.schemas.courses import MAX_BATCH_IDS
 
 router = APIRouter()
 
+MAX_SIMILAR = 50
+COUNT_FIELDS = frozenset({"enrollment_count", "lab_count"})
+
+parse_course_fields = fields_parser(CoursePublic)
+parse_enrollment_fields = fields_parser(Enrollment)
+parse_lab_fields = fields_parser(LabExercise)
 
-async def _get_course_or_404(session: AsyncSession, course_id: str) -> CourseModel:
-    course = await session.get(CourseModel, course_id)
+
+async def _get_course_or_404(
+    session: AsyncSession, course_id: str, options: Sequence[ORMOption] = ()
+) -> CourseModel:
+    course = await session.scalar(
+        queries.ACTIVE_COURSE.options(*options), {"course_id": course_id}
+    )
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
@@ -32,20 +93,105 @@ async def _get_course_or_404(session: AsyncSession, course_id: str) -> CourseMod
     return course
 
 
-async def _counts(session: AsyncSession, course_id: str) -> tuple[int, int]:
-    enrollment_count = await session.scalar(
-        select(func.count(EnrollmentModel.id)).where(
-            EnrollmentModel.course_id == course_id
-        )
+def _etag(version: int) -> str:
+    """The ETag of a course version (a strong tag; any representation)."""
+    return f'"{version}"'
+
+
+def _if_match_versions(if_match: str | None) -> list[int] | None:
+    """Course versions an ``If-Match`` header accepts; ``None`` if any will do.
+
+    Weak tags never match, as If-Match requires strong comparison.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    return [
+        int(tag[1:-1])
+        for tag in split_csv(if_match)
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit()
+    ]
+
+
+def _precondition_failed(course: CourseModel) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Course was modified since it was read",
+        headers={"ETag": _etag(course.version)},
     )
-    lab_count = await session.scalar(
-        select(func.count(LabExerciseModel.id)).where(
-            LabExerciseModel.course_id == course_id
+
+
+async def _check_prerequisites(
+    request: Request,
+    session: AsyncSession,
+    course_id: str | None,
+    prerequisites: list[str],
+) -> None:
+    """Reject prerequisite course ids that are unknown or would close a cycle."""
+    ids = prerequisite_ids(prerequisites)
+    if not ids:
+        return
+    found = set(await session.scalars(queries.COURSE_IDS, {"course_ids": ids}))
+    missing = [prerequisite for prerequisite in ids if prerequisite not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown prerequisite course(s): {', '.join(missing)}",
         )
+    if course_id is None:
+        # A new course has no dependents yet, so it cannot close a cycle.
+        return
+    graph: PrerequisiteGraph = request.app.state.prerequisite_graph
+    await graph.refresh(session)
+    cycle = graph.cycle(course_id, ids)
+    if cycle:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Prerequisites would create a cycle: {' -> '.join(cycle)}",
+        )
+
+
+def _course_event(
+    session: AsyncSession,
+    event_type: OutboxEventType,
+    course: CourseModel,
+    **details: object,
+) -> None:
+    """Record a course change in the outbox, in the current transaction."""
+    record_event(
+        session,
+        event_type,
+        course.id,
+        {"course": Course.model_validate(course).model_dump(mode="json"), **details},
     )
+
+
+async def _counts(session: AsyncSession, course_id: str) -> tuple[int, int]:
+    enrollment_count, lab_count = (
+        await session.execute(queries.COURSE_COUNTS, {"course_id": course_id})
+    ).one()
     return int(enrollment_count or 0), int(lab_count or 0)
 
 
+async def _counts_by_course(
+    session: AsyncSession, course_ids: Sequence[str]
+) -> dict[str, tuple[int, int]]:
+    """Fetch enrollment and lab counts for many courses with grouped queries."""
+    params = {"course_ids": list(course_ids)}
+    enrollment_counts = dict(
+        (await session.execute(queries.ENROLLMENT_COUNTS_BY_COURSE, params)).all()
+    )
+    lab_counts = dict(
+        (await session.execute(queries.LAB_COUNTS_BY_COURSE, params)).all()
+    )
+    return {
+        course_id: (
+            int(enrollment_counts.get(course_id, 0)),
+            int(lab_counts.get(course_id, 0)),
+        )
+        for course_id in course_ids
+    }
+
+
 async def _to_public(session: AsyncSession, course: CourseModel) -> CoursePublic:
     enrollment_count, lab_count = await _counts(session, course.id)
     base = CoursePublic.model_validate(course, from_attributes=True)
@@ -57,70 +203,440 @@ async def _to_public(session: AsyncSession, course: CourseModel) -> CoursePublic
     )
 
 
-@router.get("", response_model=list[CoursePublic])
+def _expand_options(expand: frozenset[str]) -> list[ORMOption]:
+    """Eager-load requested relations with one batched IN query each."""
+    options: list[ORMOption] = []
+    if "labs" in expand:
+        options.append(selectinload(CourseModel.labs))
+    if "enrollments" in expand:
+        options.append(selectinload(CourseModel.enrollments))
+    return options
+
+
+def _column_options(
+    model: type[Base], fields: frozenset[str] | None
+) -> list[ORMOption]:
+    """Restrict loaded columns to a sparse fieldset (primary key always loads)."""
+    if fields is None:
+        return []
+    columns = model.__table__.columns
+    return [
+        load_only(
+            model.id, *(getattr(model, name) for name in fields if name in columns)
+        )
+    ]
+
+
+def _public(
+    course: CourseModel, enrollment_count: int, lab_count: int
+) -> dict[str, Any]:
+    """Course response fields from a persisted row, skipping re-validation."""
+    return trusted_fields(
+        CoursePublic, course, enrollment_count=enrollment_count, lab_count=lab_count
+    )
+
+
+def _trusted_response(content: Any) -> Response:
+    """Serialize trusted fields directly, bypassing response model validation."""
+    return Response(dump_trusted(content), media_type="application/json")
+
+
+def _sparse_response(items: Sequence[APIModel]) -> JSONResponse:
+    """Serialize sparse models directly, bypassing the full response model."""
+    return JSONResponse([item.model_dump(mode="json") for item in items])
+
+
+def _sparse_course(
+    course: CourseModel,
+    enrollment_count: int,
+    lab_count: int,
+    expand: frozenset[str],
+    fields: frozenset[str],
+) -> APIModel:
+    """Build a course response limited to ``fields`` plus expanded relations."""
+    schema = sparse_model(CourseDetail, fields | expand)
+    counts = {"enrollment_count": enrollment_count, "lab_count": lab_count}
+    return schema.model_validate(course, from_attributes=True).model_copy(
+        update={key: value for key, value in counts.items() if key in fields}
+    )
+
+
+def _detail(
+    course: CourseModel,
+    enrollment_count: int,
+    lab_count: int,
+    expand: frozenset[str],
+) -> dict[str, Any]:
+    """Course detail fields with eagerly loaded relations attached.
+
+    Relations that were not expanded are left out of the response entirely.
+    """
+    fields = _public(course, enrollment_count, lab_count)
+    if "labs" in expand:
+        fields["labs"] = [trusted_fields(LabExercise, lab) for lab in course.labs]
+    if "enrollments" in expand:
+        fields["enrollments"] = [
+            trusted_fields(EnrollmentSummary, enrollment)
+            for enrollment in course.enrollments
+        ]
+    return fields
+
+
+@router.get("", response_model=list[CourseDetail], response_model_exclude_unset=True)
 async def list_courses(
+    expand: frozenset[str] = Depends(parse_expand),
+    fields: frozenset[str] | None = Depends(parse_course_fields),
+    filters: dict[str, str] = Depends(parse_course_filters),
     session: AsyncSession = Depends(get_session),
-) -> list[CoursePublic]:
-    """List all courses with aggregates."""
-    stmt = (
-        select(
-            CourseModel,
-            func.count(EnrollmentModel.id).label("enrollment_count"),
-            func.count(LabExerciseModel.id).label("lab_count"),
+) -> Response:
+    """List courses with aggregates and optionally embedded relations."""
+    stmt = queries.LIST_COURSES
+    if filters:
+        stmt = stmt.where(*queries.course_conditions(filters))
+    options = [*_expand_options(expand), *_column_options(CourseModel, fields)]
+    if options:
+        stmt = stmt.options(*options)
+    result = await session.execute(stmt)
+    if fields is not None:
+        return _sparse_response(
+            [
+                _sparse_course(
+                    course,
+                    int(enrollment_count or 0),
+                    int(lab_count or 0),
+                    expand,
+                    fields,
+                )
+                for course, enrollment_count, lab_count in result.all()
+            ]
         )
-        .outerjoin(EnrollmentModel, EnrollmentModel.course_id == CourseModel.id)
-        .outerjoin(LabExerciseModel, LabExerciseModel.course_id == CourseModel.id)
-        .group_by(CourseModel.id)
+    return _trusted_response(
+        [
+            _detail(course, int(enrollment_count or 0), int(lab_count or 0), expand)
+            for course, enrollment_count, lab_count in result.all()
+        ]
     )
-    result = await session.execute(stmt)
-    courses = []
-    for course, enrollment_count, lab_count in result.all():
-        base = CoursePublic.model_validate(course, from_attributes=True)
-        courses.append(
-            base.model_copy(
-                update={
-                    "enrollment_count": int(enrollment_count or 0),
-                    "lab_count": int(lab_count or 0),
+
+
+@router.get("/facets", response_model=CourseFacets)
+async def get_course_facets(
+    request: Request,
+    filters: dict[str, str] = Depends(parse_course_filters),
+    session: AsyncSession = Depends(get_session),
+) -> CourseFacets:
+    """Count courses per tag, category, difficulty, status and lab resource type.
+
+    Takes the same filters as listing courses, and every facet counts only
+    the courses matching them. Answered from the in-memory facet index,
+    brought up to date with recent course and lab changes first.
+    """
+    index: FacetIndex = request.app.state.facet_index
+    await index.refresh(session)
+    return CourseFacets(
+        **{
+            facet: [
+                FacetCount(value=value, count=count)
+                for value, count in sorted(
+                    counts.items(), key=lambda item: (-item[1], item[0])
+                )
+            ]
+            for facet, counts in index.counts(filters).items()
+        }
+    )
+
+
+async def _batch_get(session: AsyncSession, ids: list[str]) -> Response:
+    """Resolve ``ids`` with one IN query plus grouped counts, keeping order."""
+    courses = {
+        course.id: course
+        for course in await session.scalars(
+            queries.COURSES_BY_IDS, {"course_ids": list(set(ids))}
+        )
+    }
+    counts = await _counts_by_course(session, list(courses)) if courses else {}
+    resolved = {
+        course_id: _public(course, *counts[course_id])
+        for course_id, course in courses.items()
+    }
+    return _trusted_response(
+        {
+            "items": [
+                {
+                    "id": course_id,
+                    "found": True,
+                    "course": resolved[course_id],
+                    "error": None,
                 }
-            )
+                if course_id in resolved
+                else CourseBatchItem(
+                    id=course_id, found=False, error="Course not found"
+                ).model_dump()
+                for course_id in ids
+            ]
+        }
+    )
+
+
+@router.get(":batchGet", response_model=CourseBatchResponse)
+async def batch_get_courses(
+    ids: str = Query(..., description="Comma-separated course ids."),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Retrieve many courses by id; missing ids are reported per item."""
+    requested = split_csv(ids)
+    if not requested or len(requested) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"ids must contain between 1 and {MAX_BATCH_IDS} course ids",
         )
-    return courses
+    return await _batch_get(session, requested)
+
+
+@router.post(":batchGet", response_model=CourseBatchResponse)
+async def batch_get_courses_post(
+    payload: CourseBatchGetRequest, session: AsyncSession = Depends(get_session)
+) -> Response:
+    """Retrieve many courses by id from a request body, for long id lists."""
+    return await _batch_get(session, payload.ids)
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=CoursePublic)
 async def create_course(
-    payload: CourseCreate, session: AsyncSession = Depends(get_session)
+    payload: CourseCreate,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
 ) -> CoursePublic:
     """Create a new course."""
+    await _check_prerequisites(request, session, None, payload.prerequisites)
     course = CourseModel(**payload.model_dump(mode="json"))
     session.add(course)
+    # The INSERT returns server defaults, and a new course has no children.
+    await session.flush()
+    _course_event(session, OutboxEventType.course_created, course)
     await session.commit()
-    await session.refresh(course)
-    return await _to_public(session, course)
+    response.headers["ETag"] = _etag(course.version)
+    return CoursePublic.model_validate(_public(course, 0, 0))
 
 
-@router.get("/{course_id}", response_model=CoursePublic)
+@router.get(
+    "/{course_id}", response_model=CourseDetail, response_model_exclude_unset=True
+)
 async def get_course(
-    course_id: str, session: AsyncSession = Depends(get_session)
-) -> CoursePublic:
-    """Retrieve a single course."""
-    course = await _get_course_or_404(session, course_id)
-    return await _to_public(session, course)
+    course_id: str,
+    expand: frozenset[str] = Depends(parse_expand),
+    fields: frozenset[str] | None = Depends(parse_course_fields),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Retrieve a single course, optionally embedding its relations.
+
+    The ``ETag`` is the course version, for use in ``If-Match`` on PATCH.
+    """
+    columns = None if fields is None else fields | {"version"}
+    course = await _get_course_or_404(
+        session,
+        course_id,
+        [*_expand_options(expand), *_column_options(CourseModel, columns)],
+    )
+    headers = {"ETag": _etag(course.version)}
+    if fields is not None:
+        counts = (0, 0)
+        if fields & COUNT_FIELDS:
+            counts = await _counts(session, course.id)
+        return JSONResponse(
+            _sparse_course(course, *counts, expand, fields).model_dump(mode="json"),
+            headers=headers,
+        )
+    response = _trusted_response(
+        _detail(course, *await _counts(session, course.id), expand)
+    )
+    response.headers.update(headers)
+    return response
 
 
 @router.patch("/{course_id}", response_model=CoursePublic)
 async def update_course(
-    course_id: str, payload: CourseUpdate, session: AsyncSession = Depends(get_session)
+    course_id: str,
+    payload: CourseUpdate,
+    request: Request,
+    response: Response,
+    if_match: str | None = Header(
+        None, description="ETag from a previous read; 412 if the course changed."
+    ),
+    session: AsyncSession = Depends(get_session),
 ) -> CoursePublic:
-    """Update course metadata."""
-    course = await _get_course_or_404(session, course_id)
+    """Update course metadata with a single UPDATE ... RETURNING.
+
+    With ``If-Match`` the UPDATE only applies while the course still has the
+    given version, so concurrent editors get ``412`` instead of silently
+    overwriting each other, without taking row locks.
+    """
     updates = payload.model_dump(exclude_unset=True, mode="json")
-    if updates:
-        for key, value in updates.items():
-            setattr(course, key, value)
+    versions = _if_match_versions(if_match)
+    if not updates:
+        course = await _get_course_or_404(session, course_id)
+        if versions is not None and course.version not in versions:
+            raise _precondition_failed(course)
+        response.headers["ETag"] = _etag(course.version)
+        return await _to_public(session, course)
+    if updates.get("prerequisites"):
+        await _check_prerequisites(
+            request, session, course_id, updates["prerequisites"]
+        )
+    if versions is None:
+        stmt, params = queries.UPDATE_COURSE, {"course_id": course_id}
+    else:
+        stmt = queries.UPDATE_COURSE_IF_MATCH
+        params = {"course_id": course_id, "versions": versions}
+    row = (await session.execute(stmt.values(**updates), params)).one_or_none()
+    if row is None:
+        if versions is not None:
+            # Tell a version mismatch apart from a missing course.
+            raise _precondition_failed(await _get_course_or_404(session, course_id))
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course not found"
+        )
+    course, enrollment_count, lab_count = row
+    _course_event(
+        session, OutboxEventType.course_updated, course, changed=sorted(updates)
+    )
+    await session.commit()
+    response.headers["ETag"] = _etag(course.version)
+    return CoursePublic.model_validate(
+        _public(course, int(enrollment_count or 0), int(lab_count or 0))
+    )
+
+
+@router.delete(
+    "/{course_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=CoursePurgeStatus,
+)
+async def delete_course(
+    course_id: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+) -> CoursePurgeStatus:
+    """Delete a course now and purge its enrollments and labs in the background.
+
+    Repeating the request reports progress and restarts a purge whose job
+    ran out of retries.
+    """
+    purge = await session.get(CoursePurgeModel, course_id)
+    if purge is None:
+        course = await _get_course_or_404(session, course_id)
+        course.deleted_at = func.now()
+        purge = CoursePurgeModel(course_id=course_id)
+        session.add(purge)
+        _course_event(session, OutboxEventType.course_deleted, course)
+        enqueue(session, PURGE_JOB, {"course_id": course_id})
+        try:
+            await session.commit()
+        except IntegrityError:
+            # A concurrent DELETE of the same course created the purge first.
+            await session.rollback()
+        request.app.state.similarity_index.evict(course_id)
+        request.app.state.prerequisite_graph.evict(course_id)
+        request.app.state.facet_index.evict(course_id)
+        purge = await session.get(CoursePurgeModel, course_id, populate_existing=True)
+    elif purge.status == CoursePurgeState.failed:
+        purge.status = CoursePurgeState.pending.value
+        purge.error = None
+        enqueue(session, PURGE_JOB, {"course_id": course_id})
         await session.commit()
-        await session.refresh(course)
-    return await _to_public(session, course)
+    response.headers["Location"] = str(
+        request.url_for("get_course_purge", course_id=course_id)
+    )
+    return CoursePurgeStatus.model_validate(purge, from_attributes=True)
+
+
+@router.get("/{course_id}/purge", response_model=CoursePurgeStatus)
+async def get_course_purge(
+    course_id: str, session: AsyncSession = Depends(get_session)
+) -> CoursePurgeStatus:
+    """Report progress of the background purge for a deleted course."""
+    purge = await session.get(CoursePurgeModel, course_id)
+    if purge is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Course purge not found"
+        )
+    return CoursePurgeStatus.model_validate(purge, from_attributes=True)
+
+
+@router.get("/{course_id}/similar", response_model=list[SimilarCourse])
+async def list_similar_courses(
+    course_id: str,
+    request: Request,
+    limit: int = Query(10, ge=1, le=MAX_SIMILAR),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Rank published courses by shared tags, category, prerequisites and learners.
+
+    Answered from the in-memory similarity index, brought up to date with
+    recent course changes first.
+    """
+    await _get_course_or_404(session, course_id)
+    index: SimilarityIndex = request.app.state.similarity_index
+    await index.refresh(session)
+    # Over-fetch so courses found deleted below do not shorten the page.
+    ranked = index.similar(course_id, 2 * limit)
+    courses = {}
+    if ranked:
+        courses = {
+            course.id: course
+            for course in await session.scalars(
+                queries.COURSES_BY_IDS, {"course_ids": [other for other, _ in ranked]}
+            )
+        }
+    items = []
+    for other, score in ranked:
+        if other not in courses:
+            index.evict(other)
+        elif len(items) < limit:
+            items.append(
+                {
+                    "score": round(score, 4),
+                    "course": trusted_fields(CourseSummary, courses[other]),
+                }
+            )
+    return _trusted_response(items)
+
+
+@router.get("/{course_id}/path", response_model=list[CourseSummary])
+async def get_learning_path(
+    course_id: str,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """List a course's transitive prerequisite courses in learning order.
+
+    Every course appears after the courses it requires; the requested course
+    comes last. Answered from the in-memory prerequisite graph.
+    """
+    await _get_course_or_404(session, course_id)
+    graph: PrerequisiteGraph = request.app.state.prerequisite_graph
+    await graph.refresh(session)
+    try:
+        ordered = graph.path(course_id)
+    except PrerequisiteCycleError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Prerequisite cycle: {exc}",
+        ) from exc
+    courses = {
+        course.id: course
+        for course in await session.scalars(
+            queries.COURSES_BY_IDS, {"course_ids": ordered}
+        )
+    }
+    items = []
+    for other in ordered:
+        if other not in courses:
+            graph.evict(other)
+        else:
+            items.append(trusted_fields(CourseSummary, courses[other]))
+    return _trusted_response(items)
 
 
 @router.post(
@@ -137,26 +653,36 @@ async def create_enrollment(
     await _get_course_or_404(session, course_id)
     enrollment = EnrollmentModel(course_id=course_id, **payload.model_dump(mode="json"))
     session.add(enrollment)
+    await session.flush()
+    created = Enrollment.model_validate(enrollment, from_attributes=True)
+    record_event(
+        session,
+        OutboxEventType.enrollment_created,
+        course_id,
+        {"enrollment": created.model_dump(mode="json")},
+    )
     await session.commit()
-    await session.refresh(enrollment)
-    return Enrollment.model_validate(enrollment, from_attributes=True)
+    return created
 
 
 @router.get("/{course_id}/enrollments", response_model=list[Enrollment])
 async def list_enrollments(
-    course_id: str, session: AsyncSession = Depends(get_session)
-) -> list[Enrollment]:
+    course_id: str,
+    fields: frozenset[str] | None = Depends(parse_enrollment_fields),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     """List enrollments for a course."""
     await _get_course_or_404(session, course_id)
-    enrollments = (
-        await session.execute(
-            select(EnrollmentModel).where(EnrollmentModel.course_id == course_id)
-        )
-    ).scalars()
-    return [
-        Enrollment.model_validate(enrollment, from_attributes=True)
-        for enrollment in enrollments
-    ]
+    enrollments = await session.scalars(
+        queries.ENROLLMENTS_FOR_COURSE.options(
+            *_column_options(EnrollmentModel, fields)
+        ),
+        {"course_id": course_id},
+    )
+    schema = Enrollment if fields is None else sparse_model(Enrollment, fields)
+    return _trusted_response(
+        [trusted_fields(schema, enrollment) for enrollment in enrollments]
+    )
 
 
 @router.post(
@@ -173,20 +699,29 @@ async def attach_lab(
     await _get_course_or_404(session, course_id)
     lab = LabExerciseModel(course_id=course_id, **payload.model_dump(mode="json"))
     session.add(lab)
+    await session.flush()
+    attached = LabExercise.model_validate(lab, from_attributes=True)
+    record_event(
+        session,
+        OutboxEventType.lab_attached,
+        course_id,
+        {"lab": attached.model_dump(mode="json")},
+    )
     await session.commit()
-    await session.refresh(lab)
-    return LabExercise.model_validate(lab, from_attributes=True)
+    return attached
 
 
 @router.get("/{course_id}/labs", response_model=list[LabExercise])
 async def list_labs(
-    course_id: str, session: AsyncSession = Depends(get_session)
-) -> list[LabExercise]:
+    course_id: str,
+    fields: frozenset[str] | None = Depends(parse_lab_fields),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     """List lab exercises attached to a course."""
     await _get_course_or_404(session, course_id)
-    labs = (
-        await session.execute(
-            select(LabExerciseModel).where(LabExerciseModel.course_id == course_id)
-        )
-    ).scalars()
-    return [LabExercise.model_validate(lab, from_attributes=True) for lab in labs]
+    labs = await session.scalars(
+        queries.LABS_FOR_COURSE.options(*_column_options(LabExerciseModel, fields)),
+        {"course_id": course_id},
+    )
+    schema = LabExercise if fields is None else sparse_model(LabExercise, fields)
+    return _trusted_response([trusted_fields(schema, lab) for lab in labs])
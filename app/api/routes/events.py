@@ -0,0 +1,113 @@
+"""Server-Sent Events stream of course changes."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.outbox import ChangeHub, Subscription
+from app.schemas import OutboxEventType, OutboxMessage
+
+router = APIRouter()
+
+# Reconnect delay (ms) suggested to EventSource clients.
+RETRY_MS = 2000
+
+
+def _event_data(message: OutboxMessage) -> dict[str, Any]:
+    """Client-facing event data; learner details stay out of the stream."""
+    payload = message.payload
+    data: dict[str, Any] = {"course_id": message.aggregate_id}
+    if message.event_type is OutboxEventType.enrollment_created:
+        enrollment = payload["enrollment"]
+        data["enrollment_id"] = enrollment["id"]
+        data["created_at"] = enrollment["created_at"]
+    else:
+        data.update(payload)
+    return data
+
+
+def format_event(message: OutboxMessage) -> str:
+    """Render one change as an SSE frame whose id is the outbox event id."""
+    data = json.dumps(_event_data(message), separators=(",", ":"))
+    return f"id: {message.id}\nevent: {message.event_type.value}\ndata: {data}\n\n"
+
+
+async def event_stream(
+    hub: ChangeHub,
+    subscription: Subscription,
+    last_event_id: int | None,
+    heartbeat: float,
+) -> AsyncIterator[str]:
+    """Replay missed events after ``last_event_id``, then follow the hub."""
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        replayed: set[int] = set()
+        if last_event_id is not None:
+            for message in await hub.replay(last_event_id):
+                replayed.add(message.id)
+                yield format_event(message)
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except TimeoutError:
+                # Keeps proxies from timing out idle streams.
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                # Fell too far behind; the client resumes with Last-Event-ID.
+                return
+            if message.id not in replayed:
+                yield format_event(message)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"text/event-stream": {}},
+            "description": "course.created, course.updated, course.deleted, "
+            "enrollment.created and lab.attached events; the SSE id is the outbox "
+            "event id.",
+        },
+        503: {"description": "This worker has too many open streams."},
+    },
+)
+async def stream_course_events(
+    request: Request, last_event_id: str | None = Header(None)
+) -> StreamingResponse:
+    """Stream course changes as Server-Sent Events.
+
+    Reconnecting clients send ``Last-Event-ID`` (EventSource does this
+    automatically) and receive the retained events they missed first.
+    """
+    hub: ChangeHub = request.app.state.change_hub
+    if hub.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many event stream clients, retry later",
+            headers={"Retry-After": str(settings.admission_retry_after)},
+        )
+    resume_after = int(last_event_id) if (last_event_id or "").isdigit() else None
+    try:
+        subscription = await hub.subscribe()
+    except (SQLAlchemyError, OSError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event stream unavailable",
+        )
+    return StreamingResponse(
+        event_stream(hub, subscription, resume_after, settings.sse_heartbeat),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,23 @@
+"""Routes for inspecting background jobs."""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Job as JobModel
+from app.db.session import get_session
+from app.schemas import JobStatus
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(
+    job_id: str, session: AsyncSession = Depends(get_session)
+) -> JobStatus:
+    """Report the status, progress and outcome of a background job."""
+    job = await session.get(JobModel, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return JobStatus.model_validate(job, from_attributes=True)
@@ -0,0 +1,65 @@
+"""Learner-centric routes spanning every course."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.params import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
+from app.db import queries
+from app.db.session import get_session
+from app.schemas import CourseSummary, LearnerEnrollment, LearnerEnrollmentPage
+from app.schemas.common import dump_trusted, trusted_fields
+
+router = APIRouter()
+
+
+@router.get("/{email}/enrollments", response_model=LearnerEnrollmentPage)
+async def list_learner_enrollments(
+    email: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="next_cursor from the previous page."),
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """List a learner's enrollments across courses, oldest first.
+
+    Email matching is case-insensitive. Each item embeds a summary of its
+    course; enrollments in deleted courses are left out.
+    """
+    params = {"email": email.lower(), "limit": limit + 1}
+    statement = queries.LEARNER_ENROLLMENTS
+    if cursor is not None:
+        created_at, enrollment_id = decode_cursor(cursor, 2)
+        try:
+            params["after_created_at"] = datetime.fromisoformat(created_at)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Invalid cursor",
+            )
+        params["after_id"] = enrollment_id
+        statement = queries.LEARNER_ENROLLMENTS_AFTER
+    rows = (await session.execute(statement, params)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1].Enrollment
+        next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+    page = {
+        "items": [
+            trusted_fields(
+                LearnerEnrollment,
+                enrollment,
+                course=trusted_fields(CourseSummary, course),
+            )
+            for enrollment, course in rows
+        ],
+        "next_cursor": next_cursor,
+    }
+    return Response(dump_trusted(page), media_type="application/json")
@@ -0,0 +1,110 @@
+"""Admission control in front of the database pool.
+
+Each worker admits at most ``max_concurrency`` requests at once. Up to
+``max_queue`` more wait for a slot for at most ``queue_timeout`` seconds.
+Anything beyond that gets an immediate ``503`` with ``Retry-After``, so an
+overload fails fast instead of piling up on pool checkouts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Paths that never touch the pool (or must answer under load) bypass admission.
+# Event streams stay open indefinitely and are capped by SSE_MAX_CLIENTS instead.
+EXEMPT_PREFIXES = (
+    "/health",
+    "/admin",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/courses/events",
+)
+
+
+@dataclass
+class AdmissionStats:
+    """Point-in-time admission metrics for one worker."""
+
+    max_concurrency: int
+    max_queue: int
+    active: int = 0
+    queued: int = 0
+    admitted_total: int = 0
+    rejected_queue_full_total: int = 0
+    rejected_timeout_total: int = 0
+
+
+class AdmissionController:
+    """Bounded concurrency limiter with a bounded, deadline-limited queue."""
+
+    def __init__(
+        self, max_concurrency: int, max_queue: int, queue_timeout: float
+    ) -> None:
+        self.queue_timeout = queue_timeout
+        self.stats = AdmissionStats(
+            max_concurrency=max_concurrency, max_queue=max_queue
+        )
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; ``False`` means reject."""
+        stats = self.stats
+        if not self._slots.locked():
+            await self._slots.acquire()
+        elif stats.queued >= stats.max_queue:
+            stats.rejected_queue_full_total += 1
+            return False
+        else:
+            stats.queued += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except TimeoutError:
+                stats.rejected_timeout_total += 1
+                return False
+            finally:
+                stats.queued -= 1
+        stats.active += 1
+        stats.admitted_total += 1
+        return True
+
+    def release(self) -> None:
+        """Return a slot taken by :meth:`acquire`."""
+        self.stats.active -= 1
+        self._slots.release()
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the current metrics as a plain dict."""
+        return asdict(self.stats)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying an :class:`AdmissionController` per request."""
+
+    def __init__(
+        self, app: ASGIApp, controller: AdmissionController, retry_after: int
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+        if not await self.controller.acquire():
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
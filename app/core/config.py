@@ -10,6 +10,15 @@ from pydantic import BaseModel, Field
 load_dotenv()
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_optional_int(name: str) -> int | None:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
 class Settings(BaseModel):
     """Lightweight settings container."""
 
@@ -19,6 +28,157 @@ class Settings(BaseModel):
             "sqlite+aiosqlite:///./labforge.db",
         )
     )
+    # Connections opened during startup so first requests skip connect cost.
+    db_pool_warmup: int = Field(default=int(os.getenv("DB_POOL_WARMUP", "2")), ge=0)
+    # Execute the hot route statements once at startup to fill compile caches.
+    warm_statement_cache: bool = Field(default=_env_bool("WARM_STATEMENT_CACHE", True))
+    # Per-connection asyncpg prepared statement cache (SQLAlchemy default 100).
+    db_prepared_statement_cache_size: int = Field(
+        default=int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100")), ge=0
+    )
+    # pgbouncer in transaction pooling mode cannot reuse named prepared
+    # statements across transactions; this disables the caches.
+    db_pgbouncer: bool = Field(default=_env_bool("DB_PGBOUNCER", False))
+    # Per-process pool size; the server entry point derives it from the
+    # connection budget when one is set.
+    db_pool_size: int = Field(default=int(os.getenv("DB_POOL_SIZE", "5")), ge=1)
+    db_max_overflow: int = Field(default=int(os.getenv("DB_MAX_OVERFLOW", "10")), ge=0)
+    # Tuned SQLite profile for single-node deployments on a database file: WAL,
+    # synchronous=NORMAL, one writer connection and a pool of read connections.
+    # mmap and cache sizes are in bytes and SQLite cache_size units (negative
+    # means KiB); the busy timeout is how long a connection waits for a lock.
+    db_sqlite_tuned: bool = Field(default=_env_bool("DB_SQLITE_TUNED", False))
+    db_sqlite_read_pool_size: int = Field(
+        default=int(os.getenv("DB_SQLITE_READ_POOL_SIZE", "4")), ge=1
+    )
+    db_sqlite_mmap_size: int = Field(
+        default=int(os.getenv("DB_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))), ge=0
+    )
+    db_sqlite_cache_size: int = Field(
+        default=int(os.getenv("DB_SQLITE_CACHE_SIZE", "-65536"))
+    )
+    db_sqlite_busy_timeout_ms: int = Field(
+        default=int(os.getenv("DB_SQLITE_BUSY_TIMEOUT_MS", "5000")), ge=0
+    )
+    # Total connections all server workers may hold together, including each
+    # worker's change hub LISTEN connection.
+    db_connection_budget: int | None = Field(
+        default=_env_optional_int("DB_CONNECTION_BUDGET"), ge=1
+    )
+    # Admission control: concurrent requests per worker (defaults to the pool
+    # capacity), how many may queue, and how long they may wait for a slot.
+    admission_max_concurrency: int | None = Field(
+        default=_env_optional_int("ADMISSION_MAX_CONCURRENCY"), ge=1
+    )
+    admission_max_queue: int = Field(
+        default=int(os.getenv("ADMISSION_MAX_QUEUE", "100")), ge=0
+    )
+    admission_queue_timeout: float = Field(
+        default=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0")), gt=0
+    )
+    admission_retry_after: int = Field(
+        default=int(os.getenv("ADMISSION_RETRY_AFTER", "1")), ge=0
+    )
+    # Request deadline in seconds for every route (0 disables), with per-route
+    # overrides keyed by endpoint name, e.g. "list_enrollments=60,get_course=5".
+    request_timeout: float = Field(
+        default=float(os.getenv("REQUEST_TIMEOUT", "30")), ge=0
+    )
+    route_timeouts: str = Field(default=os.getenv("ROUTE_TIMEOUTS", ""))
+    # Slow query log: statements over the threshold (0 disables) are kept in a
+    # per-worker ring buffer; a sampled share of slow SELECTs is EXPLAINed.
+    slow_query_threshold_ms: float = Field(
+        default=float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500")), ge=0
+    )
+    slow_query_explain_sample_rate: float = Field(
+        default=float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0")), ge=0, le=1
+    )
+    slow_query_log_size: int = Field(
+        default=int(os.getenv("SLOW_QUERY_LOG_SIZE", "100")), ge=1
+    )
+    # Bearer token for GET /admin/slow-queries, which shows SQL text and query
+    # plans; the endpoint answers 404 while no token is set.
+    admin_token: str | None = Field(default=os.getenv("ADMIN_TOKEN") or None)
+    # Course deletion purges children in batches of this many rows, pausing
+    # between batches so the purge never holds long locks or starves the pool.
+    purge_batch_size: int = Field(
+        default=int(os.getenv("PURGE_BATCH_SIZE", "1000")), ge=1
+    )
+    purge_batch_pause: float = Field(
+        default=float(os.getenv("PURGE_BATCH_PAUSE", "0.05")), ge=0
+    )
+    # Background jobs: worker tasks per process (0 leaves jobs to other
+    # processes), how often idle workers poll, how long a claim is held without
+    # a progress report, and retry policy (exponential backoff, capped).
+    job_workers: int = Field(default=int(os.getenv("JOB_WORKERS", "2")), ge=0)
+    job_poll_interval: float = Field(
+        default=float(os.getenv("JOB_POLL_INTERVAL", "1.0")), gt=0
+    )
+    job_lease_seconds: float = Field(
+        default=float(os.getenv("JOB_LEASE_SECONDS", "60")), gt=0
+    )
+    job_max_attempts: int = Field(default=int(os.getenv("JOB_MAX_ATTEMPTS", "5")), ge=1)
+    job_retry_backoff: float = Field(
+        default=float(os.getenv("JOB_RETRY_BACKOFF", "2.0")), ge=0
+    )
+    job_retry_backoff_max: float = Field(
+        default=float(os.getenv("JOB_RETRY_BACKOFF_MAX", "300")), ge=0
+    )
+    # Transactional outbox: whether this process runs a dispatcher, where
+    # events go (comma-separated file:// and http(s):// URLs), batch size, idle
+    # poll, how long a claimed batch is held before another dispatcher may
+    # retry it, webhook timeout and how long delivered events are kept
+    # (0 = forever). Failed deliveries use the job retry backoff settings.
+    outbox_dispatcher: bool = Field(default=_env_bool("OUTBOX_DISPATCHER", True))
+    outbox_sinks: str = Field(default=os.getenv("OUTBOX_SINKS", ""))
+    outbox_batch_size: int = Field(
+        default=int(os.getenv("OUTBOX_BATCH_SIZE", "100")), ge=1
+    )
+    outbox_poll_interval: float = Field(
+        default=float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0")), gt=0
+    )
+    outbox_lease_seconds: float = Field(
+        default=float(os.getenv("OUTBOX_LEASE_SECONDS", "60")), gt=0
+    )
+    outbox_http_timeout: float = Field(
+        default=float(os.getenv("OUTBOX_HTTP_TIMEOUT", "5.0")), gt=0
+    )
+    outbox_retention: float = Field(
+        default=float(os.getenv("OUTBOX_RETENTION", "86400")), ge=0
+    )
+    # Course change stream (SSE): keepalive interval, how often the per-worker
+    # hub polls when it cannot LISTEN, events buffered per client before it is
+    # dropped (it then resumes with Last-Event-ID) and open streams per worker.
+    sse_heartbeat: float = Field(default=float(os.getenv("SSE_HEARTBEAT", "15")), gt=0)
+    sse_poll_interval: float = Field(
+        default=float(os.getenv("SSE_POLL_INTERVAL", "1.0")), gt=0
+    )
+    sse_client_buffer: int = Field(
+        default=int(os.getenv("SSE_CLIENT_BUFFER", "1000")), ge=1
+    )
+    sse_max_clients: int = Field(
+        default=int(os.getenv("SSE_MAX_CLIENTS", "10000")), ge=1
+    )
+    # Published catalog snapshot: directory for the pre-rendered gzip file (per
+    # host) and how often each process checks the outbox for catalog changes;
+    # the changes of one interval coalesce into a single rebuild.
+    catalog_snapshot_dir: str = Field(
+        default=os.getenv("CATALOG_SNAPSHOT_DIR", "./var/catalog")
+    )
+    catalog_snapshot_debounce: float = Field(
+        default=float(os.getenv("CATALOG_SNAPSHOT_DEBOUNCE", "2.0")), gt=0
+    )
+    # Readiness: how long a result is reused, how long the database check may
+    # take, and the pool saturation (0-1) at which a worker reports not ready.
+    readiness_cache_ttl: float = Field(
+        default=float(os.getenv("READINESS_CACHE_TTL", "2.0")), ge=0
+    )
+    readiness_timeout: float = Field(
+        default=float(os.getenv("READINESS_TIMEOUT", "2.0")), gt=0
+    )
+    readiness_max_pool_saturation: float = Field(
+        default=float(os.getenv("READINESS_MAX_POOL_SATURATION", "1.0")), gt=0, le=1
+    )
 
 
 @lru_cache
@@ -0,0 +1,201 @@
+"""Per-route request deadlines propagated to database statement timeouts.
+
+``DeadlineMiddleware`` gives each matched route a time budget. While the
+handler runs, the absolute deadline lives in a context variable. A session
+``after_begin`` hook turns it into ``SET LOCAL statement_timeout`` on Postgres
+or a timed ``interrupt()`` on SQLite, so the database abandons the query
+instead of holding a pooled connection. The handler is cancelled if the
+client disconnects or the deadline passes, and the latter is reported as a
+structured ``504``. The matched route name is published in a context variable
+as well, so diagnostics such as the slow query log can attribute work to it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Sequence
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, SessionTransaction
+from starlette.responses import JSONResponse
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Absolute ``time.monotonic()`` deadline for the current request, if any.
+current_deadline: ContextVar[float | None] = ContextVar(
+    "current_deadline", default=None
+)
+
+# Name of the route serving the current request, if one matched.
+current_route: ContextVar[str | None] = ContextVar("current_route", default=None)
+
+# Postgres ``query_canceled`` (raised for statement_timeout).
+QUERY_CANCELED = "57014"
+
+
+def remaining_seconds() -> float | None:
+    """Seconds left before the current request deadline, if one is set."""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def is_deadline_error(exc: BaseException) -> bool:
+    """Whether ``exc`` is the database aborting a query for its timeout."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    if getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED:
+        return True
+    return "interrupted" in str(exc.orig)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    remaining = remaining_seconds()
+    if remaining is None:
+        return
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        # SET LOCAL ends with the transaction, so pooled connections come
+        # back without a leftover timeout.
+        millis = max(int(remaining * 1000), 1)
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {millis}")
+    elif dialect == "sqlite":
+        driver = connection.connection.driver_connection
+        raw = getattr(driver, "_conn", driver)
+        # sqlite3 interrupt() is thread-safe, unlike queueing through aiosqlite.
+        timer = asyncio.get_running_loop().call_later(remaining, raw.interrupt)
+        session.info["deadline_timer"] = timer
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _cancel_interrupt_timer(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        timer = session.info.pop("deadline_timer", None)
+        if timer is not None:
+            timer.cancel()
+
+
+def parse_route_timeouts(raw: str | None) -> dict[str, float]:
+    """Parse ``name=seconds,name=seconds`` into a route timeout mapping."""
+    timeouts: dict[str, float] = {}
+    for item in (raw or "").split(","):
+        if item.strip():
+            name, _, seconds = item.partition("=")
+            timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+class DeadlineMiddleware:
+    """Enforce per-route deadlines and cancel work for disconnected clients."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        routes: Sequence[BaseRoute],
+        default_timeout: float | None,
+        route_timeouts: dict[str, float],
+    ) -> None:
+        self.app = app
+        self.routes = routes
+        self.default_timeout = default_timeout
+        self.route_timeouts = route_timeouts
+
+    def _resolve(self, scope: Scope) -> tuple[str | None, float | None]:
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                name = getattr(route, "name", None)
+                timeout = self.route_timeouts.get(name, self.default_timeout)
+                return name, timeout or None
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route_name, timeout = self._resolve(scope)
+        route_token = current_route.set(route_name)
+        try:
+            if timeout is None:
+                await self.app(scope, receive, send)
+            else:
+                await self._call_with_deadline(
+                    scope, receive, send, route_name, timeout
+                )
+        finally:
+            current_route.reset(route_token)
+
+    async def _call_with_deadline(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        route_name: str | None,
+        timeout: float,
+    ) -> None:
+        # Buffer the (small, JSON) request body so the real receive channel is
+        # free to watch for the client disconnecting while the handler runs.
+        buffered: list[Message] = []
+        while True:
+            message = await receive()
+            buffered.append(message)
+            if message["type"] != "http.request" or not message.get("more_body"):
+                break
+        if buffered[-1]["type"] == "http.disconnect":
+            return
+
+        never: asyncio.Future[Message] = asyncio.get_running_loop().create_future()
+
+        async def replay() -> Message:
+            return buffered.pop(0) if buffered else await never
+
+        response_started = False
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = current_deadline.set(time.monotonic() + timeout)
+        try:
+            handler = asyncio.create_task(self.app(scope, replay, tracking_send))
+        finally:
+            current_deadline.reset(token)
+        disconnect = asyncio.create_task(receive())
+        done, _ = await asyncio.wait(
+            {handler, disconnect},
+            timeout=timeout,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        disconnect.cancel()
+        if handler in done:
+            exc = handler.exception()
+            if exc is None:
+                return
+            if not is_deadline_error(exc) or response_started:
+                raise exc
+        else:
+            handler.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await handler
+            if disconnect in done or response_started:
+                return
+        response = JSONResponse(
+            {
+                "detail": "Request deadline exceeded",
+                "route": route_name,
+                "timeout_seconds": timeout,
+            },
+            status_code=504,
+        )
+        await response(scope, receive, send)
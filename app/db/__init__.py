@@ -1,6 +1,21 @@
 """Database utilities and models."""
 
 from app.db.models import Base
-from app.db.session import get_session
+from app.db.session import (
+    dispose_engine,
+    get_engine,
+    get_read_engine,
+    get_read_session_factory,
+    get_session,
+    get_session_factory,
+)
 
-__all__ = ["get_session", "Base"]
+__all__ = [
+    "get_session",
+    "get_session_factory",
+    "get_read_session_factory",
+    "get_engine",
+    "get_read_engine",
+    "dispose_engine",
+    "Base",
+]
@@ -0,0 +1,214 @@
+"""Pre-rendered snapshot of the published course catalog.
+
+The public catalog is read far more often than it changes, so it is rendered
+to a gzip-compressed JSON file and served straight from disk. The file lives
+in ``CATALOG_SNAPSHOT_DIR`` on each host, so every process runs a
+:class:`CatalogSnapshotter` that follows the outbox (see
+:class:`~app.outbox.OutboxFollower`). Every ``CATALOG_SNAPSHOT_DEBOUNCE``
+seconds it checks for events that touch a published course (course
+create/update/delete, new enrollments or labs) and, if there were any,
+rebuilds its host's file. A burst of changes therefore costs one rebuild per
+host, and no file is more than the debounce window behind.
+
+The file is replaced atomically and only rewritten when its bytes change. Its
+ETag is a hash of the JSON content, recorded next to it when it is written
+(``<snapshot>.etag``), so hosts that have caught up with the same changes
+serve the same tag, whatever the file's mtime. The tag is written after the
+snapshot: a reader in between gets the new content under the old tag, which
+only costs that client a full response on its next revalidation, never a
+stale ``304``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db import queries
+from app.outbox.follower import OutboxFollower
+from app.schemas.courses import CoursePublic, CourseStatus
+from app.schemas.outbox import OutboxEventType
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_NAME = "published-courses.json.gz"
+ETAG_SUFFIX = ".etag"
+
+_catalog_adapter = TypeAdapter(list[CoursePublic])
+
+
+def snapshot_path() -> Path:
+    """Location of the published catalog snapshot."""
+    return Path(settings.catalog_snapshot_dir) / SNAPSHOT_NAME
+
+
+async def published_courses(session: AsyncSession) -> list[CoursePublic]:
+    """Every published course, with its counts."""
+    result = await session.execute(queries.PUBLISHED_COURSES)
+    return [
+        CoursePublic.model_validate(course, from_attributes=True).model_copy(
+            update={
+                "enrollment_count": int(enrollment_count or 0),
+                "lab_count": int(lab_count or 0),
+            }
+        )
+        for course, enrollment_count, lab_count in result.all()
+    ]
+
+
+async def render_catalog(session: AsyncSession) -> bytes:
+    """Serialize every published course, with counts, to JSON."""
+    return _catalog_adapter.dump_json(await published_courses(session))
+
+
+def _etag_path(path: Path) -> Path:
+    return path.with_name(path.name + ETAG_SUFFIX)
+
+
+def content_etag(body: bytes) -> str:
+    """The strong ETag of a snapshot's JSON ``body``."""
+    return f'"{hashlib.sha256(body).hexdigest()}"'
+
+
+def snapshot_state(path: Path) -> tuple[os.stat_result, str]:
+    """``stat`` of the snapshot at ``path`` and its recorded ETag.
+
+    Raises :class:`FileNotFoundError` if either has not been written yet.
+    """
+    etag = _etag_path(path).read_text()
+    return path.stat(), etag
+
+
+def _read(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _replace(path: Path, data: bytes) -> None:
+    """Atomically replace the contents of ``path`` with ``data``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_snapshot(path: Path, body: bytes) -> bool:
+    """Atomically replace ``path`` with gzipped ``body``; ``False`` if unchanged.
+
+    The ETag is (re)written whenever it does not match, e.g. after a crash
+    between the two writes, even if the snapshot itself is unchanged.
+    """
+    # A fixed mtime keeps the gzip output deterministic for the same body.
+    compressed = gzip.compress(body, mtime=0)
+    etag = content_etag(body).encode()
+    changed = _read(path) != compressed
+    if changed:
+        _replace(path, compressed)
+    if changed or _read(_etag_path(path)) != etag:
+        _replace(_etag_path(path), etag)
+    return changed
+
+
+async def build_catalog_snapshot(
+    session: AsyncSession, path: Path | None = None
+) -> bool:
+    """Render the catalog and write the snapshot; ``True`` if the file changed."""
+    body = await render_catalog(session)
+    return await asyncio.to_thread(write_snapshot, path or snapshot_path(), body)
+
+
+class CatalogSnapshotter(OutboxFollower):
+    """Keep this host's snapshot file current from outbox events."""
+
+    event_types = (
+        OutboxEventType.course_created,
+        OutboxEventType.course_updated,
+        OutboxEventType.course_deleted,
+        OutboxEventType.enrollment_created,
+        OutboxEventType.lab_attached,
+    )
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker[AsyncSession],
+        interval: float,
+        path: Path | None = None,
+    ) -> None:
+        super().__init__()
+        self.sessions = sessions
+        self.interval = interval
+        self.path = path
+        self._published: set[str] = set()
+        self._stale = True
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Spawn the rebuild loop on the running loop."""
+        self._task = asyncio.create_task(self._run(), name="catalog-snapshotter")
+
+    async def stop(self) -> None:
+        """Cancel the loop."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> bool:
+        """Apply new events and rebuild if needed; ``True`` if the file changed."""
+        async with self.sessions() as session:
+            await self.refresh(session)
+            if not self._stale:
+                return False
+            courses = await published_courses(session)
+        self._published = {str(course.id) for course in courses}
+        self._stale = False
+        return await asyncio.to_thread(
+            write_snapshot,
+            self.path or snapshot_path(),
+            _catalog_adapter.dump_json(courses),
+        )
+
+    async def load(self, session: AsyncSession) -> None:
+        """Nothing to read up front; the first pass renders the catalog."""
+        self._stale = True
+
+    def apply(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Mark the snapshot stale if the event touches a published course."""
+        if event_type == OutboxEventType.enrollment_created.value:
+            course_id = payload["enrollment"]["course_id"]
+        elif event_type == OutboxEventType.lab_attached.value:
+            course_id = payload["lab"]["course_id"]
+        else:
+            course = payload["course"]
+            course_id = course["id"]
+            if course["status"] == CourseStatus.published.value:
+                self._stale = True
+        # A course that was published may have been unpublished or deleted.
+        if course_id in self._published:
+            self._stale = True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except (SQLAlchemyError, OSError):
+                logger.exception("Catalog snapshot could not be rebuilt")
+            await asyncio.sleep(self.interval)
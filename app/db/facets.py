@@ -0,0 +1,172 @@
+"""In-memory catalog facet index behind ``GET /courses/facets``.
+
+For every facet (tag, category, difficulty, status and lab resource type) the
+index keeps a posting set of course ids per value. Unfiltered counts are the
+posting set sizes. With filters, the posting sets of the filter values are
+intersected (smallest first). A small match is counted by walking its
+courses' values; a large one by intersecting it with every value's posting
+set, so even broad filters avoid a Python loop over the catalog.
+
+The index is loaded from ``courses`` and ``lab_exercises`` on first use and
+then follows ``course.*`` and ``lab.attached`` outbox events (see
+:class:`~app.outbox.OutboxFollower`).
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Course, LabExercise
+from app.outbox.follower import OutboxFollower
+from app.schemas.outbox import OutboxEventType
+
+FACETS = ("tag", "category", "difficulty", "status", "resource_type")
+# Matching courses up to which filtered counts walk each course's values;
+# larger matches are counted per value by posting set intersection.
+SCAN_LIMIT = 1000
+
+COURSE_FACETS = select(
+    Course.id, Course.tags, Course.category, Course.difficulty, Course.status
+).where(Course.deleted_at.is_(None))
+LAB_RESOURCE_TYPES = (
+    select(LabExercise.course_id, LabExercise.resource_type)
+    .join(Course, Course.id == LabExercise.course_id)
+    .where(Course.deleted_at.is_(None))
+    .distinct()
+)
+
+
+def _value(value: Any) -> str:
+    return getattr(value, "value", value)
+
+
+class FacetIndex(OutboxFollower):
+    """Posting sets of course ids per facet value."""
+
+    event_types = (
+        OutboxEventType.course_created,
+        OutboxEventType.course_updated,
+        OutboxEventType.course_deleted,
+        OutboxEventType.lab_attached,
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._values: dict[str, dict[str, set[str]]] = {}
+        self._postings: dict[str, dict[str, set[str]]] = {facet: {} for facet in FACETS}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    async def load(self, session: AsyncSession) -> None:
+        """Build the posting sets from the database."""
+        courses = (await session.execute(COURSE_FACETS)).all()
+        lab_types = (await session.execute(LAB_RESOURCE_TYPES)).all()
+        self._reset()
+        for course_id, tags, category, difficulty, course_status in courses:
+            self._set_course(
+                course_id, tags or [], category, _value(difficulty), course_status
+            )
+        for course_id, resource_type in lab_types:
+            self._add(course_id, "resource_type", _value(resource_type))
+
+    def apply(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Apply one ``course.*`` or ``lab.attached`` outbox payload."""
+        if event_type == OutboxEventType.lab_attached.value:
+            lab = payload["lab"]
+            self._add(lab["course_id"], "resource_type", lab["resource_type"])
+            return
+        course = payload["course"]
+        if event_type == OutboxEventType.course_deleted.value:
+            self.evict(course["id"])
+            return
+        self._set_course(
+            course["id"],
+            course["tags"],
+            course["category"],
+            course["difficulty"],
+            course["status"],
+        )
+
+    def _set_course(
+        self,
+        course_id: str,
+        tags: list[str],
+        category: str | None,
+        difficulty: str,
+        course_status: Any,
+    ) -> None:
+        values = self._values.get(course_id)
+        resource_types = set(values["resource_type"]) if values else set()
+        self.evict(course_id)
+        self._values[course_id] = {facet: set() for facet in FACETS}
+        for tag in tags:
+            self._add(course_id, "tag", tag)
+        if category is not None:
+            self._add(course_id, "category", category)
+        self._add(course_id, "difficulty", difficulty)
+        self._add(course_id, "status", _value(course_status))
+        for resource_type in resource_types:
+            self._add(course_id, "resource_type", resource_type)
+
+    def _add(self, course_id: str, facet: str, value: str) -> None:
+        values = self._values.get(course_id)
+        if values is None:
+            # Not a known course, e.g. a lab event for a deleted one.
+            return
+        values[facet].add(value)
+        self._postings[facet].setdefault(value, set()).add(course_id)
+
+    def evict(self, course_id: str) -> None:
+        """Forget a course, e.g. a deleted one."""
+        for facet, values in self._values.pop(course_id, {}).items():
+            postings = self._postings[facet]
+            for value in values:
+                posting = postings[value]
+                posting.discard(course_id)
+                if not posting:
+                    del postings[value]
+
+    def counts(self, filters: Mapping[str, str]) -> dict[str, Counter[str]]:
+        """Courses per value of every facet, among courses matching ``filters``."""
+        if not filters:
+            return {
+                facet: Counter(
+                    {value: len(posting) for value, posting in postings.items()}
+                )
+                for facet, postings in self._postings.items()
+            }
+        selected = sorted(
+            (
+                self._postings[facet].get(value, set())
+                for facet, value in filters.items()
+            ),
+            key=len,
+        )
+        matching = selected[0].intersection(*selected[1:])
+        if len(matching) < SCAN_LIMIT:
+            counts: dict[str, Counter[str]] = {facet: Counter() for facet in FACETS}
+            for course_id in matching:
+                for facet, values in self._values[course_id].items():
+                    counts[facet].update(values)
+            return counts
+        # Many matches: intersect each value's posting set instead, which
+        # iterates the smaller of the two sets in C.
+        return {
+            facet: Counter(
+                {
+                    value: shared
+                    for value, posting in postings.items()
+                    if (shared := len(matching.intersection(posting)))
+                }
+            )
+            for facet, postings in self._postings.items()
+        }
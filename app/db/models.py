@@ -1,18 +1,36 @@
 """SQLAlchemy models for courses, enrollments, and labs."""
 
 from datetime import datetime
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
-from app.schemas.courses import CourseStatus
+from app.schemas.courses import CoursePurgeState, CourseStatus
+from app.schemas.jobs import JobState
 from app.schemas.labs import LabResourceType
 
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy models."""
 
+    # Read server-generated columns (created_at, updated_at) back through
+    # RETURNING on the INSERT or UPDATE itself instead of a later SELECT.
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class Course(Base):
     """Course record for self-paced content."""
@@ -44,17 +62,33 @@ class Course(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # Incremented by every update and served as the ETag, so PATCH can be made
+    # conditional on it (If-Match) without holding row locks.
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default=text("1")
+    )
+    # Set when the course is deleted; children are purged in the background.
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
+    # passive_deletes leaves child rows to the database (and the batched
+    # purge) instead of loading every one into the session on delete.
     enrollments: Mapped[list["Enrollment"]] = relationship(
-        back_populates="course", cascade="all, delete-orphan"
+        back_populates="course", cascade="all, delete-orphan", passive_deletes=True
     )
     labs: Mapped[list["LabExercise"]] = relationship(
-        back_populates="course", cascade="all, delete-orphan"
+        back_populates="course", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
 class Enrollment(Base):
-    """Enrollment record for a learner in a course."""
+    """Enrollment record for a learner in a course.
+
+    On Postgres the table is partitioned (see migration ``20261019_0001``), so
+    the database key also includes the partition column; ``id`` stays unique
+    and remains the ORM identity.
+    """
 
     __tablename__ = "enrollments"
 
@@ -75,6 +109,15 @@ class Enrollment(Base):
     course: Mapped[Course] = relationship(back_populates="enrollments")
 
 
+# Serves learner lookups by normalized email in enrollment order.
+Index(
+    "ix_enrollments_email_lower",
+    func.lower(Enrollment.email),
+    Enrollment.created_at,
+    Enrollment.id,
+)
+
+
 class LabExercise(Base):
     """Lab exercises attached to a course."""
 
@@ -95,3 +138,90 @@ class LabExercise(Base):
     estimated_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     course: Mapped[Course] = relationship(back_populates="labs")
+
+
+class CoursePurge(Base):
+    """Progress of the background purge that follows a course deletion."""
+
+    __tablename__ = "course_purges"
+
+    course_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=CoursePurgeState.pending.value
+    )
+    enrollments_deleted: Mapped[int] = mapped_column(Integer, default=0)
+    labs_deleted: Mapped[int] = mapped_column(Integer, default=0)
+    requested_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+
+class Job(Base):
+    """Unit of background work claimed and run by the job workers."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_claim", "status", "run_at"),)
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid4())
+    )
+    kind: Mapped[str] = mapped_column(String(80), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, default=lambda: {})
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=JobState.queued.value
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Earliest time the job may (re)run; retries push it out with backoff.
+    run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # A running job whose lease has expired is treated as abandoned.
+    locked_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    progress: Mapped[dict[str, Any]] = mapped_column(JSON, default=lambda: {})
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class OutboxEvent(Base):
+    """Change event written with the change itself, then delivered to sinks."""
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending",
+            "next_attempt_at",
+            postgresql_where=text("dispatched_at IS NULL"),
+            sqlite_where=text("dispatched_at IS NULL"),
+        ),
+    )
+
+    # Monotonic id: dispatch order and the consumers' deduplication key.
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
+    event_type: Mapped[str] = mapped_column(String(80), nullable=False)
+    aggregate_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    # Failed deliveries are retried with backoff from this time.
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    dispatched_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_error: Mapped[str | None] = mapped_column(String(1000), nullable=True)
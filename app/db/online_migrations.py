@@ -0,0 +1,385 @@
+"""Alembic helpers for schema changes that keep the application online.
+
+A plain ``UPDATE``/``DELETE`` over a whole table, ``CREATE INDEX`` or
+``ADD CONSTRAINT`` holds locks that block application writes (or reads) for
+as long as it runs. These helpers split the work so that no single lock is
+held for long:
+
+* :func:`batched_update` and :func:`batched_delete` change rows in key order,
+  ``batch_size`` at a time, committing each batch and sleeping ``pause``
+  seconds in between. ``where`` must stop matching rows once they are done,
+  so an interrupted migration picks up where it stopped when run again.
+* :func:`batched_copy` copies rows into another table the same way, for
+  rebuilding a table under a new name and swapping it in at the end.
+* :func:`create_index_concurrently` builds indexes with ``CREATE INDEX
+  CONCURRENTLY``, one partition at a time on partitioned tables, and rebuilds
+  an index left invalid by an earlier failed attempt.
+* :func:`add_unique_constraint_concurrently` builds the unique index first and
+  then only attaches it as the constraint.
+* :func:`add_constraint_not_valid` adds a ``CHECK`` or ``FOREIGN KEY`` that
+  applies to new rows only; :func:`validate_constraint` then checks existing
+  rows without blocking writes.
+
+Statements that still need a brief exclusive lock run with ``lock_timeout``,
+so they fail fast instead of queueing behind a long transaction (and every
+query behind them). Each helper commits the migration's transaction so far
+and runs outside of it, which is why ``env.py`` uses one transaction per
+migration. Everything is skipped when it is already done, so a failed
+migration can simply be run again.
+
+Use the helpers in new revisions only: a released revision has already run
+on deployed databases and is never edited. Revisions import the helpers live,
+so changes here must keep existing callers working; a revision that depends
+on a helper's exact behaviour should copy it instead.
+
+The concurrent and ``NOT VALID`` forms are Postgres features. On other
+databases the index helpers create plain indexes, the constraint helpers do
+nothing, and batches still commit one by one. The helpers need a database
+connection, so they do not support offline (``--sql``) mode.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from alembic import op
+
+# Alembic's logger, so batch progress shows up next to its own output.
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Postgres truncates longer identifiers.
+MAX_IDENTIFIER_LENGTH = 63
+
+INDEX_STATE = sa.text(
+    "SELECT i.indisvalid FROM pg_index i "
+    "JOIN pg_class c ON c.oid = i.indexrelid "
+    "WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace"
+)
+CONSTRAINT_STATE = sa.text(
+    "SELECT convalidated FROM pg_constraint "
+    "WHERE conname = :name AND conrelid = CAST(:table AS regclass)"
+)
+PARTITIONS = sa.text(
+    "SELECT c.relname FROM pg_inherits i "
+    "JOIN pg_class c ON c.oid = i.inhrelid "
+    "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+)
+
+
+def _postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+@contextmanager
+def _online() -> Iterator[Connection]:
+    """Run outside of the migration transaction, committing each statement."""
+    with op.get_context().autocommit_block():
+        yield op.get_bind()
+
+
+@contextmanager
+def _lock_timeout(bind: Connection, lock_timeout: str) -> Iterator[None]:
+    bind.execute(
+        sa.text("SELECT set_config('lock_timeout', :value, false)"),
+        {"value": lock_timeout},
+    )
+    try:
+        yield
+    finally:
+        bind.exec_driver_sql("RESET lock_timeout")
+
+
+def _batches(
+    table: str,
+    where: str,
+    change: str,
+    *,
+    key: str,
+    batch_size: int,
+    pause: float,
+    suffix: str = "",
+) -> int:
+    """Apply ``change`` to the keys matching ``where``, one batch at a time."""
+    apply = sa.text(f"{change} WHERE {key} IN :keys AND ({where}){suffix}").bindparams(
+        sa.bindparam("keys", expanding=True)
+    )
+    changed = 0
+    after = None
+    with _online() as bind:
+        while True:
+            after_clause = "" if after is None else f"{key} > :after AND "
+            keys = (
+                bind.execute(
+                    sa.text(
+                        f"SELECT {key} FROM {table} WHERE {after_clause}({where}) "
+                        f"ORDER BY {key} LIMIT :batch_size"
+                    ),
+                    {"after": after, "batch_size": batch_size},
+                )
+                .scalars()
+                .all()
+            )
+            if not keys:
+                break
+            changed += bind.execute(apply, {"keys": keys}).rowcount
+            after = keys[-1]
+            logger.info("%s: %d rows so far, up to %s=%s", table, changed, key, after)
+            if len(keys) < batch_size:
+                break
+            time.sleep(pause)
+    return changed
+
+
+def batched_update(
+    table: str,
+    set_clause: str,
+    where: str,
+    *,
+    key: str = "id",
+    batch_size: int = 1000,
+    pause: float = 0.05,
+) -> int:
+    """``UPDATE table SET set_clause WHERE where`` in committed batches.
+
+    ``where`` must exclude rows already updated (e.g. ``new_column IS NULL``)
+    so a re-run resumes instead of starting over. Returns the rows updated.
+    """
+    return _batches(
+        table,
+        where,
+        f"UPDATE {table} SET {set_clause}",
+        key=key,
+        batch_size=batch_size,
+        pause=pause,
+    )
+
+
+def batched_delete(
+    table: str,
+    where: str,
+    *,
+    key: str = "id",
+    batch_size: int = 1000,
+    pause: float = 0.05,
+) -> int:
+    """``DELETE FROM table WHERE where`` in committed batches.
+
+    ``where`` may refer to the table by its name, e.g. in a correlated
+    subquery. Returns the rows deleted.
+    """
+    return _batches(
+        table,
+        where,
+        f"DELETE FROM {table}",
+        key=key,
+        batch_size=batch_size,
+        pause=pause,
+    )
+
+
+def batched_copy(
+    source: str,
+    target: str,
+    columns: Sequence[str],
+    *,
+    key: str = "id",
+    batch_size: int = 1000,
+    pause: float = 0.05,
+) -> int:
+    """``INSERT INTO target SELECT columns FROM source`` in committed batches.
+
+    Rows that conflict with one already in ``target`` are skipped, so a re-run
+    (or a trigger mirroring writes on ``source`` into ``target``) is safe. On
+    Postgres each batch reads its rows ``FOR SHARE``: a concurrent update or
+    delete waits for the batch, so a mirroring trigger sees the copied row.
+    Returns the rows copied.
+    """
+    column_list = ", ".join(columns)
+    lock = " FOR SHARE" if _postgres() else ""
+    return _batches(
+        source,
+        "TRUE",
+        f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {source}",
+        key=key,
+        batch_size=batch_size,
+        pause=pause,
+        suffix=f"{lock} ON CONFLICT DO NOTHING",
+    )
+
+
+def _index_ddl(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    *,
+    unique: bool,
+    where: str | None,
+    only: bool = False,
+) -> str:
+    return (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX "
+        f"{'' if only else 'CONCURRENTLY '}IF NOT EXISTS {name} "
+        f"ON {'ONLY ' if only else ''}{table} ({', '.join(columns)})"
+        f"{f' WHERE {where}' if where else ''}"
+    )
+
+
+def _build_index(
+    bind: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    *,
+    unique: bool,
+    where: str | None,
+) -> None:
+    """Build one index concurrently, replacing an invalid leftover."""
+    valid = bind.scalar(INDEX_STATE, {"name": name})
+    if valid:
+        return
+    if valid is not None:
+        # A failed concurrent build leaves an invalid index behind.
+        bind.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    bind.exec_driver_sql(_index_ddl(name, table, columns, unique=unique, where=where))
+
+
+def _partition_index_name(name: str, partition: str) -> str:
+    return f"{partition}_{name}"[:MAX_IDENTIFIER_LENGTH]
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    *,
+    unique: bool = False,
+    where: str | None = None,
+) -> None:
+    """Create an index without blocking writes to ``table``.
+
+    ``columns`` are column names or expressions such as ``lower(email)``. A
+    partitioned table gets an (initially invalid) index on the parent only;
+    each partition's index is then built concurrently and attached, and the
+    parent index becomes valid once all are.
+    """
+    if not _postgres():
+        op.create_index(
+            name,
+            table,
+            [sa.text(column) for column in columns],
+            unique=unique,
+            if_not_exists=True,
+            sqlite_where=sa.text(where) if where else None,
+        )
+        return
+    with _online() as bind:
+        partitions = bind.scalars(PARTITIONS, {"table": table}).all()
+        if not partitions:
+            _build_index(bind, name, table, columns, unique=unique, where=where)
+            return
+        bind.exec_driver_sql(
+            _index_ddl(name, table, columns, unique=unique, where=where, only=True)
+        )
+        for partition in partitions:
+            child = _partition_index_name(name, partition)
+            _build_index(bind, child, partition, columns, unique=unique, where=where)
+            bind.exec_driver_sql(f"ALTER INDEX {name} ATTACH PARTITION {child}")
+
+
+def drop_index_concurrently(name: str, table: str) -> None:
+    """Drop an index without blocking writes to ``table``.
+
+    Postgres cannot drop a partitioned table's index concurrently; that drop
+    takes a brief exclusive lock instead.
+    """
+    if not _postgres():
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with _online() as bind:
+        partitioned = bind.scalars(PARTITIONS, {"table": table}).first()
+        concurrently = "" if partitioned else "CONCURRENTLY "
+        bind.exec_driver_sql(f"DROP INDEX {concurrently}IF EXISTS {name}")
+
+
+def add_unique_constraint_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    *,
+    lock_timeout: str = "5s",
+) -> None:
+    """Add ``UNIQUE (columns)`` with only a brief lock on ``table``.
+
+    The unique index is built concurrently (on a partitioned table, one per
+    partition) and then attached as the constraint, which only needs the
+    lock for a catalog update. Fails if existing rows are not unique.
+    """
+    if not _postgres():
+        op.create_index(name, table, list(columns), unique=True, if_not_exists=True)
+        return
+    with _online() as bind:
+        if bind.scalar(CONSTRAINT_STATE, {"name": name, "table": table}) is not None:
+            return
+        partitions = bind.scalars(PARTITIONS, {"table": table}).all()
+        for partition in partitions:
+            _build_index(
+                bind,
+                _partition_index_name(name, partition),
+                partition,
+                columns,
+                unique=True,
+                where=None,
+            )
+        if not partitions:
+            _build_index(bind, name, table, columns, unique=True, where=None)
+        # On a partitioned table Postgres adopts the matching partition
+        # indexes instead of building new ones.
+        definition = (
+            f"UNIQUE ({', '.join(columns)})"
+            if partitions
+            else f"UNIQUE USING INDEX {name}"
+        )
+        with _lock_timeout(bind, lock_timeout):
+            bind.exec_driver_sql(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+            )
+
+
+def add_constraint_not_valid(
+    name: str, table: str, definition: str, *, lock_timeout: str = "5s"
+) -> None:
+    """Add a ``CHECK`` or ``FOREIGN KEY`` constraint for new rows only.
+
+    ``definition`` is the constraint body, e.g. ``CHECK (progress >= 0)``.
+    Existing rows are not checked (and not locked) until
+    :func:`validate_constraint`.
+    """
+    if not _postgres():
+        return
+    with _online() as bind:
+        if bind.scalar(CONSTRAINT_STATE, {"name": name, "table": table}) is not None:
+            return
+        with _lock_timeout(bind, lock_timeout):
+            bind.exec_driver_sql(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition} NOT VALID"
+            )
+
+
+def validate_constraint(name: str, table: str) -> None:
+    """Check existing rows against a ``NOT VALID`` constraint.
+
+    Validation scans the table under a lock that still allows reads and
+    writes, and fails if any row violates the constraint.
+    """
+    if not _postgres():
+        return
+    with _online() as bind:
+        if bind.scalar(CONSTRAINT_STATE, {"name": name, "table": table}):
+            return
+        bind.exec_driver_sql(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
@@ -0,0 +1,141 @@
+"""In-memory prerequisite graph behind ``GET /courses/{id}/path``.
+
+``Course.prerequisites`` stays a free-form list, but entries that are course
+ids reference other courses: each such entry is an edge from a course to one
+of its prerequisites. Writes are checked with :meth:`PrerequisiteGraph.cycle`
+so an edge that would close a loop is rejected, and
+:meth:`PrerequisiteGraph.path` orders a course's transitive prerequisites so
+each one comes after everything it depends on.
+
+The graph is loaded on first use and then follows ``course.*`` outbox events
+(see :class:`~app.outbox.OutboxFollower`), so create, update and delete change
+single adjacency entries instead of triggering a rebuild.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Course
+from app.outbox.follower import OutboxFollower
+from app.schemas.outbox import OutboxEventType
+
+COURSE_PREREQUISITES = select(Course.id, Course.prerequisites).where(
+    Course.deleted_at.is_(None)
+)
+
+
+def prerequisite_ids(prerequisites: Iterable[str]) -> list[str]:
+    """The entries of a prerequisites list that are course ids, in order."""
+    ids = []
+    for entry in prerequisites:
+        try:
+            course_id = str(UUID(entry))
+        except (ValueError, TypeError):
+            continue
+        if course_id not in ids:
+            ids.append(course_id)
+    return ids
+
+
+class PrerequisiteCycleError(Exception):
+    """The prerequisite graph contains a cycle (listed in ``cycle``)."""
+
+    def __init__(self, cycle: list[str]) -> None:
+        super().__init__(" -> ".join(cycle))
+        self.cycle = cycle
+
+
+class PrerequisiteGraph(OutboxFollower):
+    """Directed graph from each course to the courses it requires."""
+
+    event_types = (
+        OutboxEventType.course_created,
+        OutboxEventType.course_updated,
+        OutboxEventType.course_deleted,
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._requires: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._requires)
+
+    async def load(self, session: AsyncSession) -> None:
+        """Build every course's adjacency list from the database."""
+        rows = (await session.execute(COURSE_PREREQUISITES)).all()
+        self._requires = {
+            course_id: prerequisite_ids(prerequisites or [])
+            for course_id, prerequisites in rows
+        }
+
+    def apply(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Replace one course's edges from a ``course.*`` outbox payload."""
+        course = payload["course"]
+        if event_type == OutboxEventType.course_deleted.value:
+            self.evict(course["id"])
+        else:
+            self._requires[course["id"]] = prerequisite_ids(course["prerequisites"])
+
+    def evict(self, course_id: str) -> None:
+        """Forget a course, e.g. one found deleted."""
+        self._requires.pop(course_id, None)
+
+    def cycle(self, course_id: str, prerequisites: Iterable[str]) -> list[str] | None:
+        """The cycle that giving ``course_id`` these prerequisites would close.
+
+        Returns the loop as ``[course_id, ..., course_id]`` in dependency
+        order, or ``None`` when the new edges keep the graph acyclic.
+        """
+        for start in prerequisite_ids(prerequisites):
+            # Depth-first search back to course_id along existing edges.
+            parents: dict[str, str | None] = {start: None}
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                if node == course_id:
+                    loop = []
+                    step = parents[node]
+                    while step is not None:
+                        loop.append(step)
+                        step = parents[step]
+                    return [course_id, *reversed(loop), course_id]
+                for required in self._requires.get(node, ()):
+                    if required not in parents:
+                        parents[required] = node
+                        stack.append(required)
+        return None
+
+    def path(self, course_id: str) -> list[str]:
+        """``course_id``'s transitive prerequisites in learning order, then itself.
+
+        Raises :class:`PrerequisiteCycleError` if a cycle is reachable, which
+        writes prevent but concurrent updates on different workers can race.
+        """
+        order: list[str] = []
+        done: set[str] = set()
+        # Iterative post-order DFS; ``active`` is the current chain of courses.
+        active: list[str] = [course_id]
+        pending: list[list[str]] = [list(reversed(self._requires.get(course_id, [])))]
+        while active:
+            if pending[-1]:
+                required = pending[-1].pop()
+                if required in done:
+                    continue
+                if required in active:
+                    loop = active[active.index(required) :]
+                    raise PrerequisiteCycleError([*loop, required])
+                active.append(required)
+                pending.append(list(reversed(self._requires.get(required, []))))
+                continue
+            finished = active.pop()
+            pending.pop()
+            done.add(finished)
+            order.append(finished)
+        return order
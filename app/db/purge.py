@@ -0,0 +1,106 @@
+"""Background purge of deleted courses in bounded batches.
+
+Deleting a course only marks it and enqueues a ``course.purge`` job. The job
+removes the course's enrollments and labs a batch at a time, each batch in its
+own short transaction, and records progress in ``course_purges``. The course
+row itself is deleted last. Running as a job keeps the purge out of the
+request's deadline and admission slot, and retries or resumes it after a
+failure or restart; every step is idempotent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from sqlalchemy import Delete, bindparam, delete, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.models import Course, CoursePurge, Enrollment, LabExercise
+from app.jobs import JobContext, job_handler
+from app.schemas.courses import CoursePurgeState
+
+
+def _batch_delete(model: type[Enrollment] | type[LabExercise]) -> Delete:
+    """Delete up to ``batch_size`` children of one course.
+
+    Repeating the course filter on the outer delete lets Postgres prune to a
+    single enrollments partition.
+    """
+    batch = (
+        select(model.id)
+        .where(model.course_id == bindparam("course_id"))
+        .limit(bindparam("batch_size"))
+        .scalar_subquery()
+    )
+    return (
+        delete(model)
+        .where(model.course_id == bindparam("course_id"), model.id.in_(batch))
+        .execution_options(synchronize_session=False)
+    )
+
+
+BATCHES = (
+    (_batch_delete(Enrollment), CoursePurge.enrollments_deleted),
+    (_batch_delete(LabExercise), CoursePurge.labs_deleted),
+)
+
+
+PURGE_JOB = "course.purge"
+
+
+@job_handler(PURGE_JOB)
+async def purge_course(context: JobContext, payload: dict[str, Any]) -> dict[str, int]:
+    """Delete a course's children in batches, then the course itself."""
+    course_id = payload["course_id"]
+    batch_size = settings.purge_batch_size
+    params = {"course_id": course_id, "batch_size": batch_size}
+    progress = update(CoursePurge).where(CoursePurge.course_id == course_id)
+    # A retried purge continues the totals its earlier attempts reported.
+    totals = {
+        "enrollments_deleted": context.progress.get("enrollments_deleted", 0),
+        "labs_deleted": context.progress.get("labs_deleted", 0),
+    }
+    try:
+        for statement, counter in BATCHES:
+            while True:
+                async with context.sessions() as session:
+                    deleted = (await session.execute(statement, params)).rowcount
+                    await session.execute(
+                        progress.values(
+                            {
+                                counter: counter + deleted,
+                                CoursePurge.status: CoursePurgeState.running.value,
+                            }
+                        )
+                    )
+                    await session.commit()
+                totals[counter.key] += deleted
+                # Renews the job lease so a long purge is not picked up twice.
+                await context.report(**totals)
+                if deleted < batch_size:
+                    break
+                await asyncio.sleep(settings.purge_batch_pause)
+        async with context.sessions() as session:
+            await session.execute(delete(Course).where(Course.id == course_id))
+            await session.execute(
+                progress.values(
+                    status=CoursePurgeState.completed.value, completed_at=func.now()
+                )
+            )
+            await session.commit()
+    except SQLAlchemyError as exc:
+        # Earlier attempts are retried by the job worker; only the last one
+        # leaves the purge marked as failed.
+        if context.final_attempt:
+            async with context.sessions() as session:
+                await session.execute(
+                    progress.values(
+                        status=CoursePurgeState.failed.value,
+                        error=str(getattr(exc, "orig", exc))[:500],
+                    )
+                )
+                await session.commit()
+        raise
+    return totals
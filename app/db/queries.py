@@ -0,0 +1,193 @@
+"""Prebuilt statements for the hot course routes.
+
+Statements are constructed once at import with named bind parameters, so a
+request only supplies parameter values instead of rebuilding ``select()``
+constructs. Reusing the same statement objects also keeps SQLAlchemy's compiled
+cache and the asyncpg prepared statement cache hitting the same entries.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Integer,
+    String,
+    bindparam,
+    func,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.db.models import Course, Enrollment, LabExercise
+from app.schemas.courses import CourseStatus, CourseSummary
+
+ENROLLMENT_COUNT = (
+    select(func.count(Enrollment.id))
+    .where(Enrollment.course_id == bindparam("course_id"))
+    .scalar_subquery()
+)
+LAB_COUNT = (
+    select(func.count(LabExercise.id))
+    .where(LabExercise.course_id == bindparam("course_id"))
+    .scalar_subquery()
+)
+# Both counts for one course in a single round trip.
+COURSE_COUNTS = select(ENROLLMENT_COUNT, LAB_COUNT)
+
+ENROLLMENT_COUNTS_BY_COURSE = (
+    select(Enrollment.course_id, func.count(Enrollment.id))
+    .where(Enrollment.course_id.in_(bindparam("course_ids", expanding=True)))
+    .group_by(Enrollment.course_id)
+)
+LAB_COUNTS_BY_COURSE = (
+    select(LabExercise.course_id, func.count(LabExercise.id))
+    .where(LabExercise.course_id.in_(bindparam("course_ids", expanding=True)))
+    .group_by(LabExercise.course_id)
+)
+
+# Correlated counts avoid the enrollments x labs row explosion that a double
+# outer join with GROUP BY produces.
+LIST_COURSES = select(
+    Course,
+    select(func.count(Enrollment.id))
+    .where(Enrollment.course_id == Course.id)
+    .correlate(Course)
+    .scalar_subquery()
+    .label("enrollment_count"),
+    select(func.count(LabExercise.id))
+    .where(LabExercise.course_id == Course.id)
+    .correlate(Course)
+    .scalar_subquery()
+    .label("lab_count"),
+).where(Course.deleted_at.is_(None))
+
+# Stable order so an unchanged catalog renders to identical bytes.
+PUBLISHED_COURSES = LIST_COURSES.where(
+    Course.status == CourseStatus.published
+).order_by(Course.created_at, Course.id)
+
+# Deleted courses stay invisible while their children are purged.
+ACTIVE_COURSE = select(Course).where(
+    Course.id == bindparam("course_id"), Course.deleted_at.is_(None)
+)
+COURSES_BY_IDS = select(Course).where(
+    Course.id.in_(bindparam("course_ids", expanding=True)),
+    Course.deleted_at.is_(None),
+)
+COURSE_IDS = select(Course.id).where(
+    Course.id.in_(bindparam("course_ids", expanding=True)),
+    Course.deleted_at.is_(None),
+)
+# One round trip for PATCH: callers add ``.values()``, and the updated row
+# comes back through RETURNING along with both counts.
+UPDATE_COURSE = (
+    update(Course)
+    .where(Course.id == bindparam("course_id"), Course.deleted_at.is_(None))
+    .values(version=Course.version + 1)
+    .returning(Course, ENROLLMENT_COUNT, LAB_COUNT)
+    .execution_options(synchronize_session=False)
+)
+# If-Match: only update while the row still has one of the expected versions.
+UPDATE_COURSE_IF_MATCH = UPDATE_COURSE.where(
+    Course.version.in_(bindparam("versions", expanding=True))
+)
+ENROLLMENTS_FOR_COURSE = select(Enrollment).where(
+    Enrollment.course_id == bindparam("course_id")
+)
+LABS_FOR_COURSE = select(LabExercise).where(
+    LabExercise.course_id == bindparam("course_id")
+)
+
+# A learner's enrollments across courses with each course's summary columns,
+# walking ``ix_enrollments_email_lower`` in key order. Callers pass the email
+# lowercased and ``limit`` one above the page size to detect a next page.
+LEARNER_ENROLLMENTS = (
+    select(Enrollment, Course)
+    .join(Course, Course.id == Enrollment.course_id)
+    .where(
+        func.lower(Enrollment.email) == bindparam("email", type_=String),
+        Course.deleted_at.is_(None),
+    )
+    .options(load_only(*(getattr(Course, name) for name in CourseSummary.model_fields)))
+    .order_by(Enrollment.created_at, Enrollment.id)
+    .limit(bindparam("limit", type_=Integer))
+)
+# Keyset continuation after the last ``(created_at, id)`` of the previous page.
+LEARNER_ENROLLMENTS_AFTER = LEARNER_ENROLLMENTS.where(
+    tuple_(Enrollment.created_at, Enrollment.id)
+    > tuple_(
+        bindparam("after_created_at", type_=DateTime(timezone=True)),
+        bindparam("after_id"),
+    )
+)
+
+
+class json_array_items(FunctionElement[Any]):
+    """Table-valued function yielding a JSON array's items as text ``value``."""
+
+    name = "json_array_items"
+    inherit_cache = True
+
+
+@compiles(json_array_items, "postgresql")
+def _json_array_items_postgresql(element: json_array_items, compiler: Any, **kw: Any):
+    return f"json_array_elements_text({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(json_array_items, "sqlite")
+def _json_array_items_sqlite(element: json_array_items, compiler: Any, **kw: Any):
+    return f"json_each({compiler.process(element.clauses, **kw)})"
+
+
+def course_conditions(filters: Mapping[str, str]) -> list[ColumnElement[bool]]:
+    """WHERE clauses for the catalog filters shared by listing and facets."""
+    conditions = []
+    for name in ("status", "difficulty", "category"):
+        if name in filters:
+            conditions.append(getattr(Course, name) == filters[name])
+    if "tag" in filters:
+        tags = json_array_items(Course.tags).table_valued("value")
+        conditions.append(
+            select(tags.c.value)
+            .where(tags.c.value == filters["tag"])
+            .correlate(Course)
+            .exists()
+        )
+    if "resource_type" in filters:
+        conditions.append(
+            select(LabExercise.id)
+            .where(
+                LabExercise.course_id == Course.id,
+                LabExercise.resource_type == filters["resource_type"],
+            )
+            .correlate(Course)
+            .exists()
+        )
+    return conditions
+
+
+async def warm(session: AsyncSession) -> None:
+    """Execute the keyed statements once with an id that matches nothing.
+
+    This fills the compiled statement cache before traffic arrives.
+    ``LIST_COURSES`` is left out because warming it means scanning the catalog.
+    """
+    sentinel = ""
+    for stmt in (ACTIVE_COURSE, COURSE_COUNTS):
+        await session.execute(stmt, {"course_id": sentinel})
+    for stmt in (
+        ENROLLMENT_COUNTS_BY_COURSE,
+        LAB_COUNTS_BY_COURSE,
+        COURSES_BY_IDS,
+        COURSE_IDS,
+    ):
+        await session.execute(stmt, {"course_ids": [sentinel]})
+    for stmt in (ENROLLMENTS_FOR_COURSE, LABS_FOR_COURSE):
+        await session.execute(stmt, {"course_id": sentinel})
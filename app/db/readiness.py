@@ -0,0 +1,149 @@
+"""Readiness checks for the database the application depends on.
+
+``ReadinessProbe`` reports whether the database is reachable, how saturated
+the connection pool is and whether the schema is behind the Alembic head. Results
+are cached for a short TTL and concurrent probes share one in-flight check,
+so frequent polling from many load balancers costs at most one round of
+queries per TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from alembic.script.revision import ResolutionError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+@lru_cache
+def migration_scripts() -> ScriptDirectory:
+    """The migration scripts shipped with the app."""
+    return ScriptDirectory(str(MIGRATIONS_DIR))
+
+
+@lru_cache
+def alembic_heads() -> tuple[str, ...]:
+    """Head revision(s) of the migration scripts shipped with the app."""
+    return tuple(sorted(migration_scripts().get_heads()))
+
+
+def schema_behind(current: tuple[str, ...]) -> bool:
+    """Whether the database lacks migrations shipped with the app.
+
+    A revision the scripts do not know was applied by a newer release; during
+    a rolling deploy this code still runs against that schema, so it counts
+    as ahead, not behind.
+    """
+    applied: set[str] = set()
+    for revision in current:
+        try:
+            ancestry = migration_scripts().iterate_revisions(revision, "base")
+            applied.update(script.revision for script in ancestry)
+        except ResolutionError:
+            return False
+    return not set(alembic_heads()) <= applied
+
+
+def pool_usage(engine: AsyncEngine) -> tuple[int | None, int | None]:
+    """Checked-out connections and total capacity of a bounded pool."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None, None
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        return pool.checkedout(), None
+    return pool.checkedout(), pool.size() + max_overflow
+
+
+class ReadinessProbe:
+    """TTL-cached database readiness checks."""
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], AsyncEngine],
+        ttl: float,
+        timeout: float,
+        max_pool_saturation: float,
+    ) -> None:
+        self.engine_factory = engine_factory
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_pool_saturation = max_pool_saturation
+        self._lock = asyncio.Lock()
+        self._result: dict[str, Any] | None = None
+        self._expires_at = 0.0
+
+    def _cached(self) -> dict[str, Any] | None:
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return {**self._result, "cached": True}
+        return None
+
+    async def check(self) -> dict[str, Any]:
+        """Return the latest readiness report, refreshing it once the TTL ends."""
+        cached = self._cached()
+        if cached is not None:
+            return cached
+        async with self._lock:
+            cached = self._cached()
+            if cached is not None:
+                return cached
+            self._result = await self._run_checks()
+            self._expires_at = time.monotonic() + self.ttl
+            return {**self._result, "cached": False}
+
+    async def _run_checks(self) -> dict[str, Any]:
+        engine = self.engine_factory()
+        # Measure the pool before the probe takes a connection of its own.
+        checked_out, capacity = pool_usage(engine)
+        saturation = checked_out / capacity if capacity else None
+        pool = {
+            "ok": saturation is None or saturation < self.max_pool_saturation,
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": saturation,
+        }
+
+        database: dict[str, Any] = {"ok": False, "latency_ms": None, "error": None}
+        current: tuple[str, ...] = ()
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout), engine.connect() as conn:
+                current = await conn.run_sync(
+                    lambda sync_conn: MigrationContext.configure(
+                        sync_conn
+                    ).get_current_heads()
+                )
+        except TimeoutError:
+            database["error"] = f"timed out after {self.timeout}s"
+        except (SQLAlchemyError, OSError) as exc:
+            database["error"] = str(getattr(exc, "orig", exc))
+        else:
+            database["ok"] = True
+            database["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+        head = alembic_heads()
+        migrations = {
+            "ok": database["ok"] and not schema_behind(current),
+            "current": sorted(current),
+            "head": list(head),
+        }
+        ready = database["ok"] and pool["ok"] and migrations["ok"]
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checked_at": datetime.now(UTC),
+            "database": database,
+            "pool": pool,
+            "migrations": migrations,
+        }
@@ -1,18 +1,134 @@
 """Async database session management."""
 
 from collections.abc import AsyncGenerator
+from typing import Any
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
-from app.core.config import settings
+from app.core.config import Settings, settings
+from app.db import sqlite_tuning
+from app.db.slow_queries import slow_query_log
 
-engine = create_async_engine(settings.database_url, echo=False, future=True)
-async_session_factory = async_sessionmaker(
-    bind=engine, expire_on_commit=False, class_=AsyncSession
-)
+_engine: AsyncEngine | None = None
+_read_engine: AsyncEngine | None = None
+async_session_factory = async_sessionmaker(expire_on_commit=False, class_=AsyncSession)
+# Sessions for read-only requests; bound to the application engine unless the
+# tuned SQLite profile gives reads a pool of their own.
+read_session_factory = async_sessionmaker(expire_on_commit=False, class_=AsyncSession)
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(config: Settings, *, read_only: bool = False) -> dict[str, Any]:
+    """Build ``create_async_engine`` keyword arguments from settings.
+
+    ``read_only`` selects the read pool of the tuned SQLite profile.
+    """
+    options: dict[str, Any] = {"echo": False, "future": True}
+    url = make_url(config.database_url)
+    if url.get_backend_name() == "postgresql":
+        options["pool_size"] = config.db_pool_size
+        options["max_overflow"] = config.db_max_overflow
+    elif sqlite_tuning.sqlite_tuned(config):
+        # SQLite has a single writer: queue writers for one connection.
+        options["pool_size"] = config.db_sqlite_read_pool_size if read_only else 1
+        options["max_overflow"] = 0
+    if url.drivername == "postgresql+asyncpg":
+        if config.db_pgbouncer:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _unique_statement_name,
+            }
+        else:
+            options["connect_args"] = {
+                "prepared_statement_cache_size": (
+                    config.db_prepared_statement_cache_size
+                ),
+            }
+    return options
+
+
+def _create_engine(*, read_only: bool) -> AsyncEngine:
+    engine = create_async_engine(
+        settings.database_url, **engine_options(settings, read_only=read_only)
+    )
+    if settings.slow_query_threshold_ms:
+        slow_query_log.install(engine.sync_engine)
+    if sqlite_tuning.sqlite_tuned(settings):
+        sqlite_tuning.install(engine.sync_engine, settings, read_only=read_only)
+    return engine
+
+
+def get_engine() -> AsyncEngine:
+    """Return the application engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = _create_engine(read_only=False)
+        async_session_factory.configure(bind=_engine)
+    return _engine
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Provide an async session for FastAPI dependencies."""
-    async with async_session_factory() as session:
+def get_read_engine() -> AsyncEngine:
+    """Return the engine for read-only requests.
+
+    This is the application engine, except under the tuned SQLite profile,
+    where reads get their own pool of ``query_only`` connections.
+    """
+    global _read_engine
+    if _read_engine is None:
+        if sqlite_tuning.sqlite_tuned(settings):
+            _read_engine = _create_engine(read_only=True)
+        else:
+            _read_engine = get_engine()
+        read_session_factory.configure(bind=_read_engine)
+    return _read_engine
+
+
+async def dispose_engine() -> None:
+    """Close pooled connections and drop the engines (used on shutdown)."""
+    global _engine, _read_engine
+    if _read_engine is not None and _read_engine is not _engine:
+        await _read_engine.dispose()
+    _read_engine = None
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Provide an async session for FastAPI dependencies.
+
+    ``GET`` and ``HEAD`` requests get a session on the read engine.
+    """
+    if request.method in READ_METHODS:
+        get_read_engine()
+        factory = read_session_factory
+    else:
+        get_engine()
+        factory = async_session_factory
+    async with factory() as session:
         yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Provide the session factory for work that outlives the request."""
+    get_engine()
+    return async_session_factory
+
+
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Provide the read-only session factory for work outside a request."""
+    get_read_engine()
+    return read_session_factory
@@ -0,0 +1,204 @@
+"""In-memory course similarity index behind ``GET /courses/{id}/similar``.
+
+Each course is a sparse binary feature vector: its tags, category,
+prerequisites and the learners enrolled in it. Features of one kind share a
+weight (:data:`FEATURE_WEIGHTS`), and courses are ranked by the cosine
+similarity of their weighted vectors.
+
+The index keeps an inverted posting list per feature, so scoring one course
+only visits courses sharing at least one of its features. Shared-feature
+counts are accumulated with :class:`collections.Counter` over whole posting
+lists, which runs in C, rather than by comparing course pairs. Posting lists
+are taken rarest first until :data:`MAX_CANDIDATES` courses are in play; the
+query's remaining, most common features are then only checked against those
+candidates. Candidate scores stay exact, but on a large catalog a course that
+shares nothing except very common features may be missed.
+
+The index is loaded from ``courses`` and ``enrollments`` on first use. After
+that each query first applies newer ``course.*`` and ``enrollment.created``
+outbox events (see :class:`~app.outbox.OutboxFollower`). Deleted courses are
+also evicted when a lookup finds them gone.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import Course, Enrollment
+from app.outbox.follower import OutboxFollower
+from app.schemas.courses import CourseStatus
+from app.schemas.outbox import OutboxEventType
+
+# Relative importance of a shared feature of each kind. Integers, so a shared
+# feature adds its squared weight to the dot product by counting.
+FEATURE_WEIGHTS = {"tag": 2, "category": 1, "prerequisite": 2, "learner": 1}
+# Courses gathered from posting lists before the remaining (most common)
+# features of the query course are only checked against those candidates.
+MAX_CANDIDATES = 5000
+
+COURSE_FEATURES = select(
+    Course.id, Course.status, Course.tags, Course.category, Course.prerequisites
+).where(Course.deleted_at.is_(None))
+COURSE_LEARNERS = select(Enrollment.course_id, func.lower(Enrollment.email))
+
+Feature = tuple[str, str]
+
+
+def _normalize(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+def course_features(
+    tags: Iterable[str], category: str | None, prerequisites: Iterable[str]
+) -> set[Feature]:
+    """Catalog features of a course, case-insensitively."""
+    features = {("tag", _normalize(tag)) for tag in tags}
+    features |= {("prerequisite", _normalize(item)) for item in prerequisites}
+    if category:
+        features.add(("category", _normalize(category)))
+    features.discard(("tag", ""))
+    features.discard(("prerequisite", ""))
+    return features
+
+
+class SimilarityIndex(OutboxFollower):
+    """Sparse course feature vectors with inverted posting lists."""
+
+    event_types = (
+        OutboxEventType.course_created,
+        OutboxEventType.course_updated,
+        OutboxEventType.course_deleted,
+        OutboxEventType.enrollment_created,
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._catalog: dict[str, set[Feature]] = {}
+        self._learners: dict[str, set[str]] = {}
+        self._features: dict[str, set[Feature]] = {}
+        self._postings: dict[Feature, set[str]] = {}
+        self._norms: dict[str, float] = {}
+        self._published: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    async def load(self, session: AsyncSession) -> None:
+        """Build every course's vector from the database."""
+        courses = (await session.execute(COURSE_FEATURES)).all()
+        learners = (await session.execute(COURSE_LEARNERS)).all()
+        self._reset()
+        for course_id, course_status, tags, category, prerequisites in courses:
+            self._catalog[course_id] = course_features(
+                tags or [], category, prerequisites or []
+            )
+            if course_status == CourseStatus.published:
+                self._published.add(course_id)
+        for course_id, email in learners:
+            if course_id in self._catalog:
+                self._learners.setdefault(course_id, set()).add(email)
+        for course_id in self._catalog:
+            self._index(course_id)
+
+    def apply(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Apply one ``course.*`` or ``enrollment.created`` outbox payload."""
+        if event_type == OutboxEventType.enrollment_created.value:
+            enrollment = payload["enrollment"]
+            course_id = enrollment["course_id"]
+            email = _normalize(enrollment["email"])
+            learners = self._learners.get(course_id)
+            if course_id in self._features and email not in (learners or ()):
+                self._learners.setdefault(course_id, set()).add(email)
+                # One new feature: extend the vector instead of rebuilding it.
+                feature = ("learner", email)
+                self._features[course_id].add(feature)
+                self._postings.setdefault(feature, set()).add(course_id)
+                self._norms[course_id] = math.sqrt(
+                    self._norms[course_id] ** 2 + FEATURE_WEIGHTS["learner"] ** 2
+                )
+            return
+        course = payload["course"]
+        course_id = course["id"]
+        if event_type == OutboxEventType.course_deleted.value:
+            self.evict(course_id)
+            return
+        self._catalog[course_id] = course_features(
+            course["tags"], course["category"], course["prerequisites"]
+        )
+        if course["status"] == CourseStatus.published.value:
+            self._published.add(course_id)
+        else:
+            self._published.discard(course_id)
+        self._index(course_id)
+
+    def _index(self, course_id: str) -> None:
+        """(Re)build one course's vector and posting list entries."""
+        self._unindex(course_id)
+        features = self._catalog[course_id] | {
+            ("learner", email) for email in self._learners.get(course_id, ())
+        }
+        self._features[course_id] = features
+        for feature in features:
+            self._postings.setdefault(feature, set()).add(course_id)
+        self._norms[course_id] = math.sqrt(
+            sum(FEATURE_WEIGHTS[kind] ** 2 for kind, _ in features)
+        )
+
+    def _unindex(self, course_id: str) -> None:
+        for feature in self._features.pop(course_id, ()):
+            posting = self._postings[feature]
+            posting.discard(course_id)
+            if not posting:
+                del self._postings[feature]
+        self._norms.pop(course_id, None)
+
+    def evict(self, course_id: str) -> None:
+        """Forget a course, e.g. one found deleted."""
+        self._unindex(course_id)
+        self._catalog.pop(course_id, None)
+        self._learners.pop(course_id, None)
+        self._published.discard(course_id)
+
+    def similar(self, course_id: str, limit: int) -> list[tuple[str, float]]:
+        """Top ``limit`` published courses most similar to ``course_id``."""
+        features = self._features.get(course_id)
+        norm = self._norms.get(course_id)
+        if not features or not norm:
+            return []
+        postings = self._postings
+        dot: Counter[str] = Counter()
+        common: list[Feature] = []
+        for feature in sorted(features, key=lambda feature: len(postings[feature])):
+            posting = postings[feature]
+            if dot and len(dot) + len(posting) > MAX_CANDIDATES:
+                common.append(feature)
+                continue
+            for _ in range(FEATURE_WEIGHTS[feature[0]] ** 2):
+                dot.update(posting)
+        for feature in common:
+            posting = postings[feature]
+            weight = FEATURE_WEIGHTS[feature[0]] ** 2
+            for other in dot.keys() & posting:
+                dot[other] += weight
+        dot.pop(course_id, None)
+        norms = self._norms
+        published = self._published
+        return heapq.nlargest(
+            limit,
+            (
+                (other, value / (norm * norms[other]))
+                for other, value in dot.items()
+                if other in published
+            ),
+            key=lambda item: (item[1], item[0]),
+        )
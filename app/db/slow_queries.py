@@ -0,0 +1,142 @@
+"""Slow query log fed by engine cursor events.
+
+Statements slower than the configured threshold are recorded with redacted
+parameters, the route that issued them and their duration. Entries are kept
+in a bounded per-worker ring buffer (served by ``GET /admin/slow-queries``)
+and written to the log as JSON. A sampled subset of slow Postgres ``SELECT``
+statements is re-run under ``EXPLAIN (ANALYZE, BUFFERS)`` to capture the plan.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.deadlines import current_route
+
+logger = logging.getLogger(__name__)
+
+_STARTED = "slow_query_started"
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bound values with their type names so no user data is kept."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """Record statements slower than ``threshold_ms`` into a ring buffer."""
+
+    def __init__(
+        self, threshold_ms: float, explain_sample_rate: float, size: int
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.entries: deque[dict[str, Any]] = deque(maxlen=size)
+
+    def install(self, engine: Engine) -> None:
+        """Attach the cursor event hooks to a (sync) engine."""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def remove(self, engine: Engine) -> None:
+        """Detach the hooks added by :meth:`install`."""
+        event.remove(engine, "before_cursor_execute", self._before_execute)
+        event.remove(engine, "after_cursor_execute", self._after_execute)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Return recorded entries, newest first."""
+        return list(reversed(self.entries))
+
+    def _before_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        # Kept on the per-statement context, so a statement that raises leaves
+        # nothing behind on the (pooled, long-lived) connection.
+        if context is not None:
+            setattr(context, _STARTED, time.perf_counter())
+
+    def _after_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        started = getattr(context, _STARTED, None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        entry: dict[str, Any] = {
+            "recorded_at": datetime.now(UTC).isoformat(),
+            "route": current_route.get(),
+            "duration_ms": round(duration_ms, 3),
+            "statement": statement,
+            "parameters": redact_parameters(
+                parameters[0] if executemany and parameters else parameters
+            ),
+            "executemany": executemany,
+            "plan": None,
+        }
+        if (
+            not executemany
+            and conn.dialect.name == "postgresql"
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and random.random() < self.explain_sample_rate
+        ):
+            entry["plan"] = _explain(conn, statement, parameters)
+        self.entries.append(entry)
+        logger.warning("Slow query: %s", json.dumps(entry))
+
+
+def _explain(conn: Connection, statement: str, parameters: Any) -> list[str] | None:
+    """Run ``EXPLAIN (ANALYZE, BUFFERS)`` inside a savepoint.
+
+    The raw DBAPI cursor keeps the explain out of the event hooks, and the
+    savepoint keeps a failed explain from aborting the caller's transaction.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = [row[0] for row in cursor.fetchall()]
+        except Exception as exc:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            logger.info("Slow query explain failed: %s", exc)
+            return None
+        cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        return plan
+    finally:
+        cursor.close()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_threshold_ms,
+    explain_sample_rate=settings.slow_query_explain_sample_rate,
+    size=settings.slow_query_log_size,
+)
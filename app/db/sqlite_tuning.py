@@ -0,0 +1,66 @@
+"""Tuned SQLite profile for single-node deployments (``DB_SQLITE_TUNED``).
+
+Every connection switches the database to WAL journaling with
+``synchronous=NORMAL``, so readers never block the writer and a commit costs
+one WAL append instead of fsyncs of the main file. It also maps the file into
+memory (``mmap_size``), sizes the page cache (``cache_size``) and waits up to
+``busy_timeout`` for a lock instead of failing with ``database is locked``.
+
+SQLite allows one writer at a time, so writes go through an engine with a
+single pooled connection and writers queue for it in the pool. Its
+transactions start with ``BEGIN IMMEDIATE``: taking the write lock at the
+start avoids a deferred transaction failing when it tries to upgrade from a
+read lock. Reads use a separate pool of ``query_only`` connections, which
+read the last committed WAL snapshot while a write is in progress.
+
+In-memory databases exist per connection and are left alone.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from app.core.config import Settings
+
+
+def sqlite_tuned(config: Settings) -> bool:
+    """Whether ``config`` selects the tuned profile for a file database."""
+    url = make_url(config.database_url)
+    return (
+        config.db_sqlite_tuned
+        and url.get_backend_name() == "sqlite"
+        and url.database not in (None, "", ":memory:")
+    )
+
+
+def sqlite_pragmas(config: Settings, *, read_only: bool) -> list[str]:
+    """PRAGMA statements run on every new connection."""
+    pragmas = [
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        f"PRAGMA mmap_size = {config.db_sqlite_mmap_size}",
+        f"PRAGMA cache_size = {config.db_sqlite_cache_size}",
+        f"PRAGMA busy_timeout = {config.db_sqlite_busy_timeout_ms}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    return pragmas
+
+
+def install(engine: Engine, config: Settings, *, read_only: bool) -> None:
+    """Apply the profile to the connections of ``engine``."""
+    pragmas = sqlite_pragmas(config, read_only=read_only)
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+        if not read_only:
+            # The sqlite3 module opens a transaction right before the first
+            # write statement; make that BEGIN IMMEDIATE instead of deferred.
+            dbapi_connection.isolation_level = "IMMEDIATE"
@@ -0,0 +1,18 @@
+"""Connection pool warmup helpers used during application startup."""
+
+from contextlib import AsyncExitStack
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` connections at once, then return them to the pool.
+
+    Holding them simultaneously forces the pool to grow to that size, so the
+    first requests after a deploy reuse established connections.
+    """
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
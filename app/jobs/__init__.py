@@ -0,0 +1,16 @@
+"""Persistent background jobs: enqueue in a request, run in a worker pool."""
+
+from app.jobs.queue import claim, enqueue, retry_delay
+from app.jobs.registry import HANDLERS, job_handler
+from app.jobs.worker import JobContext, JobWorker, LeaseLostError
+
+__all__ = [
+    "HANDLERS",
+    "JobContext",
+    "JobWorker",
+    "LeaseLostError",
+    "claim",
+    "enqueue",
+    "job_handler",
+    "retry_delay",
+]
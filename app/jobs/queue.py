@@ -0,0 +1,95 @@
+"""Enqueueing and claiming jobs stored in the ``jobs`` table.
+
+Jobs are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent
+workers, in this process or others, never pick the same row and never wait
+on each other. SQLite has no row locks (``FOR UPDATE`` is not emitted), so
+the claiming ``UPDATE`` repeats the claimable condition and a claim only
+counts when it changed exactly one row.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import Job
+from app.jobs.registry import HANDLERS
+from app.schemas.jobs import JobState
+
+
+def utcnow() -> datetime:
+    """Current time in UTC (job timestamps are compared in Python's clock)."""
+    return datetime.now(UTC)
+
+
+def retry_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff in seconds before retrying after ``attempt``."""
+    return min(base * 2 ** (attempt - 1), cap)
+
+
+def enqueue(
+    session: AsyncSession,
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    max_attempts: int | None = None,
+    run_at: datetime | None = None,
+) -> Job:
+    """Add a job to ``session``; it is queued when the caller commits.
+
+    Enqueueing in the caller's transaction means the job exists only if the
+    work that requested it was committed too.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind!r}")
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        max_attempts=max_attempts or settings.job_max_attempts,
+        run_at=run_at or utcnow(),
+        progress={},
+    )
+    session.add(job)
+    return job
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(Job.status == JobState.queued.value, Job.run_at <= now),
+        and_(Job.status == JobState.running.value, Job.locked_until < now),
+    )
+
+
+async def claim(session: AsyncSession, lease_seconds: float) -> Job | None:
+    """Claim the next due job (or one whose lease expired) and commit."""
+    now = utcnow()
+    job_id = await session.scalar(
+        select(Job.id)
+        .where(_claimable(now))
+        .order_by(Job.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if job_id is None:
+        await session.rollback()
+        return None
+    claimed = await session.execute(
+        update(Job)
+        .where(Job.id == job_id, _claimable(now))
+        .values(
+            status=JobState.running.value,
+            attempts=Job.attempts + 1,
+            locked_until=now + timedelta(seconds=lease_seconds),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount != 1:
+        # Lost the race to another worker (SQLite path).
+        await session.rollback()
+        return None
+    await session.commit()
+    return await session.get(Job, job_id, populate_existing=True)
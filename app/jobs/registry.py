@@ -0,0 +1,30 @@
+"""Registry mapping job kinds to their async handlers."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.jobs.worker import JobContext
+
+JobHandler = Callable[["JobContext", dict[str, Any]], Awaitable[dict[str, Any] | None]]
+
+HANDLERS: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated coroutine as the handler for ``kind`` jobs.
+
+    Handlers receive a :class:`~app.jobs.worker.JobContext` and the job payload
+    and may return a JSON-serializable result. They can run more than once
+    (retries, expired leases), so they must be idempotent.
+    """
+
+    def register(handler: JobHandler) -> JobHandler:
+        if kind in HANDLERS:
+            raise ValueError(f"Duplicate job handler for {kind!r}")
+        HANDLERS[kind] = handler
+        return handler
+
+    return register
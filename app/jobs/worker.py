@@ -0,0 +1,193 @@
+"""Asyncio worker pool that runs queued jobs.
+
+Each worker loops: claim a due job, run its registered handler, then record
+success or schedule a retry with exponential backoff until ``max_attempts``
+is reached. A claimed job carries a lease that :meth:`JobContext.report`
+renews; if a process dies mid-job, the lease expires and another worker
+picks the job up again.
+
+Every claim increments ``attempts``, which doubles as a fencing token: progress
+reports and the final status only apply while the row still carries the
+attempt this worker claimed. A worker that stalled past its lease therefore
+cannot overwrite the state of the worker that reclaimed the job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.models import Job
+from app.jobs.queue import claim, retry_delay, utcnow
+from app.jobs.registry import HANDLERS
+from app.schemas.jobs import JobState
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLostError(Exception):
+    """The job was reclaimed by another worker after this one's lease expired."""
+
+
+def _fenced(job: Job) -> Any:
+    """Update ``job`` only while it is still running the attempt we claimed."""
+    return (
+        update(Job)
+        .where(
+            Job.id == job.id,
+            Job.status == JobState.running.value,
+            Job.attempts == job.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+class JobContext:
+    """What a handler gets besides its payload: sessions and progress."""
+
+    def __init__(
+        self, sessions: async_sessionmaker[AsyncSession], job: Job, lease: float
+    ) -> None:
+        self.sessions = sessions
+        self.job = job
+        self.lease = lease
+        self.progress: dict[str, Any] = dict(job.progress or {})
+
+    @property
+    def final_attempt(self) -> bool:
+        """Whether a failure now would fail the job for good."""
+        return self.job.attempts >= self.job.max_attempts
+
+    async def report(self, **progress: Any) -> None:
+        """Merge ``progress`` into the job record and renew the lease.
+
+        Raises :class:`LeaseLostError` if another worker has reclaimed the job.
+        """
+        self.progress.update(progress)
+        async with self.sessions() as session:
+            reported = await session.execute(
+                _fenced(self.job).values(
+                    progress=self.progress,
+                    locked_until=utcnow() + timedelta(seconds=self.lease),
+                )
+            )
+            await session.commit()
+        if reported.rowcount != 1:
+            raise LeaseLostError(self.job.id)
+
+
+class JobWorker:
+    """Run up to ``concurrency`` jobs at a time from the ``jobs`` table."""
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        poll_interval: float,
+        lease_seconds: float,
+        retry_backoff: float,
+        retry_backoff_max: float,
+    ) -> None:
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        """Spawn the worker tasks on the running loop."""
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running are requeued."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self) -> bool:
+        """Claim and run a single job; ``False`` when nothing was due."""
+        async with self.sessions() as session:
+            job = await claim(session, self.lease_seconds)
+        if job is None:
+            return False
+        await self._execute(job)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                ran = await self.run_once()
+            except (SQLAlchemyError, OSError):
+                logger.exception("Job worker could not reach the database")
+                ran = False
+            if not ran:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _execute(self, job: Job) -> None:
+        context = JobContext(self.sessions, job, self.lease_seconds)
+        try:
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind {job.kind!r}")
+            result = await handler(context, job.payload)
+        except asyncio.CancelledError:
+            await self._finish(job, status=JobState.queued, run_at=utcnow())
+            raise
+        except LeaseLostError:
+            logger.warning(
+                "Job %s (%s) attempt %d lost its lease; abandoning it",
+                job.id,
+                job.kind,
+                job.attempts,
+            )
+        except Exception as exc:
+            logger.exception(
+                "Job %s (%s) attempt %d failed", job.id, job.kind, job.attempts
+            )
+            if context.final_attempt:
+                await self._finish(
+                    job, status=JobState.failed, error=str(exc), finished_at=utcnow()
+                )
+            else:
+                delay = retry_delay(
+                    job.attempts, self.retry_backoff, self.retry_backoff_max
+                )
+                await self._finish(
+                    job,
+                    status=JobState.queued,
+                    error=str(exc),
+                    run_at=utcnow() + timedelta(seconds=delay),
+                )
+        else:
+            await self._finish(
+                job, status=JobState.succeeded, result=result, finished_at=utcnow()
+            )
+
+    async def _finish(self, job: Job, status: JobState, **values: Any) -> None:
+        if "error" in values:
+            values["error"] = values["error"][:1000]
+        async with self.sessions() as session:
+            finished = await session.execute(
+                _fenced(job).values(status=status.value, locked_until=None, **values)
+            )
+            await session.commit()
+        if finished.rowcount != 1:
+            logger.warning(
+                "Job %s (%s) attempt %d lost its lease; not recording %s",
+                job.id,
+                job.kind,
+                job.attempts,
+                status.value,
+            )
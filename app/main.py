@@ -1,21 +1,224 @@
 """LabForge API - FastAPI Application."""
 
-from fastapi import FastAPI
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 
-from app.api import api_router
-from app.schemas.health import HealthResponse
+from fastapi import FastAPI, Request, Response
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-app = FastAPI(
-    title="LabForge API",
-    description="A FastAPI backend API for managing labs/training for UI",
-    version="0.1.0",
+from app import IMPORT_STARTED_AT
+from app.api import api_router
+from app.core.admission import AdmissionController, AdmissionMiddleware
+from app.core.config import settings
+from app.core.deadlines import DeadlineMiddleware, parse_route_timeouts
+from app.db import queries
+from app.db.catalog import CatalogSnapshotter
+from app.db.facets import FacetIndex
+from app.db.prerequisites import PrerequisiteGraph
+from app.db.readiness import ReadinessProbe
+from app.db.session import (
+    async_session_factory,
+    dispose_engine,
+    engine_options,
+    get_engine,
+    get_read_engine,
+    get_read_session_factory,
+    get_session_factory,
 )
+from app.db.similarity import SimilarityIndex
+from app.db.warmup import warm_pool
+from app.jobs import JobWorker
+from app.outbox import ChangeHub, OutboxDispatcher, parse_sinks
+from app.schemas.health import HealthResponse, ReadinessResponse
+
+logger = logging.getLogger(__name__)
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED_AT
 
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check() -> HealthResponse:
     """Health check endpoint to verify the API is running."""
     return HealthResponse(status="healthy", message="LabForge API is running")
 
 
-app.include_router(api_router)
+async def readiness_check(request: Request, response: Response) -> ReadinessResponse:
+    """Report whether this worker can serve traffic (503 when it cannot)."""
+    report = await request.app.state.readiness.check()
+    if report["status"] != "ready":
+        response.status_code = 503
+    return ReadinessResponse(**report)
+
+
+async def _warm_database() -> None:
+    """Pre-open pool connections and populate the compiled statement cache."""
+    try:
+        pool_size = engine_options(settings).get("pool_size", settings.db_pool_size)
+        await warm_pool(get_engine(), min(settings.db_pool_warmup, pool_size))
+        if get_read_engine() is not get_engine():
+            read_pool_size = engine_options(settings, read_only=True)["pool_size"]
+            await warm_pool(
+                get_read_engine(), min(settings.db_pool_warmup, read_pool_size)
+            )
+        if settings.warm_statement_cache:
+            async with async_session_factory() as session:
+                await queries.warm(session)
+    except (SQLAlchemyError, OSError) as exc:
+        # Start anyway; readiness reporting covers an unreachable database.
+        logger.warning("Database warmup skipped: %s", getattr(exc, "orig", exc))
+
+
+def _background_sessions(
+    app: FastAPI,
+    dependency: Callable[[], async_sessionmaker[AsyncSession]] = get_session_factory,
+) -> async_sessionmaker[AsyncSession]:
+    """Resolve a session factory like a request would, honoring overrides."""
+    return app.dependency_overrides.get(dependency, dependency)()
+
+
+def _job_worker(app: FastAPI) -> JobWorker | None:
+    """Build this process's job worker pool, if it should run one."""
+    if not settings.job_workers:
+        return None
+    return JobWorker(
+        _background_sessions(app),
+        concurrency=settings.job_workers,
+        poll_interval=settings.job_poll_interval,
+        lease_seconds=settings.job_lease_seconds,
+        retry_backoff=settings.job_retry_backoff,
+        retry_backoff_max=settings.job_retry_backoff_max,
+    )
+
+
+def _outbox_dispatcher(app: FastAPI) -> OutboxDispatcher | None:
+    """Build this process's outbox dispatcher, if it should run one."""
+    if not settings.outbox_dispatcher:
+        return None
+    return OutboxDispatcher(
+        _background_sessions(app),
+        parse_sinks(settings.outbox_sinks, settings.outbox_http_timeout),
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval,
+        lease_seconds=settings.outbox_lease_seconds,
+        retry_backoff=settings.job_retry_backoff,
+        retry_backoff_max=settings.job_retry_backoff_max,
+        retention=settings.outbox_retention,
+    )
+
+
+def _catalog_snapshotter(app: FastAPI) -> CatalogSnapshotter:
+    """Build the follower that keeps this host's catalog snapshot current.
+
+    It only reads, so it runs on the read engine and leaves the tuned SQLite
+    profile's single writer connection to requests and jobs.
+    """
+    return CatalogSnapshotter(
+        _background_sessions(app, get_read_session_factory),
+        interval=settings.catalog_snapshot_debounce,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm caches before serving traffic and release the pool on shutdown."""
+    started = time.perf_counter()
+    await _warm_database()
+    app.openapi()
+    timings = app.state.startup_timings
+    timings["startup_seconds"] = time.perf_counter() - started
+    logger.info(
+        "Startup complete: import=%.3fs factory=%.3fs startup=%.3fs",
+        timings["import_seconds"],
+        timings["factory_seconds"],
+        timings["startup_seconds"],
+    )
+    background = [
+        service
+        for service in (
+            _job_worker(app),
+            _outbox_dispatcher(app),
+            _catalog_snapshotter(app),
+        )
+        if service is not None
+    ]
+    for service in background:
+        service.start()
+    yield
+    for service in background:
+        await service.stop()
+    await app.state.change_hub.stop()
+    await dispose_engine()
+
+
+def create_app() -> FastAPI:
+    """Build the FastAPI application."""
+    started = time.perf_counter()
+    application = FastAPI(
+        title="LabForge API",
+        description="A FastAPI backend API for managing labs/training for UI",
+        version="0.1.0",
+        lifespan=lifespan,
+    )
+    application.add_api_route(
+        "/health",
+        health_check,
+        methods=["GET"],
+        response_model=HealthResponse,
+        tags=["Health"],
+    )
+    application.add_api_route(
+        "/health/ready",
+        readiness_check,
+        methods=["GET"],
+        response_model=ReadinessResponse,
+        responses={503: {"model": ReadinessResponse}},
+        tags=["Health"],
+    )
+    application.state.readiness = ReadinessProbe(
+        get_engine,
+        ttl=settings.readiness_cache_ttl,
+        timeout=settings.readiness_timeout,
+        max_pool_saturation=settings.readiness_max_pool_saturation,
+    )
+    application.state.change_hub = ChangeHub(
+        lambda: _background_sessions(application),
+        poll_interval=settings.sse_poll_interval,
+        client_buffer=settings.sse_client_buffer,
+        max_clients=settings.sse_max_clients,
+    )
+    application.state.similarity_index = SimilarityIndex()
+    application.state.prerequisite_graph = PrerequisiteGraph()
+    application.state.facet_index = FacetIndex()
+    application.include_router(api_router)
+    application.add_middleware(
+        DeadlineMiddleware,
+        routes=application.router.routes,
+        default_timeout=settings.request_timeout,
+        # Event streams are meant to stay open; keepalives detect disconnects.
+        route_timeouts={
+            "stream_course_events": 0,
+            **parse_route_timeouts(settings.route_timeouts),
+        },
+    )
+    admission = AdmissionController(
+        max_concurrency=settings.admission_max_concurrency
+        or settings.db_pool_size + settings.db_max_overflow,
+        max_queue=settings.admission_max_queue,
+        queue_timeout=settings.admission_queue_timeout,
+    )
+    application.state.admission = admission
+    application.add_middleware(
+        AdmissionMiddleware,
+        controller=admission,
+        retry_after=settings.admission_retry_after,
+    )
+    application.state.startup_timings = {
+        "import_seconds": IMPORT_SECONDS,
+        "factory_seconds": time.perf_counter() - started,
+    }
+    return application
+
+
+app = create_app()
@@ -0,0 +1,19 @@
+"""Transactional outbox: record change events with the change, deliver later."""
+
+from app.outbox.dispatcher import OutboxDispatcher
+from app.outbox.events import record_event
+from app.outbox.follower import OutboxFollower
+from app.outbox.hub import ChangeHub, Subscription
+from app.outbox.sinks import FileSink, HttpSink, OutboxSink, parse_sinks
+
+__all__ = [
+    "ChangeHub",
+    "FileSink",
+    "HttpSink",
+    "OutboxDispatcher",
+    "OutboxFollower",
+    "OutboxSink",
+    "Subscription",
+    "parse_sinks",
+    "record_event",
+]
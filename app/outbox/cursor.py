@@ -0,0 +1,96 @@
+"""Read position in the outbox that copes with ids committing out of order.
+
+Outbox ids are handed out when a transaction inserts its event, not when it
+commits, so a later id can become visible before an earlier one. Reading
+``id > last id seen`` would skip the earlier one for good. An
+:class:`OutboxCursor` instead keeps a mark: the highest id below which every
+id has been seen. Readers fetch everything past the mark and skip the ids
+already seen. An id missing below a newer one is a transaction still in
+flight, or one that rolled back. It holds the mark back until it shows up, or
+for at most ``GAP_TIMEOUT`` seconds, after which it is taken to have rolled
+back. A reader starting from scratch, or resuming from the last id it saw,
+starts from :func:`settled_outbox_id`, ``GAP_TIMEOUT`` seconds back, for the
+same reason.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import OutboxEvent
+from app.jobs.queue import utcnow
+
+# Longest an outbox-writing transaction is expected to stay open (seconds).
+GAP_TIMEOUT = 60.0
+
+OUTBOX_SETTLED = select(func.coalesce(func.max(OutboxEvent.id), 0)).where(
+    OutboxEvent.created_at < bindparam("before")
+)
+
+
+async def settled_outbox_id(session: AsyncSession, seen_id: int | None = None) -> int:
+    """A safe starting mark: no id at or below it can still commit.
+
+    That is the newest id created ``GAP_TIMEOUT`` before now or, for a reader
+    that has seen up to ``seen_id``, before that event was created.
+    """
+    created_at = None
+    if seen_id is not None:
+        created_at = await session.scalar(
+            select(OutboxEvent.created_at).where(OutboxEvent.id == seen_id)
+        )
+        if created_at is None:
+            # Pruned, so older than the retention period: long settled.
+            return seen_id
+    before = (created_at or utcnow()) - timedelta(seconds=GAP_TIMEOUT)
+    mark = int(await session.scalar(OUTBOX_SETTLED, {"before": before}))
+    return mark if seen_id is None else min(mark, seen_id)
+
+
+class OutboxCursor:
+    """The outbox ids seen so far, as a gap-safe mark plus the ids past it."""
+
+    def __init__(self, mark: int = 0) -> None:
+        self.reset(mark)
+
+    def reset(self, mark: int, seen: Iterable[int] = ()) -> None:
+        """Start over from ``mark``, with ``seen`` ids past it already seen."""
+        self.mark = mark
+        # Ids past the mark already seen, and missing ids -> first noticed.
+        self._seen: set[int] = set()
+        self._gaps: dict[int, float] = {}
+        for event_id in seen:
+            self.add(event_id)
+        self.advance()
+
+    def seen(self, event_id: int) -> bool:
+        """Whether ``event_id`` was already seen."""
+        return event_id <= self.mark or event_id in self._seen
+
+    def add(self, event_id: int) -> None:
+        """Record ``event_id`` as seen."""
+        if event_id > self.mark:
+            self._seen.add(event_id)
+            self._gaps.pop(event_id, None)
+
+    def advance(self) -> None:
+        """Note new gaps and move the mark past every seen or expired id."""
+        now = time.monotonic()
+        newest = max(self._seen, default=self.mark)
+        for event_id in range(self.mark + 1, newest):
+            if event_id not in self._seen:
+                self._gaps.setdefault(event_id, now)
+        while True:
+            next_id = self.mark + 1
+            if next_id in self._seen:
+                self._seen.discard(next_id)
+            elif next_id in self._gaps and now - self._gaps[next_id] > GAP_TIMEOUT:
+                del self._gaps[next_id]
+            else:
+                break
+            self.mark = next_id
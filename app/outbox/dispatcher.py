@@ -0,0 +1,225 @@
+"""Background dispatcher that drains the outbox to the configured sinks.
+
+Each pass claims a batch of due events in a short transaction: it selects
+them with ``SELECT ... FOR UPDATE SKIP LOCKED`` (so dispatchers in other
+processes take different rows), pushes their ``next_attempt_at`` out by the
+lease and commits. The events are then delivered to every sink in id order
+with no transaction open, so a slow sink holds neither row locks nor a
+connection. A second short transaction marks the delivered events dispatched
+and schedules the failed ones for a retry with exponential backoff.
+
+A dispatcher that crashes or stops mid-batch leaves its events claimed until
+the lease runs out; they are then delivered again. Delivery is at-least-once.
+Dispatched events are kept for ``OUTBOX_RETENTION`` seconds, then pruned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.models import OutboxEvent
+from app.jobs.queue import retry_delay, utcnow
+from app.outbox.sinks import OutboxSink
+from app.schemas.outbox import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+# Seconds between retention sweeps while the dispatcher is idle.
+PRUNE_INTERVAL = 60.0
+
+
+def _due(now: datetime):
+    return OutboxEvent.dispatched_at.is_(None) & (OutboxEvent.next_attempt_at <= now)
+
+
+class OutboxDispatcher:
+    """Deliver pending outbox events to ``sinks`` in batches."""
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker[AsyncSession],
+        sinks: Sequence[OutboxSink],
+        batch_size: int,
+        poll_interval: float,
+        lease_seconds: float,
+        retry_backoff: float,
+        retry_backoff_max: float,
+        retention: float,
+    ) -> None:
+        self.sessions = sessions
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self.retention = retention
+        self._task: asyncio.Task[None] | None = None
+        self._pruned_at = 0.0
+
+    def start(self) -> None:
+        """Spawn the dispatch loop on the running loop."""
+        self._task = asyncio.create_task(self._run(), name="outbox-dispatcher")
+
+    async def stop(self) -> None:
+        """Cancel the loop; an interrupted batch is delivered again later.
+
+        Its events are retried once their lease expires.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> int:
+        """Dispatch one batch of due events; returns how many were attempted."""
+        leased_until, events = await self._claim()
+        delivered: list[int] = []
+        failed: dict[int, str] = {}
+        for event in events:
+            error = await self._deliver(event)
+            if error is None:
+                delivered.append(event.id)
+            else:
+                failed[event.id] = error
+        if events:
+            await self._record(leased_until, events, delivered, failed)
+        return len(events)
+
+    async def _claim(self) -> tuple[datetime, list[OutboxEvent]]:
+        """Lease a batch of due events to this dispatcher and commit."""
+        async with self.sessions() as session:
+            now = utcnow()
+            leased_until = now + timedelta(seconds=self.lease_seconds)
+            event_ids = list(
+                await session.scalars(
+                    select(OutboxEvent.id)
+                    .where(_due(now))
+                    .order_by(OutboxEvent.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            )
+            if not event_ids:
+                await session.rollback()
+                return leased_until, []
+            # Repeating the due condition keeps dispatchers apart on SQLite,
+            # which has no row locks: only the rows this update changed count.
+            events = list(
+                await session.scalars(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_(event_ids), _due(now))
+                    .values(next_attempt_at=leased_until)
+                    .returning(OutboxEvent)
+                    .execution_options(synchronize_session=False)
+                )
+            )
+            await session.commit()
+        return leased_until, sorted(events, key=lambda event: event.id)
+
+    async def _record(
+        self,
+        leased_until: datetime,
+        events: Sequence[OutboxEvent],
+        delivered: Sequence[int],
+        failed: dict[int, str],
+    ) -> None:
+        """Mark delivered events dispatched and back off the failed ones.
+
+        A failure is only recorded while this dispatcher's lease still holds;
+        once another dispatcher has claimed the event, it owns the retry.
+        """
+        async with self.sessions() as session:
+            if delivered:
+                await session.execute(
+                    update(OutboxEvent)
+                    .where(
+                        OutboxEvent.id.in_(delivered),
+                        OutboxEvent.dispatched_at.is_(None),
+                    )
+                    .values(dispatched_at=utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+            for event in events:
+                if event.id not in failed:
+                    continue
+                attempts = event.attempts + 1
+                await session.execute(
+                    update(OutboxEvent)
+                    .where(
+                        OutboxEvent.id == event.id,
+                        OutboxEvent.dispatched_at.is_(None),
+                        OutboxEvent.next_attempt_at == leased_until,
+                    )
+                    .values(
+                        attempts=attempts,
+                        last_error=failed[event.id][:1000],
+                        next_attempt_at=utcnow()
+                        + timedelta(
+                            seconds=retry_delay(
+                                attempts, self.retry_backoff, self.retry_backoff_max
+                            )
+                        ),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+
+    async def prune(self) -> int:
+        """Delete events dispatched longer than the retention period ago."""
+        if not self.retention:
+            return 0
+        async with self.sessions() as session:
+            result = await session.execute(
+                delete(OutboxEvent).where(
+                    OutboxEvent.dispatched_at
+                    < utcnow() - timedelta(seconds=self.retention)
+                )
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def _deliver(self, event: OutboxEvent) -> str | None:
+        """Send ``event`` to every sink; the error message if one failed."""
+        try:
+            message = OutboxMessage.model_validate(event)
+            for sink in self.sinks:
+                await sink.deliver(message)
+        except Exception as exc:
+            logger.warning(
+                "Outbox event %s (%s) delivery attempt %d failed: %s",
+                event.id,
+                event.event_type,
+                event.attempts + 1,
+                exc,
+            )
+            return str(exc)
+        return None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                dispatched = await self.run_once()
+                if (
+                    dispatched < self.batch_size
+                    and loop.time() - self._pruned_at >= PRUNE_INTERVAL
+                ):
+                    self._pruned_at = loop.time()
+                    await self.prune()
+            except (SQLAlchemyError, OSError):
+                logger.exception("Outbox dispatcher could not reach the database")
+                dispatched = 0
+            except Exception:
+                # Keep dispatching; a dead loop would stall every sink silently.
+                logger.exception("Outbox dispatcher pass failed")
+                dispatched = 0
+            if dispatched < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
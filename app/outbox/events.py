@@ -0,0 +1,33 @@
+"""Recording change events in the writer's transaction."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import OutboxEvent
+from app.jobs.queue import utcnow
+from app.schemas.outbox import OutboxEventType
+
+
+def record_event(
+    session: AsyncSession,
+    event_type: OutboxEventType,
+    aggregate_id: str,
+    payload: dict[str, Any],
+) -> OutboxEvent:
+    """Add an outbox event to ``session``; it is published when the caller commits.
+
+    The event is inserted in the same transaction as the change it describes,
+    so it exists exactly when the change does and the request never waits on
+    a consumer.
+    """
+    event = OutboxEvent(
+        event_type=event_type.value,
+        aggregate_id=aggregate_id,
+        payload=payload,
+        next_attempt_at=utcnow(),
+    )
+    session.add(event)
+    return event
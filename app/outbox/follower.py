@@ -0,0 +1,76 @@
+"""Per-worker in-memory indexes kept current from the outbox.
+
+An :class:`OutboxFollower` loads its state from the database once. Each
+:meth:`~OutboxFollower.refresh` afterwards fetches only the outbox events past
+its mark and applies the kinds it cares about, so every worker process
+converges on the same state without a rebuild per request.
+
+The position is an :class:`~app.outbox.cursor.OutboxCursor`, so events that
+commit out of id order are still applied, once each. A load starts from
+:func:`~app.outbox.cursor.settled_outbox_id` and re-applies the newer events,
+which apply() must handle idempotently.
+
+Delivered events are pruned after ``OUTBOX_RETENTION`` seconds, so a follower
+that has not refreshed for that long may have missed some and reloads instead.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, ClassVar
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models import OutboxEvent
+from app.outbox.cursor import OutboxCursor, settled_outbox_id
+from app.schemas.outbox import OutboxEventType
+
+OUTBOX_CHANGES = (
+    select(OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload)
+    .where(OutboxEvent.id > bindparam("after_id"))
+    .order_by(OutboxEvent.id)
+)
+
+
+class OutboxFollower:
+    """Base for in-memory state loaded once and then fed outbox events."""
+
+    #: Event types passed to :meth:`apply`.
+    event_types: ClassVar[tuple[OutboxEventType, ...]] = ()
+
+    def __init__(self) -> None:
+        self._loaded = False
+        self._refreshed_at = 0.0
+        self._cursor = OutboxCursor()
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """Bring the state up to date: a full load at first, then new events."""
+        retention = settings.outbox_retention
+        idle = time.monotonic() - self._refreshed_at
+        if not self._loaded or (retention and idle > retention):
+            # Read the mark first: changes committed after it are in the loaded
+            # rows and get applied again later, so apply() must be idempotent.
+            mark = await settled_outbox_id(session)
+            await self.load(session)
+            self._cursor.reset(mark)
+            self._loaded = True
+        rows = await session.execute(OUTBOX_CHANGES, {"after_id": self._cursor.mark})
+        event_types = {kind.value for kind in self.event_types}
+        for event_id, event_type, payload in rows:
+            if self._cursor.seen(event_id):
+                continue
+            if event_type in event_types:
+                self.apply(event_type, payload)
+            self._cursor.add(event_id)
+        self._cursor.advance()
+        self._refreshed_at = time.monotonic()
+
+    async def load(self, session: AsyncSession) -> None:
+        """Replace all state from the database."""
+        raise NotImplementedError
+
+    def apply(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Apply one outbox event payload; must be idempotent."""
+        raise NotImplementedError
@@ -0,0 +1,243 @@
+"""Per-process fan-out of committed outbox events to live subscribers.
+
+One :class:`ChangeHub` per worker watches ``outbox_events`` and pushes each new
+event into the queue of every subscriber (an SSE connection), so thousands of
+connected clients cost one query per change rather than one poll each.
+
+On Postgres (asyncpg) the hub keeps one connection listening on the
+``outbox_events`` channel. A trigger notifies each inserted id when its
+transaction commits, so the hub fetches exactly the rows that became visible.
+The listening connection is opened outside the application pool, so it does
+not take a connection from the pool's budget. Behind pgbouncer in
+transaction pooling mode notifications are never delivered, so the hub does
+not listen there. On other databases, behind pgbouncer, or while the
+listening connection is down, it polls every ``poll_interval`` seconds.
+
+Outbox ids are assigned when an event is inserted, not when it commits, so the
+hub tracks what it has broadcast with an :class:`~app.outbox.cursor.OutboxCursor`
+and polls for everything past its gap-safe mark.
+
+A subscriber that falls ``client_buffer`` events behind is dropped (its queue
+receives ``None``); the client reconnects with ``Last-Event-ID`` and catches up
+through :meth:`ChangeHub.replay`. Replay starts from the gap-safe mark of the
+client's last event, so it includes events with lower ids that committed
+after it. A resuming client therefore gets the events of up to
+``GAP_TIMEOUT`` seconds before its last one again, and deduplicates on the
+event id.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import URL, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.models import OutboxEvent
+from app.outbox.cursor import OutboxCursor, settled_outbox_id
+from app.schemas.outbox import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "outbox_events"
+
+
+def listens(url: URL) -> bool:
+    """Whether a hub on ``url`` holds a LISTEN connection outside the pool."""
+    return url.get_driver_name() == "asyncpg" and not settings.db_pgbouncer
+
+
+class Subscription:
+    """Bounded queue of events for one client; ``None`` means it was dropped."""
+
+    def __init__(self, buffer: int) -> None:
+        self.queue: asyncio.Queue[OutboxMessage | None] = asyncio.Queue(buffer)
+
+    def push(self, message: OutboxMessage) -> bool:
+        """Queue ``message``; on overflow drop the backlog and signal the end."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+        return True
+
+
+class ChangeHub:
+    """Watch the outbox once per process and broadcast to subscribers."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], async_sessionmaker[AsyncSession]],
+        poll_interval: float,
+        client_buffer: int,
+        max_clients: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.client_buffer = client_buffer
+        self.max_clients = max_clients
+        self._subscribers: set[Subscription] = set()
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._notified: set[int] = set()
+        self._sessions: async_sessionmaker[AsyncSession] | None = None
+        self._listen_engine: AsyncEngine | None = None
+        self._listener: AsyncConnection | None = None
+        self._catch_up = False
+        self._task: asyncio.Task[None] | None = None
+        self._cursor = OutboxCursor()
+
+    @property
+    def clients(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._subscribers)
+
+    @property
+    def full(self) -> bool:
+        """Whether another subscriber would exceed ``max_clients``."""
+        return self.clients >= self.max_clients
+
+    async def subscribe(self) -> Subscription:
+        """Register a subscriber, starting the watcher on first use."""
+        async with self._lock:
+            if self._task is None:
+                self._sessions = self.session_factory()
+                # Listen before reading the tail so no commit falls in between.
+                await self._listen()
+                async with self._sessions() as session:
+                    mark = await settled_outbox_id(session)
+                    # Committed already: not news to subscribers.
+                    seen = await session.scalars(
+                        select(OutboxEvent.id).where(OutboxEvent.id > mark)
+                    )
+                    self._cursor.reset(mark, seen)
+                self._catch_up = False
+                self._task = asyncio.create_task(self._run(), name="change-hub")
+        subscription = Subscription(self.client_buffer)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Forget a subscriber (idempotent)."""
+        self._subscribers.discard(subscription)
+
+    async def replay(self, after_id: int) -> list[OutboxMessage]:
+        """Retained events after ``after_id``, for clients resuming a stream.
+
+        Starts from the gap-safe mark of ``after_id``: an event with a lower
+        id may have committed after the client saw ``after_id``.
+        """
+        async with self._sessions() as session:
+            start = await settled_outbox_id(session, after_id)
+            events = await session.scalars(
+                select(OutboxEvent)
+                .where(OutboxEvent.id > start, OutboxEvent.id != after_id)
+                .order_by(OutboxEvent.id)
+            )
+            return [OutboxMessage.model_validate(event) for event in events]
+
+    async def stop(self) -> None:
+        """Stop watching and release the listening connection."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._unlisten()
+        # Fresh primitives so the hub can restart on another event loop.
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._notified.clear()
+
+    def broadcast(self, message: OutboxMessage) -> None:
+        """Push ``message`` to every subscriber, dropping any that overflow."""
+        for subscription in list(self._subscribers):
+            if not subscription.push(message):
+                self._subscribers.discard(subscription)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self._notified.add(int(payload))
+        self._wakeup.set()
+
+    async def _listen(self) -> None:
+        engine = self._sessions.kw["bind"]
+        if not listens(engine.url):
+            return
+        try:
+            # A connection of its own, outside the application pool's budget.
+            self._listen_engine = create_async_engine(engine.url, poolclass=NullPool)
+            self._listener = await self._listen_engine.connect()
+            raw = await self._listener.get_raw_connection()
+            await raw.driver_connection.add_listener(CHANNEL, self._on_notify)
+            self._catch_up = True
+        except (SQLAlchemyError, OSError) as exc:
+            logger.warning("Change hub falling back to polling: %s", exc)
+            await self._unlisten()
+
+    async def _unlisten(self) -> None:
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            try:
+                await listener.close()
+            except (SQLAlchemyError, OSError):
+                pass
+        if self._listen_engine is not None:
+            listen_engine, self._listen_engine = self._listen_engine, None
+            await listen_engine.dispose()
+
+    def _listening(self) -> bool:
+        if self._listener is None:
+            return False
+        raw = self._listener.sync_connection.connection
+        return not raw.driver_connection.is_closed()
+
+    async def _fetch(self) -> list[OutboxEvent]:
+        statement = select(OutboxEvent).order_by(OutboxEvent.id)
+        if self._listening() and not self._catch_up:
+            if not self._notified:
+                return []
+            ids, self._notified = self._notified, set()
+            statement = statement.where(OutboxEvent.id.in_(ids))
+        else:
+            # Polling, or the first pass after (re)listening: anything past
+            # the mark that has not been broadcast yet.
+            self._catch_up = False
+            statement = statement.where(OutboxEvent.id > self._cursor.mark)
+        async with self._sessions() as session:
+            events = list(await session.scalars(statement))
+        self._notified.difference_update(event.id for event in events)
+        return [event for event in events if not self._cursor.seen(event.id)]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                if not self._listening():
+                    # Notifications may have been missed; the next fetch
+                    # after relistening catches up by id.
+                    await self._unlisten()
+                    await self._listen()
+                for event in await self._fetch():
+                    self._cursor.add(event.id)
+                    self.broadcast(OutboxMessage.model_validate(event))
+                self._cursor.advance()
+            except (SQLAlchemyError, OSError):
+                logger.exception("Change hub could not reach the database")
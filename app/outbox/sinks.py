@@ -0,0 +1,89 @@
+"""Destinations the outbox dispatcher delivers events to.
+
+A sink is anything with an async ``deliver(message)`` that raises on failure.
+``OUTBOX_SINKS`` configures them as comma-separated URLs:
+
+* ``file:///var/log/labforge/events.jsonl`` appends one JSON line per event.
+* ``http://...`` / ``https://...`` POSTs each event as JSON.
+
+Delivery is at-least-once, so consumers deduplicate on the event ``id`` (also
+sent as the ``Idempotency-Key`` header).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import urllib.request
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import unquote, urlsplit
+
+from app.schemas.outbox import OutboxMessage
+
+
+class OutboxSink(Protocol):
+    """Receiver of outbox events."""
+
+    async def deliver(self, message: OutboxMessage) -> None:
+        """Deliver one event, raising if it was not accepted."""
+
+
+class FileSink:
+    """Append events as JSON lines to a local file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def _append(self, line: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as file:
+            file.write(line)
+
+    async def deliver(self, message: OutboxMessage) -> None:
+        await asyncio.to_thread(
+            self._append, message.model_dump_json().encode() + b"\n"
+        )
+
+
+class HttpSink:
+    """POST each event as JSON to a webhook URL."""
+
+    def __init__(self, url: str, timeout: float) -> None:
+        self.url = url
+        self.timeout = timeout
+
+    def _post(self, body: bytes, event_id: int) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=body,
+            method="POST",
+            headers={
+                "Content-Type": "application/json",
+                "Idempotency-Key": str(event_id),
+            },
+        )
+        # Non-2xx responses raise HTTPError.
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    async def deliver(self, message: OutboxMessage) -> None:
+        await asyncio.to_thread(
+            self._post, message.model_dump_json().encode(), message.id
+        )
+
+
+def parse_sinks(raw: str, http_timeout: float) -> list[OutboxSink]:
+    """Build sinks from ``OUTBOX_SINKS``; unknown schemes raise ``ValueError``."""
+    sinks: list[OutboxSink] = []
+    for url in (item.strip() for item in raw.split(",")):
+        if not url:
+            continue
+        parts = urlsplit(url)
+        if parts.scheme == "file":
+            # ``file://./events.jsonl`` is relative to the working directory.
+            sinks.append(FileSink(unquote(parts.netloc + parts.path)))
+        elif parts.scheme in {"http", "https"}:
+            sinks.append(HttpSink(url, http_timeout))
+        else:
+            raise ValueError(f"Unsupported outbox sink: {url!r}")
+    return sinks
@@ -1,26 +1,74 @@
 """Pydantic schema exports for the LabForge API."""
 
+from app.schemas.admin import AdmissionMetrics, SlowQueryEntry, SlowQueryReport
 from app.schemas.courses import (
     Course,
+    CourseBatchGetRequest,
+    CourseBatchItem,
+    CourseBatchResponse,
     CourseCreate,
+    CourseDetail,
+    CourseFacets,
     CoursePublic,
+    CoursePurgeState,
+    CoursePurgeStatus,
     CourseStatus,
+    CourseSummary,
     CourseUpdate,
+    FacetCount,
+    SimilarCourse,
 )
-from app.schemas.enrollments import Enrollment, EnrollmentCreate
-from app.schemas.health import HealthResponse
+from app.schemas.enrollments import (
+    Enrollment,
+    EnrollmentCreate,
+    EnrollmentSummary,
+)
+from app.schemas.health import (
+    DatabaseCheck,
+    HealthResponse,
+    MigrationCheck,
+    PoolCheck,
+    ReadinessResponse,
+)
+from app.schemas.jobs import JobState, JobStatus
 from app.schemas.labs import LabExercise, LabExerciseCreate, LabResourceType
+from app.schemas.learners import LearnerEnrollment, LearnerEnrollmentPage
+from app.schemas.outbox import OutboxEventType, OutboxMessage
 
 __all__ = [
+    "AdmissionMetrics",
     "Course",
+    "CourseBatchGetRequest",
+    "CourseBatchItem",
+    "CourseBatchResponse",
     "CourseCreate",
+    "CourseDetail",
+    "CourseFacets",
     "CoursePublic",
+    "CoursePurgeState",
+    "CoursePurgeStatus",
     "CourseStatus",
+    "CourseSummary",
     "CourseUpdate",
     "Enrollment",
     "EnrollmentCreate",
+    "EnrollmentSummary",
+    "FacetCount",
     "LabExercise",
     "LabExerciseCreate",
     "LabResourceType",
+    "LearnerEnrollment",
+    "LearnerEnrollmentPage",
+    "SimilarCourse",
+    "SlowQueryEntry",
+    "SlowQueryReport",
     "HealthResponse",
+    "JobState",
+    "JobStatus",
+    "OutboxEventType",
+    "OutboxMessage",
+    "DatabaseCheck",
+    "MigrationCheck",
+    "PoolCheck",
+    "ReadinessResponse",
 ]
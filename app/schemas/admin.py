@@ -0,0 +1,37 @@
+"""Schemas for operational admin endpoints."""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class AdmissionMetrics(BaseModel):
+    """Admission control counters for the worker that served the request."""
+
+    max_concurrency: int
+    max_queue: int
+    active: int
+    queued: int
+    admitted_total: int
+    rejected_queue_full_total: int
+    rejected_timeout_total: int
+
+
+class SlowQueryEntry(BaseModel):
+    """One statement that exceeded the slow query threshold."""
+
+    recorded_at: datetime
+    route: str | None
+    duration_ms: float
+    statement: str
+    parameters: Any
+    executemany: bool
+    plan: list[str] | None
+
+
+class SlowQueryReport(BaseModel):
+    """Recent slow statements for the worker that served the request."""
+
+    threshold_ms: float
+    entries: list[SlowQueryEntry]
@@ -1,9 +1,55 @@
 """Shared schema utilities."""
 
-from pydantic import BaseModel, ConfigDict
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, create_model
+from pydantic_core import to_json
 
 
 class APIModel(BaseModel):
     """Base Pydantic model with safe defaults."""
 
     model_config = ConfigDict(extra="forbid", from_attributes=True)
+
+
+def trusted_fields(
+    model: type[BaseModel], source: Any, **values: Any
+) -> dict[str, Any]:
+    """Lay out a persisted row as ``model``'s fields without validating it.
+
+    For rows this service validated on the way in. Fields come out in model
+    order, from ``values`` first and then attributes already loaded on
+    ``source`` (nothing is lazy-loaded); other optional fields take their
+    defaults. Serialize the result with :func:`dump_trusted`.
+    """
+    loaded = vars(source)
+    fields: dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        if name in values:
+            fields[name] = values[name]
+        elif name in loaded:
+            fields[name] = loaded[name]
+        elif not field.is_required():
+            fields[name] = field.get_default(call_default_factory=True)
+    return fields
+
+
+def dump_trusted(content: Any) -> bytes:
+    """Serialize :func:`trusted_fields` output (or nested lists of it) to JSON."""
+    return to_json(content)
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: type[APIModel], fields: frozenset[str]) -> type[APIModel]:
+    """Return a variant of ``model`` that only declares ``fields``.
+
+    Used for sparse fieldsets: validating from ORM attributes only touches the
+    selected columns, so deferred columns are never lazy-loaded.
+    """
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name in fields
+    }
+    return create_model(f"{model.__name__}Sparse", __base__=APIModel, **definitions)
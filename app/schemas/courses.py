@@ -7,6 +7,8 @@ from uuid import UUID, uuid4
 from pydantic import Field, HttpUrl
 
 from app.schemas.common import APIModel
+from app.schemas.enrollments import EnrollmentSummary
+from app.schemas.labs import LabExercise
 
 
 class CourseStatus(str, Enum):
@@ -17,6 +19,15 @@ class CourseStatus(str, Enum):
     archived = "archived"
 
 
+class CoursePurgeState(str, Enum):
+    """Progress states of a deleted course's background purge."""
+
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
 class CourseBase(APIModel):
     """Shared fields across course operations."""
 
@@ -63,6 +74,7 @@ class Course(CourseBase):
     status: CourseStatus = CourseStatus.draft
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    version: int = 1
 
 
 class CoursePublic(Course):
@@ -70,3 +82,82 @@ class CoursePublic(Course):
 
     enrollment_count: int = 0
     lab_count: int = 0
+
+
+class CourseDetail(CoursePublic):
+    """Course response with optionally embedded related records."""
+
+    labs: list[LabExercise] | None = None
+    enrollments: list[EnrollmentSummary] | None = None
+
+
+class CourseSummary(APIModel):
+    """Course fields shown alongside a learner's enrollment."""
+
+    id: UUID
+    title: str
+    instructor: str
+    difficulty: str
+    category: str | None = None
+    duration_minutes: int
+    status: CourseStatus
+
+
+class SimilarCourse(APIModel):
+    """A course ranked by similarity to another; scores run from 0 to 1."""
+
+    score: float
+    course: CourseSummary
+
+
+class FacetCount(APIModel):
+    """Number of matching courses sharing one facet value."""
+
+    value: str
+    count: int
+
+
+class CourseFacets(APIModel):
+    """Catalog facet counts, each sorted by descending count."""
+
+    tag: list[FacetCount] = Field(default_factory=list)
+    category: list[FacetCount] = Field(default_factory=list)
+    difficulty: list[FacetCount] = Field(default_factory=list)
+    status: list[FacetCount] = Field(default_factory=list)
+    resource_type: list[FacetCount] = Field(default_factory=list)
+
+
+MAX_BATCH_IDS = 500
+
+
+class CourseBatchGetRequest(APIModel):
+    """Payload for resolving many courses by id in one request."""
+
+    ids: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class CourseBatchItem(APIModel):
+    """Result for one requested id, in request order."""
+
+    id: str
+    found: bool
+    course: CoursePublic | None = None
+    error: str | None = None
+
+
+class CourseBatchResponse(APIModel):
+    """Batch lookup results; missing ids are reported per item."""
+
+    items: list[CourseBatchItem]
+
+
+class CoursePurgeStatus(APIModel):
+    """Progress of purging a deleted course's enrollments and labs."""
+
+    course_id: str
+    status: CoursePurgeState
+    enrollments_deleted: int
+    labs_deleted: int
+    requested_at: datetime
+    completed_at: datetime | None = None
+    error: str | None = None
@@ -23,3 +23,13 @@ class Enrollment(EnrollmentCreate):
     course_id: UUID
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     progress_percent: int = Field(default=0, ge=0, le=100)
+
+
+class EnrollmentSummary(APIModel):
+    """Compact enrollment view embedded in expanded course responses."""
+
+    id: UUID
+    name: str
+    email: EmailStr
+    progress_percent: int = 0
+    created_at: datetime
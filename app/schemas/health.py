@@ -1,5 +1,7 @@
 """Health-related response schemas."""
 
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -8,3 +10,39 @@ class HealthResponse(BaseModel):
 
     status: str
     message: str
+
+
+class DatabaseCheck(BaseModel):
+    """Whether a connection could be opened and queried."""
+
+    ok: bool
+    latency_ms: float | None
+    error: str | None
+
+
+class PoolCheck(BaseModel):
+    """Connection pool usage; capacity is null for unbounded pools."""
+
+    ok: bool
+    checked_out: int | None
+    capacity: int | None
+    saturation: float | None
+
+
+class MigrationCheck(BaseModel):
+    """Applied Alembic revision(s) compared with the shipped head."""
+
+    ok: bool
+    current: list[str]
+    head: list[str]
+
+
+class ReadinessResponse(BaseModel):
+    """Response model for the readiness endpoint."""
+
+    status: str
+    cached: bool
+    checked_at: datetime
+    database: DatabaseCheck
+    pool: PoolCheck
+    migrations: MigrationCheck
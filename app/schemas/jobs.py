@@ -0,0 +1,32 @@
+"""Schemas for background jobs."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from app.schemas.common import APIModel
+
+
+class JobState(str, Enum):
+    """Lifecycle states for background jobs."""
+
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobStatus(APIModel):
+    """Status, progress and outcome of a background job."""
+
+    id: str
+    kind: str
+    status: JobState
+    attempts: int
+    max_attempts: int
+    progress: dict[str, Any]
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    run_at: datetime
+    created_at: datetime
+    finished_at: datetime | None = None
@@ -0,0 +1,18 @@
+"""Schemas for learner-centric views across courses."""
+
+from app.schemas.common import APIModel
+from app.schemas.courses import CourseSummary
+from app.schemas.enrollments import Enrollment
+
+
+class LearnerEnrollment(Enrollment):
+    """An enrollment together with a summary of its course."""
+
+    course: CourseSummary
+
+
+class LearnerEnrollmentPage(APIModel):
+    """One page of a learner's enrollments, oldest first."""
+
+    items: list[LearnerEnrollment]
+    next_cursor: str | None = None
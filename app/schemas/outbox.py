@@ -0,0 +1,27 @@
+"""Schemas for outbox change events."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from app.schemas.common import APIModel
+
+
+class OutboxEventType(str, Enum):
+    """Change events published through the outbox."""
+
+    course_created = "course.created"
+    course_updated = "course.updated"
+    course_deleted = "course.deleted"
+    enrollment_created = "enrollment.created"
+    lab_attached = "lab.attached"
+
+
+class OutboxMessage(APIModel):
+    """Event as delivered to sinks; ``id`` is unique and increasing."""
+
+    id: int
+    event_type: OutboxEventType
+    aggregate_id: str
+    payload: dict[str, Any]
+    created_at: datetime
@@ -0,0 +1,324 @@
+"""Production server entry point running pre-forked uvicorn workers.
+
+The application is imported once in the master process and workers are forked
+from it, so code and schema objects are shared copy-on-write. The master binds
+the listening socket, supervises workers and forwards shutdown signals so each
+worker drains in-flight requests and disposes its database pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+import uvicorn
+from sqlalchemy import make_url
+
+from app.core.config import settings
+from app.outbox.hub import listens
+
+logger = logging.getLogger(__name__)
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def cgroup_cpu_limit(path: Path = CGROUP_CPU_MAX) -> int | None:
+    """Return the container CPU quota in whole CPUs (cgroup v2), if any."""
+    try:
+        quota, period = path.read_text().split()[:2]
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    return max(1, math.ceil(int(quota) / int(period)))
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and container quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - non-Linux platforms
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def default_workers() -> int:
+    """Worker count from ``WEB_CONCURRENCY`` or one per available CPU."""
+    configured = os.getenv("WEB_CONCURRENCY")
+    return int(configured) if configured else available_cpus()
+
+
+def pool_size_per_worker(budget: int, workers: int, reserved: int = 0) -> int:
+    """Split a global connection budget evenly across worker pools.
+
+    ``reserved`` is the connections each worker opens outside its pool (the
+    change hub's LISTEN connection). Raises ``ValueError`` when the budget
+    cannot give every worker at least one pooled connection.
+    """
+    pool_size, unused = divmod(budget - reserved * workers, workers)
+    if pool_size < 1:
+        raise ValueError(
+            f"connection budget {budget} is too small for {workers} worker(s), "
+            f"which need at least {(1 + reserved) * workers}"
+        )
+    if unused:
+        logger.warning(
+            "%d of the %d budgeted connection(s) stay unused by %d worker(s)",
+            unused,
+            budget,
+            workers,
+        )
+    return pool_size
+
+
+def reserved_connections() -> int:
+    """Connections each worker holds outside its pool."""
+    return 1 if listens(make_url(settings.database_url)) else 0
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def event_loop() -> str:
+    """Prefer uvloop when installed."""
+    return "uvloop" if _installed("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    """Prefer the httptools parser when installed."""
+    return "httptools" if _installed("httptools") else "h11"
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerServer(uvicorn.Server):
+    """Uvicorn server that completes startup before honouring shutdown signals.
+
+    uvicorn skips lifespan shutdown when a signal lands during startup, which
+    would leave the worker's pool undisposed; such signals are deferred.
+    """
+
+    exit_requested = False
+
+    def handle_exit(self, sig: int, frame: object) -> None:
+        if self.started:
+            super().handle_exit(sig, frame)
+        else:
+            self.exit_requested = True
+
+    async def main_loop(self) -> None:
+        if self.exit_requested:
+            self.should_exit = True
+        await super().main_loop()
+
+
+def _run_worker(app: object, sock: socket.socket, graceful_timeout: int) -> None:
+    """Serve ``app`` on the inherited socket until told to stop."""
+    config = uvicorn.Config(
+        app,
+        loop=event_loop(),
+        http=http_protocol(),
+        lifespan="on",
+        timeout_graceful_shutdown=graceful_timeout,
+        proxy_headers=True,
+        server_header=False,
+    )
+    server = WorkerServer(config)
+    signal.signal(signal.SIGINT, server.handle_exit)
+    signal.signal(signal.SIGTERM, server.handle_exit)
+    server.run(sockets=[sock])
+
+
+class Supervisor:
+    """Fork, supervise and gracefully stop a fixed set of workers.
+
+    A worker that exits within ``quick_exit`` seconds of being started counts
+    as a quick failure. Each one doubles the delay before the next restart
+    (from ``restart_backoff`` up to ``restart_backoff_max``). Once there are
+    ``max_quick_failures`` of them in a row, e.g. an import error or a failed
+    bind, the supervisor stops every worker and exits non-zero instead of
+    forking forever.
+    """
+
+    def __init__(
+        self,
+        app: object,
+        sock: socket.socket,
+        workers: int,
+        graceful_timeout: int,
+        *,
+        restart_backoff: float = 0.5,
+        restart_backoff_max: float = 30.0,
+        quick_exit: float = 10.0,
+        max_quick_failures: int = 5,
+    ) -> None:
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.restart_backoff = restart_backoff
+        self.restart_backoff_max = restart_backoff_max
+        self.quick_exit = quick_exit
+        self.max_quick_failures = max_quick_failures
+        self.children: set[int] = set()
+        self.started_at: dict[int, float] = {}
+        self.restarts: list[float] = []
+        self.quick_failures = 0
+        self.failed = False
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(self.app, self.sock, self.graceful_timeout)
+            except BaseException:
+                logger.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children.add(pid)
+        self.started_at[pid] = time.monotonic()
+
+    def _schedule_restart(self, pid: int, status: int) -> None:
+        """Queue a replacement for an exited worker, backing off on crash loops."""
+        lifetime = time.monotonic() - self.started_at.pop(pid, 0.0)
+        if lifetime < self.quick_exit:
+            self.quick_failures += 1
+        else:
+            self.quick_failures = 0
+        if self.quick_failures >= self.max_quick_failures:
+            logger.error(
+                "Worker %s exited (%s); %d quick failures in a row, giving up",
+                pid,
+                status,
+                self.quick_failures,
+            )
+            self.failed = True
+            self.stop(signal.SIGTERM, None)
+            return
+        delay = 0.0
+        if self.quick_failures:
+            delay = min(
+                self.restart_backoff * 2 ** (self.quick_failures - 1),
+                self.restart_backoff_max,
+            )
+        logger.warning("Worker %s exited (%s); restarting in %.1fs", pid, status, delay)
+        self.restarts.append(time.monotonic() + delay)
+
+    def stop(self, signum: int, _frame: object) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.discard(pid)
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        # Freeze the preloaded heap so the collector does not dirty shared pages.
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn()
+        deadline: float | None = None
+        while self.children or (self.restarts and not self.stopping):
+            now = time.monotonic()
+            for due in [due for due in self.restarts if due <= now]:
+                self.restarts.remove(due)
+                if not self.stopping:
+                    self.spawn()
+            if self.stopping and deadline is None:
+                deadline = time.monotonic() + self.graceful_timeout + 5
+            if deadline is not None and time.monotonic() > deadline:
+                for pid in self.children:
+                    with contextlib.suppress(ProcessLookupError):
+                        os.kill(pid, signal.SIGKILL)
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                if not self.restarts:
+                    break
+                pid = 0
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+            self.children.discard(pid)
+            if not self.stopping:
+                self._schedule_restart(pid, status)
+        self.sock.close()
+        return 1 if self.failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments, preload the app and run the workers."""
+    parser = argparse.ArgumentParser(description="Run the LabForge API server.")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument(
+        "--connection-budget",
+        type=int,
+        default=settings.db_connection_budget,
+        help=(
+            "Total DB connections shared by all workers (DB_CONNECTION_BUDGET), "
+            "including each worker's change hub LISTEN connection on Postgres."
+        ),
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        help="Seconds a worker may spend draining requests on shutdown.",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    workers = max(1, args.workers)
+    if args.connection_budget:
+        # Hard cap per worker so the fleet never exceeds the budget.
+        try:
+            settings.db_pool_size = pool_size_per_worker(
+                args.connection_budget, workers, reserved_connections()
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+        settings.db_max_overflow = 0
+
+    from app.main import app
+
+    sock = _bind(args.host, args.port)
+    logger.info(
+        "Serving on %s:%s with %d worker(s), loop=%s http=%s pool_size=%d",
+        args.host,
+        args.port,
+        workers,
+        event_loop(),
+        http_protocol(),
+        settings.db_pool_size,
+    )
+    return Supervisor(app, sock, workers, args.graceful_timeout).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
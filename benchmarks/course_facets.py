@@ -0,0 +1,136 @@
+"""Time catalog facet counts: in-memory facet index vs counting the catalog.
+
+Loads a synthetic catalog (Zipf-distributed tags, a few categories, labs on a
+third of the courses) into an in-memory SQLite database, loads the
+:class:`~app.db.facets.FacetIndex` from it and reports per-request latency
+unfiltered, with a broad filter and with a narrow one. For comparison it
+times what the catalog sidebar did before: fetching every course and lab row
+and counting in Python.
+
+Usage::
+
+    poetry run python -m benchmarks.course_facets [--courses 100000] [--queries 200]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.facets import FacetIndex
+from app.db.models import Base, Course, LabExercise
+from app.schemas.labs import LabResourceType
+
+VOCABULARY = [f"tag{i}" for i in range(2000)]
+CATEGORIES = [f"category{i}" for i in range(40)]
+TAG_WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def _catalog(rng: random.Random, courses: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid4()),
+            "title": f"Course {i}",
+            "instructor": "Bench",
+            "primary_video_url": "https://example.com/video",
+            "supplemental_urls": [],
+            "duration_minutes": 60,
+            "difficulty": rng.choice(["beginner", "intermediate", "advanced"]),
+            "tags": sorted(set(rng.choices(VOCABULARY, TAG_WEIGHTS, k=5))),
+            "prerequisites": [],
+            "category": rng.choice(CATEGORIES),
+            "status": rng.choice(["draft", "published", "published", "archived"]),
+        }
+        for i in range(courses)
+    ]
+
+
+async def _download_and_count(session: AsyncSession) -> dict[str, Counter]:
+    """Count facets in Python from every course and lab row."""
+    facets = {name: Counter() for name in ("tag", "category", "difficulty", "status")}
+    courses = await session.scalars(select(Course).where(Course.deleted_at.is_(None)))
+    for course in courses:
+        facets["tag"].update(set(course.tags))
+        facets["category"][course.category] += 1
+        facets["difficulty"][course.difficulty] += 1
+        facets["status"][course.status] += 1
+    lab_types = await session.execute(
+        select(LabExercise.course_id, LabExercise.resource_type)
+    )
+    facets["resource_type"] = Counter(
+        resource_type for _, resource_type in set(lab_types.all())
+    )
+    return facets
+
+
+def _latency(samples: list[float]) -> str:
+    return (
+        f"p50={statistics.median(samples) * 1e3:.2f}ms max={max(samples) * 1e3:.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--download-queries", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        courses = _catalog(rng, args.courses)
+        await conn.execute(insert(Course), courses)
+        labs = [
+            {
+                "id": str(uuid4()),
+                "course_id": course["id"],
+                "title": "Lab",
+                "resource_type": rng.choice(list(LabResourceType)),
+                "resource_uri": "https://example.com/lab",
+            }
+            for course in rng.sample(courses, args.courses // 3)
+        ]
+        await conn.execute(insert(LabExercise), labs)
+    print(f"{args.courses} courses, {len(labs)} labs")
+
+    session_factory = async_sessionmaker(engine)
+    index = FacetIndex()
+    async with session_factory() as session:
+        started = time.perf_counter()
+        await index.refresh(session)
+        print(f"index load: {time.perf_counter() - started:.2f}s")
+
+    cases = {
+        "unfiltered": {},
+        "status=published": {"status": "published"},
+        "tag+resource_type": {"tag": VOCABULARY[0], "resource_type": "yaml"},
+    }
+    for name, filters in cases.items():
+        samples = []
+        for _ in range(args.queries):
+            started = time.perf_counter()
+            index.counts(filters)
+            samples.append(time.perf_counter() - started)
+        print(f"index, {name}: {_latency(samples)}")
+
+    samples = []
+    for _ in range(args.download_queries):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            await _download_and_count(session)
+            samples.append(time.perf_counter() - started)
+    print(f"download and count: {_latency(samples)}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Compare per-request Python CPU time of inline vs prebuilt route statements.
+
+Runs against an in-memory SQLite database with a synchronous session so the
+measurement isolates statement construction, cache-key generation and result
+handling from network and event loop overhead.
+
+Usage::
+
+    poetry run python -m benchmarks.query_cpu [--iterations 5000]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db import queries
+from app.db.models import Base, Course, Enrollment, LabExercise
+
+
+def _inline_counts(session: Session, course_id: str) -> None:
+    """The two count selects previously rebuilt by ``_counts`` on every call."""
+    session.scalar(
+        select(func.count(Enrollment.id)).where(Enrollment.course_id == course_id)
+    )
+    session.scalar(
+        select(func.count(LabExercise.id)).where(LabExercise.course_id == course_id)
+    )
+
+
+def _prebuilt_counts(session: Session, course_id: str) -> None:
+    session.execute(queries.COURSE_COUNTS, {"course_id": course_id}).one()
+
+
+def _inline_list(session: Session, course_id: str) -> None:
+    """The join/group_by previously rebuilt by ``list_courses``."""
+    session.execute(
+        select(
+            Course,
+            func.count(Enrollment.id).label("enrollment_count"),
+            func.count(LabExercise.id).label("lab_count"),
+        )
+        .outerjoin(Enrollment, Enrollment.course_id == Course.id)
+        .outerjoin(LabExercise, LabExercise.course_id == Course.id)
+        .group_by(Course.id)
+    ).all()
+
+
+def _prebuilt_list(session: Session, course_id: str) -> None:
+    session.execute(queries.LIST_COURSES).all()
+
+
+def _inline_labs(session: Session, course_id: str) -> None:
+    session.scalars(select(LabExercise).where(LabExercise.course_id == course_id))
+
+
+def _prebuilt_labs(session: Session, course_id: str) -> None:
+    session.scalars(queries.LABS_FOR_COURSE, {"course_id": course_id})
+
+
+CASES: dict[str, tuple[Callable[[Session, str], None], ...]] = {
+    "course counts": (_inline_counts, _prebuilt_counts),
+    "list courses": (_inline_list, _prebuilt_list),
+    "labs for course": (_inline_labs, _prebuilt_labs),
+}
+
+
+def _cpu_per_call(
+    fn: Callable[[Session, str], None], session: Session, iterations: int
+) -> float:
+    fn(session, "warmup")
+    started = time.process_time()
+    for i in range(iterations):
+        fn(session, str(i))
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        print(f"{'statement':<18}{'inline us':>12}{'prebuilt us':>14}{'saved':>8}")
+        for name, (inline, prebuilt) in CASES.items():
+            before = _cpu_per_call(inline, session, args.iterations)
+            after = _cpu_per_call(prebuilt, session, args.iterations)
+            saved = (before - after) / before * 100
+            print(f"{name:<18}{before:>12.1f}{after:>14.1f}{saved:>7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Time similar-course lookups: posting-list index vs scoring every pair.
+
+Loads a synthetic catalog (Zipf-distributed tags, a few categories and
+prerequisites, shared learners) into an in-memory SQLite database, builds the
+:class:`~app.db.similarity.SimilarityIndex` from it and reports load time and
+per-query latency. For comparison it also times the pairwise approach: scoring
+the query course against every other course in a Python loop.
+
+Usage::
+
+    poetry run python -m benchmarks.similar_courses \\
+        [--courses 100000] [--learners 20000] [--queries 500]
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import Base, Course, Enrollment
+from app.db.similarity import FEATURE_WEIGHTS, SimilarityIndex
+
+VOCABULARY = [f"tag{i}" for i in range(2000)]
+CATEGORIES = [f"category{i}" for i in range(40)]
+PREREQUISITES = [f"prerequisite{i}" for i in range(300)]
+# Zipf-like popularity so a few tags appear on a large share of courses.
+TAG_WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def _catalog(rng: random.Random, courses: int) -> list[dict]:
+    return [
+        {
+            "id": str(uuid4()),
+            "title": f"Course {i}",
+            "instructor": "Bench",
+            "primary_video_url": "https://example.com/video",
+            "supplemental_urls": [],
+            "duration_minutes": 60,
+            "difficulty": "intermediate",
+            "tags": sorted(set(rng.choices(VOCABULARY, TAG_WEIGHTS, k=5))),
+            "prerequisites": rng.sample(PREREQUISITES, 2),
+            "category": rng.choice(CATEGORIES),
+            "status": "published",
+        }
+        for i in range(courses)
+    ]
+
+
+def _pairwise(
+    vectors: dict[str, set[tuple[str, str]]], course_id: str, limit: int
+) -> list[tuple[str, float]]:
+    """Score ``course_id`` against every course, one pair at a time."""
+    source = vectors[course_id]
+    source_norm = math.sqrt(sum(FEATURE_WEIGHTS[kind] ** 2 for kind, _ in source))
+    scores = []
+    for other, features in vectors.items():
+        if other == course_id:
+            continue
+        shared = source & features
+        if shared:
+            dot = sum(FEATURE_WEIGHTS[kind] ** 2 for kind, _ in shared)
+            norm = math.sqrt(sum(FEATURE_WEIGHTS[kind] ** 2 for kind, _ in features))
+            scores.append((other, dot / (source_norm * norm)))
+    scores.sort(key=lambda item: item[1], reverse=True)
+    return scores[:limit]
+
+
+def _latency(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    return f"p50={statistics.median(samples) * 1e3:.2f}ms p99={p99 * 1e3:.2f}ms"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=100_000)
+    parser.add_argument("--learners", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--pairwise-queries", type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        courses = _catalog(rng, args.courses)
+        await conn.execute(insert(Course), courses)
+        enrollments = [
+            {
+                "id": str(uuid4()),
+                "course_id": course_id,
+                "name": "Learner",
+                "email": f"learner{learner}@example.com",
+            }
+            for learner in range(args.learners)
+            for course_id in {course["id"] for course in rng.sample(courses, 3)}
+        ]
+        await conn.execute(insert(Enrollment), enrollments)
+    print(f"{args.courses} courses, {len(enrollments)} enrollments")
+
+    index = SimilarityIndex()
+    async with async_sessionmaker(engine)() as session:
+        started = time.perf_counter()
+        await index.refresh(session)
+        print(f"index load: {time.perf_counter() - started:.2f}s")
+    await engine.dispose()
+
+    course_ids = [course["id"] for course in courses]
+    indexed = []
+    for course_id in rng.sample(course_ids, args.queries):
+        started = time.perf_counter()
+        index.similar(course_id, 10)
+        indexed.append(time.perf_counter() - started)
+    print(f"indexed top-10:  {_latency(indexed)}")
+
+    vectors = dict(index._features)
+    pairwise = []
+    for course_id in rng.sample(course_ids, args.pairwise_queries):
+        started = time.perf_counter()
+        _pairwise(vectors, course_id, 10)
+        pairwise.append(time.perf_counter() - started)
+    print(f"pairwise top-10: {_latency(pairwise)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
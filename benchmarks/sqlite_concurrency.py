@@ -0,0 +1,141 @@
+"""Concurrent read/write throughput on SQLite: default vs tuned profile.
+
+Seeds a database file with synthetic courses, then runs reader and writer
+tasks side by side for a fixed time. Readers fetch a random course by id;
+writers insert a course and commit. ``default`` is a plain aiosqlite engine
+(rollback journal, ``synchronous=FULL``, one pool for everything); ``tuned``
+is the ``DB_SQLITE_TUNED`` profile of :mod:`app.db.sqlite_tuning` (WAL,
+``synchronous=NORMAL``, one writer connection plus a read pool). Operations
+that fail, e.g. with ``database is locked``, are counted as errors, and read
+latency percentiles show how much reads wait behind writes.
+
+Usage::
+
+    poetry run python -m benchmarks.sqlite_concurrency [--readers 8] [--writers 4]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.config import Settings
+from app.db import sqlite_tuning
+from app.db.models import Base, Course
+from app.db.session import engine_options
+
+
+def _course() -> dict:
+    return {
+        "id": str(uuid4()),
+        "title": "Bench course",
+        "instructor": "Bench",
+        "primary_video_url": "https://example.com/video",
+        "supplemental_urls": [],
+        "duration_minutes": 60,
+        "difficulty": "beginner",
+        "tags": ["bench"],
+        "prerequisites": [],
+        "category": "bench",
+        "status": "published",
+    }
+
+
+def _engines(profile: str, url: str, readers: int) -> tuple[AsyncEngine, AsyncEngine]:
+    """Writer and reader engines for a profile (the same engine by default)."""
+    if profile == "default":
+        engine = create_async_engine(url)
+        return engine, engine
+    config = Settings(
+        database_url=url,
+        db_sqlite_tuned=True,
+        db_sqlite_read_pool_size=max(readers, 1),
+    )
+    engines = []
+    for read_only in (False, True):
+        engine = create_async_engine(url, **engine_options(config, read_only=read_only))
+        sqlite_tuning.install(engine.sync_engine, config, read_only=read_only)
+        engines.append(engine)
+    return engines[0], engines[1]
+
+
+async def _run(profile: str, args: argparse.Namespace, path: Path) -> None:
+    url = f"sqlite+aiosqlite:///{path}"
+    writer, reader = _engines(profile, url, args.readers)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        seeded = [_course() for _ in range(args.courses)]
+        await conn.execute(insert(Course), seeded)
+    ids = [course["id"] for course in seeded]
+    write_sessions = async_sessionmaker(writer, expire_on_commit=False)
+    read_sessions = async_sessionmaker(reader, expire_on_commit=False)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    read_latencies: list[float] = []
+    deadline = time.perf_counter() + args.seconds
+
+    async def read_loop(rng: random.Random) -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                async with read_sessions() as session:
+                    await session.scalar(
+                        select(Course).where(Course.id == rng.choice(ids))
+                    )
+                counts["reads"] += 1
+                read_latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                counts["errors"] += 1
+
+    async def write_loop() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                async with write_sessions() as session:
+                    await session.execute(insert(Course), [_course()])
+                    await session.commit()
+                counts["writes"] += 1
+            except OperationalError:
+                counts["errors"] += 1
+
+    await asyncio.gather(
+        *(read_loop(random.Random(seed)) for seed in range(args.readers)),
+        *(write_loop() for _ in range(args.writers)),
+    )
+    await reader.dispose()
+    await writer.dispose()
+    line = (
+        f"{profile}: {counts['reads'] / args.seconds:.0f} reads/s, "
+        f"{counts['writes'] / args.seconds:.0f} writes/s, "
+        f"{counts['errors']} errors"
+    )
+    if len(read_latencies) > 1:
+        cuts = statistics.quantiles(read_latencies, n=100)
+        line += f", read p50={cuts[49] * 1e3:.2f}ms p99={cuts[98] * 1e3:.2f}ms"
+    print(line)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=10_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    print(
+        f"{args.courses} courses, {args.readers} readers, {args.writers} writers, "
+        f"{args.seconds:g}s per profile"
+    )
+    for profile in ("default", "tuned"):
+        with tempfile.TemporaryDirectory() as directory:
+            await _run(profile, args, Path(directory) / "labforge.db")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,385 @@
+"""Micro-benchmarks for every schema in ``app.schemas``.
+
+Inbound cases time ``model_validate`` on request-shaped payloads, where the
+``HttpUrl``, ``EmailStr`` and pattern checks have to run. Outbound cases build
+responses from persisted rows twice: through validation (``from_attributes``
+then JSON) and through the trusted path the routes use
+(:func:`~app.schemas.common.trusted_fields` then
+:func:`~app.schemas.common.dump_trusted`). Rows are transient ORM objects, so
+no database is needed.
+
+These are not collected by the default test run. Usage::
+
+    make bench-schemas                  # run and print the comparison table
+    make bench-schemas-save             # record a baseline in .benchmarks/
+    make bench-schemas-check            # fail if a case is >20% slower than it
+"""
+
+import timeit
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+from uuid import UUID
+
+import pytest
+from pydantic import BaseModel, TypeAdapter
+
+from app import schemas
+from app.db.models import Course, Enrollment, Job, LabExercise, OutboxEvent
+from app.schemas import (
+    AdmissionMetrics,
+    CourseBatchGetRequest,
+    CourseBatchItem,
+    CourseBatchResponse,
+    CourseCreate,
+    CourseDetail,
+    CourseFacets,
+    CoursePublic,
+    CoursePurgeStatus,
+    CourseStatus,
+    CourseSummary,
+    CourseUpdate,
+    DatabaseCheck,
+    EnrollmentCreate,
+    EnrollmentSummary,
+    FacetCount,
+    HealthResponse,
+    JobStatus,
+    LabExerciseCreate,
+    LabResourceType,
+    LearnerEnrollment,
+    LearnerEnrollmentPage,
+    MigrationCheck,
+    OutboxMessage,
+    PoolCheck,
+    ReadinessResponse,
+    SimilarCourse,
+    SlowQueryEntry,
+    SlowQueryReport,
+)
+from app.schemas import Course as CourseSchema
+from app.schemas import Enrollment as EnrollmentSchema
+from app.schemas import LabExercise as LabExerciseSchema
+from app.schemas.common import dump_trusted, trusted_fields
+
+# A list page's worth of rows per outbound case.
+ROWS = 50
+NOW = datetime(2026, 10, 19, tzinfo=timezone.utc)
+COURSE_ID = "0b5bfb38-8f3c-4e0e-9a43-2f4f0e3c2d11"
+
+
+def _uuid(n: int) -> str:
+    return str(UUID(int=n))
+
+
+COURSE = {
+    "title": "DevOps With Brian: CI/CD Foundations",
+    "overview": "Hands-on course covering pipelines and Kubernetes delivery.",
+    "instructor": "Brian T",
+    "primary_video_url": "https://youtube.com/devopswithbrian",
+    "supplemental_urls": [
+        f"https://github.com/devops-with-brian/sample-repo-{i}" for i in range(5)
+    ],
+    "duration_minutes": 120,
+    "difficulty": "intermediate",
+    "tags": ["devops", "kubernetes"],
+    "prerequisites": ["Basic Git", "Docker fundamentals"],
+    "category": "DevOps",
+}
+ENROLLMENT = {"name": "Ada Learner", "email": "ada@example.com", "notes": "Cohort 3"}
+LAB = {
+    "title": "Deploy with Helm",
+    "summary": "Package the sample app as a chart.",
+    "resource_type": "kubernetes",
+    "resource_uri": "https://github.com/devops-with-brian/helm-lab",
+    "estimated_minutes": 45,
+}
+DATABASE = {"ok": True, "latency_ms": 1.2, "error": None}
+POOL = {"ok": True, "checked_out": 3, "capacity": 30, "saturation": 0.1}
+MIGRATIONS = {"ok": True, "current": ["20261019_0005"], "head": ["20261019_0005"]}
+SLOW_QUERY = {
+    "recorded_at": NOW,
+    "route": "list_courses",
+    "duration_ms": 812.5,
+    "statement": "SELECT courses.id FROM courses",
+    "parameters": [],
+    "executemany": False,
+    "plan": ["Seq Scan on courses"],
+}
+JOB = {
+    "id": "5d0c2c4e-6c1f-4b8a-9d7e-3f1a2b4c5d6e",
+    "kind": "course.purge",
+    "status": "running",
+    "attempts": 1,
+    "max_attempts": 5,
+    "progress": {"enrollments_deleted": 400},
+    "run_at": NOW,
+    "created_at": NOW,
+}
+OUTBOX = {
+    "id": 42,
+    "event_type": "course.created",
+    "aggregate_id": COURSE_ID,
+    "payload": {"course": {"id": COURSE_ID, "title": COURSE["title"]}},
+    "created_at": NOW,
+}
+PERSISTED_COURSE = {
+    **COURSE,
+    "id": COURSE_ID,
+    "status": "published",
+    "version": 1,
+    "created_at": NOW,
+    "updated_at": NOW,
+}
+COURSE_SUMMARY = {
+    key: PERSISTED_COURSE[key]
+    for key in (
+        "id",
+        "title",
+        "instructor",
+        "difficulty",
+        "category",
+        "duration_minutes",
+        "status",
+    )
+}
+PERSISTED_ENROLLMENT = {
+    **ENROLLMENT,
+    "id": "7e1c9a7a-8b93-4c4c-a3f5-61d4d0e0a001",
+    "course_id": COURSE_ID,
+    "progress_percent": 40,
+    "created_at": NOW,
+}
+
+# Request payloads, and stored or in-memory data for the remaining schemas.
+INBOUND: dict[type[BaseModel], dict[str, Any]] = {
+    CourseCreate: {**COURSE, "status": "published"},
+    CourseUpdate: {
+        "title": "Renamed",
+        "supplemental_urls": COURSE["supplemental_urls"],
+    },
+    CourseBatchGetRequest: {"ids": [str(i) for i in range(100)]},
+    EnrollmentCreate: ENROLLMENT,
+    LabExerciseCreate: LAB,
+    CourseSchema: PERSISTED_COURSE,
+    CoursePublic: {**PERSISTED_COURSE, "enrollment_count": 10, "lab_count": 2},
+    CourseDetail: {**PERSISTED_COURSE, "labs": [], "enrollments": []},
+    CourseBatchItem: {"id": COURSE_ID, "found": True, "course": PERSISTED_COURSE},
+    CourseBatchResponse: {"items": [{"id": "x", "found": False}]},
+    CoursePurgeStatus: {
+        "course_id": COURSE_ID,
+        "status": "completed",
+        "enrollments_deleted": 1000,
+        "labs_deleted": 3,
+        "requested_at": NOW,
+        "completed_at": NOW,
+    },
+    CourseSummary: COURSE_SUMMARY,
+    SimilarCourse: {"score": 0.8165, "course": COURSE_SUMMARY},
+    FacetCount: {"value": "kubernetes", "count": 42},
+    CourseFacets: {
+        "tag": [{"value": f"tag{i}", "count": 100 - i} for i in range(50)],
+        "category": [{"value": "DevOps", "count": 60}, {"value": "Cloud", "count": 40}],
+        "difficulty": [{"value": "intermediate", "count": 100}],
+        "status": [{"value": "published", "count": 100}],
+        "resource_type": [{"value": "kubernetes", "count": 30}],
+    },
+    EnrollmentSchema: PERSISTED_ENROLLMENT,
+    LearnerEnrollment: {**PERSISTED_ENROLLMENT, "course": COURSE_SUMMARY},
+    LearnerEnrollmentPage: {
+        "items": [{**PERSISTED_ENROLLMENT, "course": COURSE_SUMMARY}] * 10,
+        "next_cursor": "WyIyMDI2LTEwLTE5VDAwOjAwOjAwKzAwOjAwIiwgIngiXQ",
+    },
+    EnrollmentSummary: {
+        key: PERSISTED_ENROLLMENT[key]
+        for key in ("id", "name", "email", "progress_percent", "created_at")
+    },
+    LabExerciseSchema: {**LAB, "id": _uuid(1), "course_id": COURSE_ID},
+    JobStatus: JOB,
+    OutboxMessage: OUTBOX,
+    AdmissionMetrics: {
+        "max_concurrency": 64,
+        "max_queue": 128,
+        "active": 10,
+        "queued": 0,
+        "admitted_total": 1000,
+        "rejected_queue_full_total": 0,
+        "rejected_timeout_total": 0,
+    },
+    SlowQueryEntry: SLOW_QUERY,
+    SlowQueryReport: {"threshold_ms": 500.0, "entries": [SLOW_QUERY] * 10},
+    HealthResponse: {"status": "healthy", "message": "LabForge API is running"},
+    DatabaseCheck: DATABASE,
+    PoolCheck: POOL,
+    MigrationCheck: MIGRATIONS,
+    ReadinessResponse: {
+        "status": "ready",
+        "cached": False,
+        "checked_at": NOW,
+        "database": DATABASE,
+        "pool": POOL,
+        "migrations": MIGRATIONS,
+    },
+}
+
+
+def _courses() -> list[Course]:
+    courses = []
+    for i in range(ROWS):
+        course = Course(**{**PERSISTED_COURSE, "id": _uuid(1000 + i)})
+        course.status = CourseStatus.published
+        course.labs = [
+            LabExercise(
+                **{**LAB, "id": _uuid(2000 + 10 * i + j), "course_id": course.id},
+            )
+            for j in range(2)
+        ]
+        for lab in course.labs:
+            lab.resource_type = LabResourceType.kubernetes
+        course.enrollments = [
+            Enrollment(**{**PERSISTED_ENROLLMENT, "id": _uuid(3000 + 10 * i + j)})
+            for j in range(3)
+        ]
+        courses.append(course)
+    return courses
+
+
+def _enrollments() -> list[Enrollment]:
+    return [
+        Enrollment(**{**PERSISTED_ENROLLMENT, "id": _uuid(4000 + i)})
+        for i in range(ROWS)
+    ]
+
+
+@lru_cache
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[Any]:
+    return TypeAdapter(list[model])
+
+
+def _validated(model: type[BaseModel], rows: list[Any]) -> bytes:
+    """What the response model path did: validate every row, then serialize."""
+    adapter = _list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def _trusted(model: type[BaseModel], rows: list[Any]) -> bytes:
+    return dump_trusted([trusted_fields(model, row) for row in rows])
+
+
+def _trusted_detail(rows: list[Course]) -> bytes:
+    return dump_trusted(
+        [
+            trusted_fields(
+                CourseDetail,
+                course,
+                labs=[trusted_fields(LabExerciseSchema, lab) for lab in course.labs],
+                enrollments=[
+                    trusted_fields(EnrollmentSummary, enrollment)
+                    for enrollment in course.enrollments
+                ],
+            )
+            for course in rows
+        ]
+    )
+
+
+def _validated_batch(rows: list[Course]) -> bytes:
+    items = [{"id": course.id, "found": True, "course": course} for course in rows]
+    response = CourseBatchResponse.model_validate({"items": items})
+    return response.model_dump_json().encode()
+
+
+def _trusted_batch(rows: list[Course]) -> bytes:
+    items = [
+        {
+            "id": course.id,
+            "found": True,
+            "course": trusted_fields(CoursePublic, course),
+            "error": None,
+        }
+        for course in rows
+    ]
+    return dump_trusted({"items": items})
+
+
+# name -> (rows, validated path, trusted path)
+OUTBOUND: dict[str, tuple[Any, Any, Any]] = {
+    "CoursePublic": (
+        _courses,
+        lambda rows: _validated(CoursePublic, rows),
+        lambda rows: _trusted(CoursePublic, rows),
+    ),
+    "CourseDetail": (
+        _courses,
+        lambda rows: _validated(CourseDetail, rows),
+        _trusted_detail,
+    ),
+    "CourseBatchResponse": (_courses, _validated_batch, _trusted_batch),
+    "Enrollment": (
+        _enrollments,
+        lambda rows: _validated(EnrollmentSchema, rows),
+        lambda rows: _trusted(EnrollmentSchema, rows),
+    ),
+    "EnrollmentSummary": (
+        _enrollments,
+        lambda rows: _validated(EnrollmentSummary, rows),
+        lambda rows: _trusted(EnrollmentSummary, rows),
+    ),
+    "LabExercise": (
+        lambda: [lab for course in _courses() for lab in course.labs],
+        lambda rows: _validated(LabExerciseSchema, rows),
+        lambda rows: _trusted(LabExerciseSchema, rows),
+    ),
+    "JobStatus": (
+        lambda: [Job(**{**JOB, "id": f"job-{i}"}) for i in range(ROWS)],
+        lambda rows: _validated(JobStatus, rows),
+        lambda rows: _trusted(JobStatus, rows),
+    ),
+    "OutboxMessage": (
+        lambda: [OutboxEvent(**{**OUTBOX, "id": i}) for i in range(ROWS)],
+        lambda rows: _validated(OutboxMessage, rows),
+        lambda rows: _trusted(OutboxMessage, rows),
+    ),
+}
+
+# Minimum trusted-path speedup on full course rows; a regression that puts
+# validation back on the response path fails this before any baseline exists.
+MIN_SPEEDUP = 2.0
+
+
+def test_every_schema_has_a_case():
+    """Test that new schemas are added to the benchmark."""
+    exported = {getattr(schemas, name) for name in schemas.__all__}
+    models = {
+        obj for obj in exported if isinstance(obj, type) and issubclass(obj, BaseModel)
+    }
+    assert models <= set(INBOUND)
+
+
+@pytest.mark.parametrize("model", list(INBOUND), ids=lambda model: model.__name__)
+def test_inbound_validation(benchmark, model):
+    """Benchmark validating one payload."""
+    benchmark.group = "inbound"
+    benchmark(model.model_validate, INBOUND[model])
+
+
+@pytest.mark.parametrize("path", ["validated", "trusted"])
+@pytest.mark.parametrize("case", list(OUTBOUND))
+def test_outbound_construction(benchmark, case, path):
+    """Benchmark building and serializing a page of responses from rows."""
+    rows, validated, trusted = OUTBOUND[case]
+    rows = rows()
+    benchmark.group = f"outbound {case}"
+    output = benchmark(validated if path == "validated" else trusted, rows)
+    # Both paths must produce the same document.
+    assert output == validated(rows)
+
+
+@pytest.mark.parametrize("case", ["CoursePublic", "CourseDetail"])
+def test_trusted_path_is_faster(case):
+    """Test that skipping re-validation keeps its speedup."""
+    rows, validated, trusted = OUTBOUND[case]
+    rows = rows()
+    before = min(timeit.repeat(lambda: validated(rows), number=20, repeat=5))
+    after = min(timeit.repeat(lambda: trusted(rows), number=20, repeat=5))
+    assert before / after >= MIN_SPEEDUP
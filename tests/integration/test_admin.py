@@ -0,0 +1,19 @@
+"""Integration tests for operational admin endpoints."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+def test_admission_metrics_report_counters():
+    """Test that admission metrics are exposed and count admitted requests."""
+    before = client.get("/admin/admission").json()["admitted_total"]
+    client.get("/courses")
+
+    data = client.get("/admin/admission").json()
+    assert data["admitted_total"] == before + 1
+    assert data["active"] == 0
+    assert data["queued"] == 0
+    assert data["max_concurrency"] >= 1
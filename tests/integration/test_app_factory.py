@@ -0,0 +1,50 @@
+"""Integration tests for the application factory and startup lifespan."""
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.session import get_session
+from app.main import create_app
+from tests.conftest import build_course_payload, override_get_session
+
+
+def test_create_app_returns_independent_instances():
+    """Test that each factory call builds a fresh application."""
+    first, second = create_app(), create_app()
+    assert first is not second
+    assert {route.path for route in first.routes} == {
+        route.path for route in second.routes
+    }
+
+
+def test_lifespan_warms_pool_and_records_startup_timings(monkeypatch):
+    """Test that startup opens the engine and records cold-start timings."""
+    # Idle background workers poll through the same pool; keep it to the warmup.
+    monkeypatch.setattr(settings, "job_workers", 0)
+    monkeypatch.setattr(settings, "outbox_dispatcher", False)
+    app = create_app()
+
+    with TestClient(app) as client:
+        assert db_session._engine is not None
+        assert db_session._engine.pool.checkedin() >= 1
+        timings = app.state.startup_timings
+        assert timings["import_seconds"] > 0
+        assert timings["factory_seconds"] > 0
+        assert timings["startup_seconds"] > 0
+        assert app.openapi_schema is not None
+        assert client.get("/health").status_code == 200
+
+    # Shutdown disposes the engine; the next request builds a new one.
+    assert db_session._engine is None
+
+
+def test_requests_work_after_lifespan_startup():
+    """Test that warmed startup serves normal course requests."""
+    app = create_app()
+    app.dependency_overrides[get_session] = override_get_session
+
+    with TestClient(app) as client:
+        created = client.post("/courses", json=build_course_payload())
+        assert created.status_code == 201
+        assert client.get(f"/courses/{created.json()['id']}").status_code == 200
@@ -0,0 +1,102 @@
+"""Integration tests for resolving many courses in one request."""
+
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from tests.conftest import build_course_payload
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+def _create_courses(count):
+    return [
+        client.post("/courses", json=build_course_payload(title=f"Course {i}")).json()[
+            "id"
+        ]
+        for i in range(count)
+    ]
+
+
+def test_batch_get_preserves_input_order():
+    """Test that items come back in the order the ids were requested."""
+    first, second, third = _create_courses(3)
+
+    response = client.get(f"/courses:batchGet?ids={third},{first},{second}")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [third, first, second]
+    assert all(item["found"] for item in items)
+    assert items[0]["course"]["title"] == "Course 2"
+
+
+def test_batch_get_reports_missing_ids_per_item():
+    """Test that missing ids do not fail the whole request."""
+    (course_id,) = _create_courses(1)
+    missing_id = str(uuid4())
+
+    response = client.get(f"/courses:batchGet?ids={missing_id},{course_id}")
+    assert response.status_code == 200
+    missing, found = response.json()["items"]
+    assert missing == {
+        "id": missing_id,
+        "found": False,
+        "course": None,
+        "error": "Course not found",
+    }
+    assert found["found"] is True
+    assert found["course"]["id"] == course_id
+
+
+def test_batch_get_includes_counts():
+    """Test that aggregates are computed for each course."""
+    busy, quiet = _create_courses(2)
+    for i in range(2):
+        client.post(
+            f"/courses/{busy}/enrollments",
+            json={"name": f"User {i}", "email": f"user{i}@example.com"},
+        )
+    client.post(
+        f"/courses/{busy}/labs",
+        json={
+            "title": "Lab",
+            "resource_type": "link",
+            "resource_uri": "https://example.com/lab",
+        },
+    )
+
+    items = client.get(f"/courses:batchGet?ids={busy},{quiet}").json()["items"]
+    assert items[0]["course"]["enrollment_count"] == 2
+    assert items[0]["course"]["lab_count"] == 1
+    assert items[1]["course"]["enrollment_count"] == 0
+    assert items[1]["course"]["lab_count"] == 0
+
+
+def test_batch_get_uses_constant_number_of_queries(statements):
+    """Test that query count does not grow with the number of ids."""
+    ids = _create_courses(10)
+
+    statements.clear()
+    response = client.get(f"/courses:batchGet?ids={','.join(ids)}")
+    assert response.status_code == 200
+    assert len(statements) == 3
+
+
+def test_batch_get_post_variant_handles_duplicates():
+    """Test the POST variant, repeating ids in their original positions."""
+    first, second = _create_courses(2)
+
+    response = client.post("/courses:batchGet", json={"ids": [first, second, first]})
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [
+        first,
+        second,
+        first,
+    ]
+
+
+def test_batch_get_requires_ids():
+    """Test that an empty id list is rejected."""
+    assert client.get("/courses:batchGet?ids=").status_code == 422
+    assert client.post("/courses:batchGet", json={"ids": []}).status_code == 422
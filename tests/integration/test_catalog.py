@@ -0,0 +1,210 @@
+"""Integration tests for the pre-rendered published catalog snapshot."""
+
+import gzip
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db.catalog import (
+    CatalogSnapshotter,
+    build_catalog_snapshot,
+    content_etag,
+    snapshot_path,
+    snapshot_state,
+)
+from app.main import app
+from tests.conftest import build_course_payload
+from tests.conftest import test_session_factory as session_factory
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    """Write snapshots to a per-test directory."""
+    monkeypatch.setattr(settings, "catalog_snapshot_dir", str(tmp_path))
+    return tmp_path
+
+
+async def _build() -> bool:
+    async with session_factory() as session:
+        return await build_catalog_snapshot(session)
+
+
+async def test_catalog_lists_published_courses_with_counts():
+    """Test that the snapshot holds only published courses and their counts."""
+    published = client.post("/courses", json=build_course_payload()).json()["id"]
+    client.post("/courses", json=build_course_payload(status="draft"))
+    client.post(
+        f"/courses/{published}/enrollments",
+        json={"name": "Learner", "email": "learner@example.com"},
+    )
+    await _build()
+
+    response = client.get("/catalog")
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert [course["id"] for course in body] == [published]
+    assert body[0]["enrollment_count"] == 1
+    assert json.loads(gzip.decompress(snapshot_path().read_bytes())) == body
+
+
+async def test_catalog_is_served_without_database_queries(statements):
+    """Test that an existing snapshot is served straight from disk."""
+    client.post("/courses", json=build_course_payload())
+    await _build()
+    statements.clear()
+
+    assert client.get("/catalog").status_code == 200
+    assert statements == []
+
+
+async def test_catalog_etag_revalidates_with_304():
+    """Test that a matching If-None-Match gets 304 until the snapshot changes."""
+    await _build()
+    etag = client.get("/catalog").headers["etag"]
+
+    revalidated = client.get("/catalog", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+
+    client.post("/courses", json=build_course_payload())
+    await _build()
+    changed = client.get("/catalog", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+@pytest.mark.parametrize(
+    "if_none_match, revalidated",
+    [
+        ("{etag}", True),
+        ('"other", {etag}', True),
+        ("W/{etag}", True),
+        ("*", True),
+        ('"other"', False),
+        ("{prefix}", False),
+        ('"{etag}"', False),
+    ],
+)
+async def test_catalog_if_none_match_is_parsed(if_none_match, revalidated):
+    """Test that If-None-Match is compared tag by tag, not as a substring."""
+    await _build()
+    etag = client.get("/catalog").headers["etag"]
+    header = if_none_match.format(etag=etag, prefix=etag[:-5] + '"')
+
+    response = client.get("/catalog", headers={"If-None-Match": header})
+    assert response.status_code == (304 if revalidated else 200)
+
+
+async def test_catalog_etag_is_a_content_hash():
+    """Test that the ETag follows the content, not the file's mtime."""
+    client.post("/courses", json=build_course_payload())
+    await _build()
+    etag = client.get("/catalog").headers["etag"]
+    body = gzip.decompress(snapshot_path().read_bytes())
+    assert etag == content_etag(body)
+
+    os.utime(snapshot_path(), (0, 0))
+    assert client.get("/catalog").headers["etag"] == etag
+
+
+async def test_missing_etag_is_recorded_on_rebuild():
+    """Test that a snapshot without its recorded ETag gets one again."""
+    await _build()
+    etag = client.get("/catalog").headers["etag"]
+    snapshot_path().with_name(snapshot_path().name + ".etag").unlink()
+
+    assert await _build() is False
+    assert client.get("/catalog").headers["etag"] == etag
+
+
+async def test_unchanged_catalog_is_not_rewritten():
+    """Test that rebuilding identical content keeps the file and its ETag."""
+    client.post("/courses", json=build_course_payload())
+    assert await _build() is True
+    before = snapshot_path().stat()
+
+    assert await _build() is False
+    assert snapshot_path().stat().st_mtime_ns == before.st_mtime_ns
+
+
+def test_missing_snapshot_is_built_on_first_request():
+    """Test that the first request after a deploy renders the snapshot."""
+    client.post("/courses", json=build_course_payload())
+    assert not snapshot_path().exists()
+
+    response = client.get("/catalog")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert snapshot_path().exists()
+
+
+async def test_catalog_without_gzip_support_is_decompressed():
+    """Test that clients not accepting gzip still get plain JSON."""
+    client.post("/courses", json=build_course_payload())
+    await _build()
+
+    response = client.get("/catalog", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(json.loads(response.content)) == 1
+
+
+async def test_every_host_rebuilds_its_snapshot_on_catalog_changes(tmp_path):
+    """Test that each process follows the outbox and converges on one ETag."""
+    hosts = [
+        CatalogSnapshotter(session_factory, interval=1, path=tmp_path / host / "c.gz")
+        for host in ("a", "b")
+    ]
+    for host in hosts:
+        assert await host.run_once() is True
+        assert await host.run_once() is False
+
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    client.post(
+        f"/courses/{course_id}/enrollments",
+        json={"name": "Learner", "email": "learner@example.com"},
+    )
+    for host in hosts:
+        assert await host.run_once() is True
+        (course,) = json.loads(gzip.decompress(host.path.read_bytes()))
+        assert course["enrollment_count"] == 1
+    etags = {snapshot_state(host.path)[1] for host in hosts}
+    assert len(etags) == 1
+
+    client.delete(f"/courses/{course_id}")
+    for host in hosts:
+        assert await host.run_once() is True
+        assert json.loads(gzip.decompress(host.path.read_bytes())) == []
+
+
+async def test_draft_course_changes_do_not_rebuild(tmp_path, statements):
+    """Test that changes outside the published catalog leave it alone."""
+    snapshotter = CatalogSnapshotter(
+        session_factory, interval=1, path=tmp_path / "catalog.gz"
+    )
+    await snapshotter.run_once()
+    course_id = client.post(
+        "/courses", json=build_course_payload(status="draft")
+    ).json()["id"]
+    client.post(
+        f"/courses/{course_id}/enrollments",
+        json={"name": "Learner", "email": "learner@example.com"},
+    )
+    statements.clear()
+    assert await snapshotter.run_once() is False
+    assert not any("FROM courses" in statement for statement in statements)
+
+    # Publishing or unpublishing does change it.
+    client.patch(f"/courses/{course_id}", json={"status": "published"})
+    assert await snapshotter.run_once() is True
+    client.patch(f"/courses/{course_id}", json={"status": "draft"})
+    assert await snapshotter.run_once() is True
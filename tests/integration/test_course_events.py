@@ -0,0 +1,227 @@
+"""Integration tests for the course change stream and its per-worker hub."""
+
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import NullPool
+
+from app.api.routes.events import event_stream
+from app.core.config import settings
+from app.main import app
+from app.outbox import ChangeHub, record_event
+from app.schemas.outbox import OutboxEventType
+from tests.conftest import build_course_payload
+from tests.conftest import test_session_factory as session_factory
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture
+async def hub():
+    """A hub on the test database, stopped after the test."""
+    hub = ChangeHub(
+        lambda: session_factory, poll_interval=0.05, client_buffer=100, max_clients=10
+    )
+    yield hub
+    await hub.stop()
+
+
+async def _next(subscription, timeout=5.0):
+    return await asyncio.wait_for(subscription.queue.get(), timeout)
+
+
+def _enroll(course_id: str, index: int = 0) -> None:
+    client.post(
+        f"/courses/{course_id}/enrollments",
+        json={"name": f"Learner {index}", "email": f"learner{index}@example.com"},
+    )
+
+
+async def test_hub_pushes_committed_changes_to_subscribers(hub):
+    """Test that a committed change reaches every subscriber via NOTIFY."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    first, second = await hub.subscribe(), await hub.subscribe()
+    assert hub._listening()
+
+    _enroll(course_id)
+    for subscription in (first, second):
+        message = await _next(subscription)
+        assert message.event_type.value == "enrollment.created"
+        assert message.aggregate_id == course_id
+
+
+async def test_hub_polls_when_it_cannot_listen(hub, monkeypatch):
+    """Test the polling fallback used without LISTEN/NOTIFY."""
+
+    async def _no_listen():
+        return None
+
+    monkeypatch.setattr(hub, "_listen", _no_listen)
+    subscription = await hub.subscribe()
+    assert not hub._listening()
+
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    message = await _next(subscription)
+    assert message.event_type.value == "course.created"
+    assert message.aggregate_id == course_id
+
+
+async def test_hub_listens_outside_the_application_pool(hub):
+    """Test that the LISTEN connection does not come from the request pool."""
+    await hub.subscribe()
+    assert hub._listening()
+    assert isinstance(hub._listen_engine.pool, NullPool)
+    assert hub._listen_engine is not session_factory.kw["bind"]
+
+
+async def test_hub_polls_behind_pgbouncer(hub, monkeypatch):
+    """Test that LISTEN, which pgbouncer never delivers to, is not used."""
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    subscription = await hub.subscribe()
+    assert not hub._listening()
+
+    client.post("/courses", json=build_course_payload())
+    assert (await _next(subscription)).event_type.value == "course.created"
+
+
+async def test_polling_hub_sees_events_committed_out_of_id_order(hub, monkeypatch):
+    """Test that a lower id committing late is broadcast and replayed."""
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    subscription = await hub.subscribe()
+    async with session_factory() as first, session_factory() as second:
+        record_event(first, OutboxEventType.course_created, "first", {})
+        await first.flush()
+        record_event(second, OutboxEventType.course_created, "second", {})
+        await second.commit()
+        later = await _next(subscription)
+        assert later.aggregate_id == "second"
+        await first.commit()
+
+    earlier = await _next(subscription)
+    assert earlier.aggregate_id == "first"
+    assert earlier.id < later.id
+    # A client that disconnected after the later event still gets the earlier.
+    replayed = await hub.replay(later.id)
+    assert "first" in {message.aggregate_id for message in replayed}
+
+
+async def test_one_fetch_serves_all_subscribers(hub, statements):
+    """Test that fan-out costs one query per change, not one per client."""
+    hub.max_clients = 2000
+    subscriptions = [await hub.subscribe() for _ in range(1000)]
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    await asyncio.gather(*(_next(s) for s in subscriptions))
+    statements.clear()
+
+    _enroll(course_id)
+    messages = await asyncio.gather(*(_next(s) for s in subscriptions))
+    assert {message.event_type.value for message in messages} == {"enrollment.created"}
+    outbox_reads = [
+        s for s in statements if s.startswith("SELECT") and "FROM outbox_events" in s
+    ]
+    assert len(outbox_reads) == 1
+
+
+async def test_slow_subscriber_is_dropped(hub):
+    """Test that a client that stops reading is cut off, not buffered forever."""
+    hub.client_buffer = 2
+    subscription = await hub.subscribe()
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    for index in range(3):
+        _enroll(course_id, index)
+
+    for _ in range(50):
+        if hub.clients == 0:
+            break
+        await asyncio.sleep(0.05)
+    assert hub.clients == 0
+    assert await _next(subscription) is None
+
+
+async def test_stream_replays_missed_events_after_last_event_id(hub):
+    """Test that a resuming client receives what it missed, then live events."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    _enroll(course_id, 1)
+    live = await hub.subscribe()
+    missed = await hub.replay(0)
+    assert [m.event_type.value for m in missed] == [
+        "course.created",
+        "enrollment.created",
+    ]
+
+    stream = event_stream(hub, live, missed[0].id, heartbeat=5)
+    assert (await anext(stream)).startswith("retry: ")
+    replayed = await anext(stream)
+    assert replayed.startswith(f"id: {missed[1].id}\nevent: enrollment.created\n")
+
+    _enroll(course_id, 2)
+    frame = await asyncio.wait_for(anext(stream), 5)
+    assert frame.startswith("id: ")
+    assert int(frame.split("\n")[0].removeprefix("id: ")) > missed[1].id
+    await stream.aclose()
+    assert hub.clients == 0
+
+
+async def test_stream_sends_keepalives_when_idle(hub):
+    """Test that idle streams emit comments so proxies keep them open."""
+    stream = event_stream(hub, await hub.subscribe(), None, heartbeat=0.05)
+    await anext(stream)
+    assert await asyncio.wait_for(anext(stream), 5) == ": keepalive\n\n"
+    await stream.aclose()
+
+
+def test_stream_rejects_clients_beyond_limit(monkeypatch):
+    """Test that a worker at its stream limit answers 503."""
+    monkeypatch.setattr(app.state.change_hub, "max_clients", 0)
+    response = client.get("/courses/events")
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def server():
+    """Serve the app on a real socket so the stream can be read incrementally."""
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, ws="none", log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert time.monotonic() < deadline, "server did not start"
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(10)
+
+
+def test_events_endpoint_streams_changes(server):
+    """Test the SSE endpoint end to end over HTTP."""
+    with httpx.Client(base_url=server, timeout=10) as http:
+        with http.stream("GET", "/courses/events") as stream:
+            assert stream.status_code == 200
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            lines = stream.iter_lines()
+            assert next(lines).startswith("retry: ")
+            course_id = http.post("/courses", json=build_course_payload()).json()["id"]
+            frame = []
+            for line in lines:
+                if line.startswith(("id:", "event:", "data:")):
+                    frame.append(line)
+                if line.startswith("data:"):
+                    break
+    assert frame[1] == "event: course.created"
+    assert course_id in frame[2]
@@ -0,0 +1,108 @@
+"""Integration tests for embedding related records via ``expand``."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from tests.conftest import build_course_payload
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+def _seed_course(title="Expandable Course", enrollments=2, labs=1):
+    course_id = client.post("/courses", json=build_course_payload(title=title)).json()[
+        "id"
+    ]
+    for i in range(enrollments):
+        client.post(
+            f"/courses/{course_id}/enrollments",
+            json={"name": f"User {i}", "email": f"user{i}@example.com"},
+        )
+    for i in range(labs):
+        client.post(
+            f"/courses/{course_id}/labs",
+            json={
+                "title": f"Lab {i}",
+                "resource_type": "kubernetes",
+                "resource_uri": f"https://example.com/lab{i}",
+            },
+        )
+    return course_id
+
+
+def test_get_course_without_expand_omits_relations():
+    """Test that relations are not embedded unless requested."""
+    course_id = _seed_course()
+
+    data = client.get(f"/courses/{course_id}").json()
+    assert "labs" not in data
+    assert "enrollments" not in data
+
+    (listed,) = client.get("/courses").json()
+    assert "labs" not in listed
+    assert "enrollments" not in listed
+
+
+def test_get_course_expand_labs_and_enrollments():
+    """Test embedding both labs and enrollment summaries."""
+    course_id = _seed_course(enrollments=2, labs=1)
+
+    response = client.get(f"/courses/{course_id}?expand=labs,enrollments")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["labs"]) == 1
+    assert data["labs"][0]["course_id"] == course_id
+    assert sorted(e["email"] for e in data["enrollments"]) == [
+        "user0@example.com",
+        "user1@example.com",
+    ]
+    assert "notes" not in data["enrollments"][0]
+    assert data["enrollment_count"] == 2
+    assert data["lab_count"] == 1
+
+
+def test_get_course_expand_single_relation():
+    """Test that only the requested relation is embedded."""
+    course_id = _seed_course()
+
+    data = client.get(f"/courses/{course_id}?expand=labs").json()
+    assert len(data["labs"]) == 1
+    assert "enrollments" not in data
+
+
+def test_expand_rejects_unknown_relation():
+    """Test that unknown expand values return 422."""
+    course_id = _seed_course()
+
+    response = client.get(f"/courses/{course_id}?expand=labs,instructors")
+    assert response.status_code == 422
+    assert "instructors" in response.json()["detail"]
+
+
+def test_list_courses_expand_embeds_per_course():
+    """Test that list_courses embeds each course's own relations."""
+    first = _seed_course(title="First Course", enrollments=1, labs=2)
+    second = _seed_course(title="Second Course", enrollments=0, labs=0)
+
+    response = client.get("/courses?expand=labs,enrollments")
+    assert response.status_code == 200
+    courses = {c["id"]: c for c in response.json()}
+    assert len(courses[first]["labs"]) == 2
+    assert len(courses[first]["enrollments"]) == 1
+    assert courses[second]["labs"] == []
+    assert courses[second]["enrollments"] == []
+
+
+def test_list_courses_expand_uses_one_query_per_relation(statements):
+    """Test that expanding does not issue a query per course."""
+    for i in range(4):
+        _seed_course(title=f"Course {i}")
+
+    statements.clear()
+    client.get("/courses")
+    baseline = len(statements)
+
+    statements.clear()
+    response = client.get("/courses?expand=labs,enrollments")
+    assert response.status_code == 200
+    assert len(response.json()) == 4
+    assert len(statements) == baseline + 2
@@ -0,0 +1,110 @@
+"""Integration tests for catalog facet counts and filters."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.facets import COURSE_FACETS, FacetIndex
+from app.main import app
+from tests.conftest import build_course_payload
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    """Each test starts from an unloaded index (tables are truncated)."""
+    monkeypatch.setattr(app.state, "facet_index", FacetIndex())
+
+
+def _course(title, tags, category="DevOps", lab_types=(), **overrides):
+    payload = build_course_payload(
+        title=title, tags=list(tags), category=category, **overrides
+    )
+    course_id = client.post("/courses", json=payload).json()["id"]
+    for resource_type in lab_types:
+        lab = {
+            "title": f"{title} lab",
+            "resource_type": resource_type,
+            "resource_uri": "https://github.com/devops-with-brian/lab",
+        }
+        assert client.post(f"/courses/{course_id}/labs", json=lab).status_code == 201
+    return course_id
+
+
+def _facets(**params):
+    response = client.get("/courses/facets", params=params)
+    assert response.status_code == 200
+    return {
+        facet: {item["value"]: item["count"] for item in counts}
+        for facet, counts in response.json().items()
+    }
+
+
+def _seed():
+    _course(
+        "Docker",
+        ["docker", "containers"],
+        lab_types=["yaml", "yaml", "docker_compose"],
+        difficulty="beginner",
+    )
+    _course("Kubernetes", ["kubernetes", "containers"], lab_types=["kubernetes"])
+    _course("Terraform", ["terraform"], category="Cloud", status="draft")
+    _course("Excel", [], category=None, difficulty="advanced", status="archived")
+    deleted = _course("Deleted", ["docker"], lab_types=["yaml"])
+    client.delete(f"/courses/{deleted}")
+
+
+def test_counts_every_facet():
+    """Test grouped counts per tag, category, difficulty, status and lab type."""
+    _seed()
+
+    assert _facets() == {
+        "tag": {"containers": 2, "docker": 1, "kubernetes": 1, "terraform": 1},
+        "category": {"DevOps": 2, "Cloud": 1},
+        "difficulty": {"intermediate": 2, "beginner": 1, "advanced": 1},
+        "status": {"published": 2, "draft": 1, "archived": 1},
+        "resource_type": {"yaml": 1, "docker_compose": 1, "kubernetes": 1},
+    }
+    counts = client.get("/courses/facets").json()["tag"]
+    assert counts[0] == {"value": "containers", "count": 2}
+
+
+def test_filters_apply_to_facets_and_listing():
+    """Test that facets count only courses matching the list filters."""
+    _seed()
+
+    facets = _facets(tag="containers", resource_type="yaml")
+    assert facets["tag"] == {"containers": 1, "docker": 1}
+    assert facets["resource_type"] == {"yaml": 1, "docker_compose": 1}
+    assert _facets(status="draft")["category"] == {"Cloud": 1}
+
+    listed = client.get("/courses", params={"tag": "containers"}).json()
+    assert sorted(course["title"] for course in listed) == ["Docker", "Kubernetes"]
+    listed = client.get("/courses", params={"difficulty": "advanced"}).json()
+    assert [course["title"] for course in listed] == ["Excel"]
+
+
+def test_changes_apply_incrementally(statements):
+    """Test that course and lab changes reach a loaded index without a reload."""
+    _seed()
+    assert _facets()["status"] == {"published": 2, "draft": 1, "archived": 1}
+
+    statements.clear()
+    terraform = client.get("/courses", params={"tag": "terraform"}).json()[0]["id"]
+    client.patch(f"/courses/{terraform}", json={"status": "published"})
+    _course("Helm", ["kubernetes"], lab_types=["yaml"])
+    client.delete(f"/courses/{terraform}")
+
+    facets = _facets()
+    assert facets["status"] == {"published": 3, "archived": 1}
+    assert facets["tag"]["kubernetes"] == 2
+    assert "terraform" not in facets["tag"]
+    assert facets["resource_type"]["yaml"] == 2
+    facet_query = str(COURSE_FACETS).split("\n")[0]
+    assert not any(s.startswith(facet_query) for s in statements)
+
+
+def test_invalid_filter_is_rejected():
+    """Test that unknown enum filter values are a validation error."""
+    assert client.get("/courses/facets", params={"status": "gone"}).status_code == 422
+    assert client.get("/courses", params={"difficulty": "expert"}).status_code == 422
@@ -0,0 +1,60 @@
+"""Integration tests for deadlines propagated to database statement timeouts."""
+
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.deadlines import current_deadline, is_deadline_error
+from tests.conftest import test_session_factory as session_factory
+
+
+async def test_postgres_statement_timeout_follows_deadline():
+    """Test that Postgres aborts a query once the request deadline passes."""
+    token = current_deadline.set(time.monotonic() + 0.2)
+    try:
+        async with session_factory() as session:
+            timeout = await session.scalar(text("SHOW statement_timeout"))
+            assert timeout.endswith("ms")
+            with pytest.raises(DBAPIError) as exc_info:
+                await session.execute(text("SELECT pg_sleep(2)"))
+    finally:
+        current_deadline.reset(token)
+
+    assert is_deadline_error(exc_info.value)
+
+
+async def test_postgres_timeout_does_not_leak_past_transaction():
+    """Test that SET LOCAL leaves later transactions without the timeout."""
+    token = current_deadline.set(time.monotonic() + 5)
+    try:
+        async with session_factory() as session:
+            await session.execute(text("SELECT 1"))
+            await session.commit()
+    finally:
+        current_deadline.reset(token)
+
+    async with session_factory() as session:
+        assert await session.scalar(text("SHOW statement_timeout")) == "0"
+
+
+async def test_sqlite_query_is_interrupted_at_deadline():
+    """Test that SQLite queries are interrupted once the deadline passes."""
+    sqlite_engine = create_async_engine("sqlite+aiosqlite://")
+    sqlite_sessions = async_sessionmaker(bind=sqlite_engine)
+    slow_query = text(
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+        "SELECT count(*) FROM n"
+    )
+    token = current_deadline.set(time.monotonic() + 0.2)
+    try:
+        async with sqlite_sessions() as session:
+            with pytest.raises(DBAPIError) as exc_info:
+                await session.execute(slow_query)
+    finally:
+        current_deadline.reset(token)
+        await sqlite_engine.dispose()
+
+    assert is_deadline_error(exc_info.value)
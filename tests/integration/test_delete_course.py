@@ -0,0 +1,113 @@
+"""Integration tests for course deletion and the background child purge."""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db.session import (
+    get_read_session_factory,
+    get_session,
+    get_session_factory,
+)
+from app.main import create_app
+from tests.conftest import build_course_payload, override_get_session
+from tests.conftest import test_session_factory as session_factory
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client running the job workers so purges can finish."""
+    monkeypatch.setattr(settings, "purge_batch_size", 2)
+    monkeypatch.setattr(settings, "purge_batch_pause", 0)
+    monkeypatch.setattr(settings, "job_poll_interval", 0.01)
+    app = create_app()
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    app.dependency_overrides[get_read_session_factory] = lambda: session_factory
+    with TestClient(app, raise_server_exceptions=False) as client:
+        yield client
+
+
+def _course_with_children(client, enrollments=5, labs=1):
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    for i in range(enrollments):
+        client.post(
+            f"/courses/{course_id}/enrollments",
+            json={"name": f"Learner {i}", "email": f"learner{i}@example.com"},
+        )
+    for i in range(labs):
+        client.post(
+            f"/courses/{course_id}/labs",
+            json={
+                "title": f"Lab {i}",
+                "resource_type": "kubernetes",
+                "resource_uri": "https://example.com/lab",
+            },
+        )
+    return course_id
+
+
+def _wait_for_purge(client, course_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        purge = client.get(f"/courses/{course_id}/purge").json()
+        if purge["status"] in {"completed", "failed"}:
+            return purge
+        time.sleep(0.02)
+    raise AssertionError("purge did not finish")
+
+
+def test_delete_returns_202_and_hides_course_immediately(client):
+    """Test that a deleted course disappears before its purge finishes."""
+    course_id = _course_with_children(client)
+
+    response = client.delete(f"/courses/{course_id}")
+    assert response.status_code == 202
+    assert response.json()["course_id"] == course_id
+    assert response.headers["Location"].endswith(f"/courses/{course_id}/purge")
+
+    assert client.get(f"/courses/{course_id}").status_code == 404
+    assert client.get(f"/courses/{course_id}/enrollments").status_code == 404
+    assert client.get("/courses").json() == []
+    batch = client.get("/courses:batchGet", params={"ids": course_id}).json()
+    assert batch["items"][0]["found"] is False
+
+
+def test_purge_removes_children_in_bounded_batches(client, statements):
+    """Test that children are deleted batch by batch with progress recorded."""
+    course_id = _course_with_children(client, enrollments=5, labs=1)
+
+    client.delete(f"/courses/{course_id}")
+    purge = _wait_for_purge(client, course_id)
+
+    assert purge["status"] == "completed"
+    assert purge["enrollments_deleted"] == 5
+    assert purge["labs_deleted"] == 1
+    assert purge["completed_at"] is not None
+    # Batches of 2: three enrollment batches, one lab batch.
+    enrollment_batches = [
+        s for s in statements if s.startswith("DELETE FROM enrollments")
+    ]
+    lab_batches = [s for s in statements if s.startswith("DELETE FROM lab_exercises")]
+    assert len(enrollment_batches) == 3
+    assert len(lab_batches) == 1
+    assert any(s.startswith("DELETE FROM courses") for s in statements)
+
+
+def test_repeated_delete_reports_progress(client):
+    """Test that DELETE is idempotent and returns the purge status."""
+    course_id = _course_with_children(client, enrollments=1, labs=0)
+    client.delete(f"/courses/{course_id}")
+    _wait_for_purge(client, course_id)
+
+    response = client.delete(f"/courses/{course_id}")
+    assert response.status_code == 202
+    assert response.json()["status"] == "completed"
+
+
+def test_delete_unknown_course_returns_404(client):
+    """Test that deleting a missing course is a 404."""
+    assert client.delete("/courses/missing").status_code == 404
+    assert client.get("/courses/missing/purge").status_code == 404
@@ -0,0 +1,221 @@
+"""Integration tests for the persistent job queue and worker pool."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.models import Base, Job
+from app.jobs import JobContext, JobWorker, LeaseLostError, claim, enqueue, job_handler
+from app.jobs.queue import utcnow
+from app.main import app
+from app.schemas.jobs import JobState
+from tests.conftest import test_session_factory as session_factory
+
+client = TestClient(app, raise_server_exceptions=False)
+
+calls: list[dict] = []
+
+
+@job_handler("test.echo")
+async def echo(context, payload):
+    await context.report(step="started")
+    calls.append(payload)
+    return {"echo": payload["value"]}
+
+
+@job_handler("test.flaky")
+async def flaky(context, payload):
+    raise RuntimeError("downstream unavailable")
+
+
+def _worker(sessions=session_factory, **overrides) -> JobWorker:
+    options = {
+        "concurrency": 1,
+        "poll_interval": 0.01,
+        "lease_seconds": 30,
+        "retry_backoff": 0,
+        "retry_backoff_max": 0,
+    }
+    options.update(overrides)
+    return JobWorker(sessions, **options)
+
+
+async def _enqueue(kind, payload=None, sessions=session_factory, **options) -> str:
+    async with sessions() as session:
+        job = enqueue(session, kind, payload, **options)
+        await session.commit()
+        return job.id
+
+
+async def _job(job_id, sessions=session_factory) -> Job:
+    async with sessions() as session:
+        return await session.get(Job, job_id)
+
+
+async def test_worker_runs_job_and_records_result():
+    """Test that a queued job runs once and stores its result and progress."""
+    calls.clear()
+    job_id = await _enqueue("test.echo", {"value": 42})
+
+    worker = _worker()
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    job = await _job(job_id)
+    assert job.status == "succeeded"
+    assert job.attempts == 1
+    assert job.result == {"echo": 42}
+    assert job.progress == {"step": "started"}
+    assert job.finished_at is not None
+    assert calls == [{"value": 42}]
+
+
+async def test_failed_job_retries_with_backoff_then_fails():
+    """Test that failures are retried later and fail after max_attempts."""
+    job_id = await _enqueue("test.flaky", max_attempts=2)
+
+    worker = _worker(retry_backoff=60, retry_backoff_max=60)
+    await worker.run_once()
+    job = await _job(job_id)
+    assert job.status == "queued"
+    assert job.error == "downstream unavailable"
+    assert job.run_at > utcnow() + timedelta(seconds=50)
+    # Backoff keeps it from being claimed until run_at passes.
+    assert await worker.run_once() is False
+
+    async with session_factory() as session:
+        await session.execute(
+            update(Job).where(Job.id == job_id).values(run_at=utcnow())
+        )
+        await session.commit()
+    await worker.run_once()
+    job = await _job(job_id)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.finished_at is not None
+
+
+async def test_concurrent_claims_get_distinct_jobs():
+    """Test that SKIP LOCKED hands each concurrent claimer a different job."""
+    job_ids = {await _enqueue("test.echo", {"value": n}) for n in range(3)}
+
+    async def _claim():
+        async with session_factory() as session:
+            return await claim(session, lease_seconds=30)
+
+    claimed = await asyncio.gather(*(_claim() for _ in range(4)))
+    ids = [job.id for job in claimed if job is not None]
+    assert sorted(ids) == sorted(job_ids)
+
+
+async def test_job_with_expired_lease_is_reclaimed():
+    """Test that a running job abandoned by a dead worker runs again."""
+    job_id = await _enqueue("test.echo", {"value": 1})
+    async with session_factory() as session:
+        assert (await claim(session, lease_seconds=30)).id == job_id
+    async with session_factory() as session:
+        assert await claim(session, lease_seconds=30) is None
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(locked_until=utcnow() - timedelta(seconds=1))
+        )
+        await session.commit()
+
+    assert await _worker().run_once() is True
+    job = await _job(job_id)
+    assert job.status == "succeeded"
+    assert job.attempts == 2
+
+
+async def test_stale_worker_cannot_touch_a_reclaimed_job():
+    """Test that a worker whose lease expired loses its job to the reclaimer."""
+    calls.clear()
+    job_id = await _enqueue("test.echo", {"value": 1})
+    async with session_factory() as session:
+        stale = await claim(session, lease_seconds=30)
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(locked_until=utcnow() - timedelta(seconds=1))
+        )
+        await session.commit()
+    async with session_factory() as session:
+        current = await claim(session, lease_seconds=30)
+    assert (stale.attempts, current.attempts) == (1, 2)
+
+    with pytest.raises(LeaseLostError):
+        await JobContext(session_factory, stale, 30).report(step="stale")
+    worker = _worker()
+    await worker._execute(stale)
+    await worker._finish(stale, status=JobState.failed, error="stale")
+    assert calls == []
+    job = await _job(job_id)
+    assert (job.status, job.attempts, job.progress, job.error) == (
+        "running",
+        2,
+        {},
+        None,
+    )
+
+    await JobContext(session_factory, current, 30).report(step="current")
+    await worker._finish(current, status=JobState.succeeded, result={"ok": True})
+    job = await _job(job_id)
+    assert (job.status, job.progress) == ("succeeded", {"step": "current"})
+
+
+async def test_worker_pool_drains_queue_on_sqlite(tmp_path):
+    """Test the conditional-update claim path on a database without row locks."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    job_ids = [
+        await _enqueue("test.echo", {"value": n}, sessions=sessions) for n in range(5)
+    ]
+
+    worker = _worker(sessions, concurrency=3)
+    worker.start()
+    try:
+        for _ in range(200):
+            jobs = [await _job(job_id, sessions) for job_id in job_ids]
+            if all(job.status == "succeeded" for job in jobs):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await worker.stop()
+        await engine.dispose()
+
+    assert [job.status for job in jobs] == ["succeeded"] * 5
+    assert [job.attempts for job in jobs] == [1] * 5
+
+
+async def test_get_job_reports_status():
+    """Test that GET /jobs/{id} returns the job's state."""
+    job_id = await _enqueue("test.echo", {"value": 7})
+
+    response = client.get(f"/jobs/{job_id}")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] == job_id
+    assert body["kind"] == "test.echo"
+    assert body["status"] == "queued"
+    assert body["attempts"] == 0
+
+
+def test_get_unknown_job_returns_404():
+    """Test that an unknown job id is a 404."""
+    response = client.get("/jobs/missing")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Job not found"
+
+
+async def test_enqueue_rejects_unknown_kind():
+    """Test that only registered job kinds can be enqueued."""
+    async with session_factory() as session:
+        with pytest.raises(ValueError, match="Unknown job kind"):
+            enqueue(session, "test.missing")
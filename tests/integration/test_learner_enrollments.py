@@ -0,0 +1,110 @@
+"""Integration tests for a learner's enrollments across courses."""
+
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text, update
+
+from app.db import queries
+from app.db.models import Course
+from app.main import app
+from tests.conftest import build_course_payload
+from tests.conftest import test_engine as engine
+from tests.conftest import test_session_factory as session_factory
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+def _enrolled_course(title: str, email: str = "Ada@Example.com") -> str:
+    course_id = client.post("/courses", json=build_course_payload(title=title)).json()[
+        "id"
+    ]
+    client.post(
+        f"/courses/{course_id}/enrollments", json={"name": "Ada", "email": email}
+    )
+    return course_id
+
+
+def test_lists_enrollments_across_courses_with_course_summary(statements):
+    """Test that one query returns every enrollment with its course."""
+    first = _enrolled_course("First course")
+    second = _enrolled_course("Second course", email="ada@example.com")
+    _enrolled_course("Someone else's", email="grace@example.com")
+    statements.clear()
+
+    response = client.get("/learners/ADA@example.com/enrollments")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["course_id"] for item in body["items"]] == [first, second]
+    assert body["items"][0]["course"] == {
+        "id": first,
+        "title": "First course",
+        "instructor": "Brian T",
+        "difficulty": "intermediate",
+        "category": "DevOps",
+        "duration_minutes": 120,
+        "status": "published",
+    }
+    assert body["next_cursor"] is None
+    assert len(statements) == 1
+
+
+def test_paginates_with_cursor():
+    """Test that cursors walk every enrollment exactly once."""
+    course_ids = [_enrolled_course(f"Course {i}") for i in range(5)]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        body = client.get("/learners/ada@example.com/enrollments", params=params)
+        body = body.json()
+        assert len(body["items"]) <= 2
+        seen += [item["course_id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == course_ids
+
+
+async def test_deleted_courses_are_left_out():
+    """Test that soft-deleted courses drop out of the learner's list."""
+    kept = _enrolled_course("Kept")
+    deleted = _enrolled_course("Deleted")
+    async with session_factory() as session:
+        await session.execute(
+            update(Course)
+            .where(Course.id == deleted)
+            .values(deleted_at=datetime.now(timezone.utc))
+        )
+        await session.commit()
+
+    items = client.get("/learners/ada@example.com/enrollments").json()["items"]
+    assert [item["course_id"] for item in items] == [kept]
+
+
+def test_unknown_learner_and_bad_cursor():
+    """Test the empty page and cursor validation."""
+    response = client.get("/learners/nobody@example.com/enrollments")
+    assert response.json() == {"items": [], "next_cursor": None}
+
+    response = client.get(
+        "/learners/nobody@example.com/enrollments", params={"cursor": "garbage"}
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+async def test_lookup_uses_the_lower_email_index():
+    """Test that the learner lookup is an index scan on lower(email)."""
+    compiled = queries.LEARNER_ENROLLMENTS.params(
+        email="ada@example.com", limit=51
+    ).compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    async with session_factory() as session:
+        # The tables are tiny, so keep the planner from preferring a seq scan.
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(await session.scalars(text(f"EXPLAIN {compiled}")))
+    # Partitions name their copies of the index after the expression.
+    assert "Index Cond: (lower((email)::text)" in plan
+    assert "Seq Scan on enrollments" not in plan
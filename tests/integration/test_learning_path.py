@@ -0,0 +1,108 @@
+"""Integration tests for prerequisite learning paths."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.prerequisites import COURSE_PREREQUISITES, PrerequisiteGraph
+from app.main import app
+from tests.conftest import build_course_payload
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_graph(monkeypatch):
+    """Each test starts from an unloaded graph (tables are truncated)."""
+    monkeypatch.setattr(app.state, "prerequisite_graph", PrerequisiteGraph())
+
+
+def _course(title, *prerequisites):
+    payload = build_course_payload(title=title, prerequisites=list(prerequisites))
+    response = client.post("/courses", json=payload)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _path(course_id):
+    response = client.get(f"/courses/{course_id}/path")
+    assert response.status_code == 200
+    return [course["title"] for course in response.json()]
+
+
+def test_path_is_topologically_ordered():
+    """Test that every course comes after the courses it requires."""
+    linux = _course("Linux", "Basic shell")
+    docker = _course("Docker", linux)
+    git = _course("Git")
+    kubernetes = _course("Kubernetes", docker, git, linux)
+
+    assert _path(kubernetes) == ["Linux", "Docker", "Git", "Kubernetes"]
+    assert _path(linux) == ["Linux"]
+    assert set(client.get(f"/courses/{docker}/path").json()[0]) == {
+        "id",
+        "title",
+        "instructor",
+        "difficulty",
+        "category",
+        "duration_minutes",
+        "status",
+    }
+
+
+def test_unknown_prerequisite_course_is_rejected():
+    """Test that course id prerequisites must reference existing courses."""
+    missing = "00000000-0000-4000-8000-000000000000"
+    payload = build_course_payload(prerequisites=[missing])
+    response = client.post("/courses", json=payload)
+
+    assert response.status_code == 422
+    assert missing in response.json()["detail"]
+
+
+def test_cycle_is_rejected_on_update():
+    """Test that an update closing a prerequisite loop is refused."""
+    linux = _course("Linux")
+    docker = _course("Docker", linux)
+    kubernetes = _course("Kubernetes", docker)
+
+    response = client.patch(f"/courses/{linux}", json={"prerequisites": [kubernetes]})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == (
+        f"Prerequisites would create a cycle: {linux} -> {kubernetes} -> {docker}"
+        f" -> {linux}"
+    )
+    self_loop = client.patch(f"/courses/{linux}", json={"prerequisites": [linux]})
+    assert self_loop.status_code == 422
+    assert _path(kubernetes) == ["Linux", "Docker", "Kubernetes"]
+
+
+def test_updates_apply_incrementally(statements):
+    """Test that prerequisite changes reach a loaded graph without a reload."""
+    linux = _course("Linux")
+    docker = _course("Docker")
+    assert _path(docker) == ["Docker"]
+
+    statements.clear()
+    client.patch(f"/courses/{docker}", json={"prerequisites": [linux]})
+    kubernetes = _course("Kubernetes", docker)
+
+    assert _path(kubernetes) == ["Linux", "Docker", "Kubernetes"]
+    graph_query = str(COURSE_PREREQUISITES).split("\n")[0]
+    assert not any(s.startswith(graph_query) for s in statements)
+
+
+def test_deleted_prerequisites_drop_out():
+    """Test that deleted courses are left out of the path."""
+    linux = _course("Linux")
+    docker = _course("Docker", linux)
+    assert _path(docker) == ["Linux", "Docker"]
+
+    client.delete(f"/courses/{linux}")
+
+    assert _path(docker) == ["Docker"]
+
+
+def test_unknown_course_returns_404():
+    """Test that the learning path of a missing course is a 404."""
+    assert client.get("/courses/missing/path").status_code == 404
@@ -116,3 +116,27 @@ def test_list_courses_returns_all_fields():
     assert course["lab_count"] == 0
     assert "created_at" in course
     assert "updated_at" in course
+
+
+def test_list_courses_counts_with_both_enrollments_and_labs():
+    """Test that counts are not multiplied when a course has both children."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+
+    for i in range(2):
+        client.post(
+            f"/courses/{course_id}/enrollments",
+            json={"name": f"Student {i}", "email": f"student{i}@example.com"},
+        )
+    for i in range(3):
+        client.post(
+            f"/courses/{course_id}/labs",
+            json={
+                "title": f"Lab {i}",
+                "resource_type": "kubernetes",
+                "resource_uri": f"https://example.com/lab{i}",
+            },
+        )
+
+    course = client.get("/courses").json()[0]
+    assert course["enrollment_count"] == 2
+    assert course["lab_count"] == 3
@@ -0,0 +1,389 @@
+"""Integration tests for the transactional outbox and its dispatcher."""
+
+import asyncio
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text, update
+
+from app.db.models import OutboxEvent
+from app.jobs.queue import utcnow
+from app.main import app
+from app.outbox import (
+    FileSink,
+    HttpSink,
+    OutboxDispatcher,
+    OutboxFollower,
+    cursor,
+    record_event,
+)
+from app.schemas.outbox import OutboxEventType
+from tests.conftest import build_course_payload
+from tests.conftest import test_session_factory as session_factory
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+class RecordingSink:
+    """Sink that keeps delivered messages and can be told to fail."""
+
+    def __init__(self, fail_on: set[str] | None = None, delay: float = 0) -> None:
+        self.messages = []
+        self.fail_on = fail_on or set()
+        self.delay = delay
+
+    async def deliver(self, message):
+        await asyncio.sleep(self.delay)
+        if message.event_type.value in self.fail_on:
+            raise ConnectionError("consumer unavailable")
+        self.messages.append(message)
+
+
+def _dispatcher(*sinks, **overrides) -> OutboxDispatcher:
+    options = {
+        "batch_size": 100,
+        "poll_interval": 0.01,
+        "lease_seconds": 60,
+        "retry_backoff": 30,
+        "retry_backoff_max": 30,
+        "retention": 3600,
+    }
+    options.update(overrides)
+    return OutboxDispatcher(session_factory, sinks, **options)
+
+
+async def _events() -> list[OutboxEvent]:
+    async with session_factory() as session:
+        return list(await session.scalars(select(OutboxEvent).order_by(OutboxEvent.id)))
+
+
+def _course_with_activity() -> str:
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    client.patch(f"/courses/{course_id}", json={"title": "Renamed course"})
+    client.post(
+        f"/courses/{course_id}/enrollments",
+        json={"name": "Learner", "email": "learner@example.com"},
+    )
+    client.post(
+        f"/courses/{course_id}/labs",
+        json={
+            "title": "Lab",
+            "resource_type": "kubernetes",
+            "resource_uri": "https://example.com/lab",
+        },
+    )
+    return course_id
+
+
+async def test_writes_record_events_in_order():
+    """Test that each change writes its event with the change itself."""
+    course_id = _course_with_activity()
+
+    events = await _events()
+    assert [event.event_type for event in events] == [
+        "course.created",
+        "course.updated",
+        "enrollment.created",
+        "lab.attached",
+    ]
+    assert {event.aggregate_id for event in events} == {course_id}
+    assert all(event.dispatched_at is None for event in events)
+    assert events[1].payload["changed"] == ["title"]
+    assert events[1].payload["course"]["title"] == "Renamed course"
+    assert events[2].payload["enrollment"]["email"] == "learner@example.com"
+    assert events[3].payload["lab"]["title"] == "Lab"
+
+
+async def test_delete_records_event():
+    """Test that deleting a course publishes it once, repeats publish nothing."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    client.delete(f"/courses/{course_id}")
+    client.delete(f"/courses/{course_id}")
+
+    events = await _events()
+    assert [event.event_type for event in events] == [
+        "course.created",
+        "course.deleted",
+    ]
+    assert events[1].payload["course"]["id"] == course_id
+
+
+async def test_rejected_write_records_no_event():
+    """Test that a request that changes nothing publishes nothing."""
+    response = client.post(
+        "/courses/missing/enrollments",
+        json={"name": "Learner", "email": "learner@example.com"},
+    )
+    assert response.status_code == 404
+    assert await _events() == []
+
+
+async def test_dispatcher_delivers_batch_and_marks_dispatched(tmp_path):
+    """Test that pending events reach every sink once, in id order."""
+    _course_with_activity()
+    recording = RecordingSink()
+    path = tmp_path / "events.jsonl"
+    dispatcher = _dispatcher(recording, FileSink(path))
+
+    assert await dispatcher.run_once() == 4
+    assert await dispatcher.run_once() == 0
+
+    ids = [event.id for event in await _events()]
+    assert [message.id for message in recording.messages] == ids
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["id"] for line in lines] == ids
+    assert lines[0]["event_type"] == "course.created"
+    assert all(event.dispatched_at is not None for event in await _events())
+
+
+async def test_failed_delivery_is_retried_with_backoff():
+    """Test that a failing event stays pending without blocking the rest."""
+    _course_with_activity()
+    sink = RecordingSink(fail_on={"enrollment.created"})
+    dispatcher = _dispatcher(sink)
+
+    await dispatcher.run_once()
+    events = {event.event_type: event for event in await _events()}
+    failed = events["enrollment.created"]
+    assert failed.dispatched_at is None
+    assert failed.attempts == 1
+    assert failed.last_error == "consumer unavailable"
+    assert failed.next_attempt_at > utcnow() + timedelta(seconds=20)
+    assert len(sink.messages) == 3
+    # Not due again until the backoff has passed.
+    assert await dispatcher.run_once() == 0
+
+    sink.fail_on = set()
+    async with session_factory() as session:
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == failed.id)
+            .values(next_attempt_at=utcnow())
+        )
+        await session.commit()
+    assert await dispatcher.run_once() == 1
+    assert sink.messages[-1].id == failed.id
+
+
+async def test_malformed_event_counts_as_failed_delivery():
+    """Test that an event that does not validate is retried, not fatal."""
+    _course_with_activity()
+    async with session_factory() as session:
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.event_type == "lab.attached")
+            .values(event_type="lab.renamed")
+        )
+        await session.commit()
+    sink = RecordingSink()
+
+    assert await _dispatcher(sink).run_once() == 4
+    events = {event.event_type: event for event in await _events()}
+    malformed = events["lab.renamed"]
+    assert malformed.dispatched_at is None
+    assert malformed.attempts == 1
+    assert "lab.renamed" in malformed.last_error
+    assert len(sink.messages) == 3
+
+
+async def test_dispatcher_loop_survives_unexpected_errors(monkeypatch):
+    """Test that the background loop logs a failed pass and keeps going."""
+    dispatcher = _dispatcher(RecordingSink())
+    passes = 0
+
+    async def run_once():
+        nonlocal passes
+        passes += 1
+        if passes == 1:
+            raise RuntimeError("bug")
+        return 0
+
+    monkeypatch.setattr(dispatcher, "run_once", run_once)
+    dispatcher.start()
+    try:
+        for _ in range(100):
+            if passes > 1:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await dispatcher.stop()
+    assert passes > 1
+
+
+async def test_concurrent_dispatchers_deliver_each_event_once():
+    """Test that SKIP LOCKED keeps dispatchers off each other's batches."""
+    _course_with_activity()
+    _course_with_activity()
+    sink = RecordingSink(delay=0.01)
+    dispatchers = [_dispatcher(sink, batch_size=2) for _ in range(3)]
+
+    while sum(await asyncio.gather(*(d.run_once() for d in dispatchers))):
+        pass
+
+    delivered = [message.id for message in sink.messages]
+    assert sorted(delivered) == [event.id for event in await _events()]
+    assert len(delivered) == len(set(delivered))
+
+
+async def test_delivery_runs_outside_a_transaction():
+    """Test that a slow sink holds no row locks and its batch stays leased."""
+    client.post("/courses", json=build_course_payload())
+    other = _dispatcher(RecordingSink())
+    seen = []
+
+    class ProbingSink:
+        async def deliver(self, message):
+            async with session_factory() as session:
+                # NOWAIT fails at once if the dispatcher still held the row lock.
+                await session.execute(
+                    text(
+                        "SELECT id FROM outbox_events WHERE id = :id FOR UPDATE NOWAIT"
+                    ),
+                    {"id": message.id},
+                )
+                await session.rollback()
+            seen.append(await other.run_once())
+
+    assert await _dispatcher(ProbingSink()).run_once() == 1
+    assert seen == [0]
+    (event,) = await _events()
+    assert event.dispatched_at is not None
+    assert event.attempts == 0
+
+
+async def test_expired_lease_is_delivered_again():
+    """Test that a batch abandoned mid-delivery is retried after its lease."""
+    client.post("/courses", json=build_course_payload())
+    stalled = _dispatcher(RecordingSink())
+    leased_until, (event,) = await stalled._claim()
+    assert leased_until > utcnow() + timedelta(seconds=50)
+    sink = RecordingSink()
+    assert await _dispatcher(sink).run_once() == 0
+
+    async with session_factory() as session:
+        await session.execute(update(OutboxEvent).values(next_attempt_at=utcnow()))
+        await session.commit()
+    assert await _dispatcher(sink).run_once() == 1
+    assert [message.id for message in sink.messages] == [event.id]
+
+    # The stalled dispatcher's late failure does not reschedule the event.
+    await stalled._record(leased_until, [event], [], {event.id: "timed out"})
+    (event,) = await _events()
+    assert event.dispatched_at is not None
+    assert event.last_error is None
+
+
+async def test_prune_removes_expired_dispatched_events():
+    """Test that delivered events are dropped after the retention period."""
+    _course_with_activity()
+    dispatcher = _dispatcher(RecordingSink())
+    await dispatcher.run_once()
+    async with session_factory() as session:
+        await session.execute(
+            update(OutboxEvent).values(dispatched_at=utcnow() - timedelta(hours=2))
+        )
+        await session.commit()
+
+    assert await dispatcher.prune() == 4
+    assert await _events() == []
+
+
+class RecordingFollower(OutboxFollower):
+    """Follower that keeps the course ids of the events applied to it."""
+
+    event_types = (OutboxEventType.course_created,)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.applied = []
+
+    async def load(self, session):
+        self.applied = []
+
+    def apply(self, event_type, payload):
+        self.applied.append(payload["id"])
+
+
+async def _refreshed(follower_: OutboxFollower) -> None:
+    async with session_factory() as session:
+        await follower_.refresh(session)
+
+
+async def test_follower_applies_events_committed_out_of_id_order():
+    """Test that an event committed after a newer id is applied, once."""
+    recorder = RecordingFollower()
+    await _refreshed(recorder)
+    async with session_factory() as first, session_factory() as second:
+        record_event(first, OutboxEventType.course_created, "first", {"id": "first"})
+        await first.flush()
+        record_event(second, OutboxEventType.course_updated, "x", {"id": "skip"})
+        record_event(second, OutboxEventType.course_created, "second", {"id": "second"})
+        await second.commit()
+
+        await _refreshed(recorder)
+        assert recorder.applied == ["second"]
+        await first.commit()
+
+    await _refreshed(recorder)
+    await _refreshed(recorder)
+    assert recorder.applied == ["second", "first"]
+
+
+async def test_follower_gives_up_on_rolled_back_ids(monkeypatch):
+    """Test that a gap left by a rollback stops holding the mark back."""
+    recorder = RecordingFollower()
+    await _refreshed(recorder)
+    async with session_factory() as session:
+        record_event(session, OutboxEventType.course_created, "lost", {"id": "lost"})
+        await session.flush()
+        await session.rollback()
+    async with session_factory() as session:
+        record_event(session, OutboxEventType.course_created, "kept", {"id": "kept"})
+        await session.commit()
+
+    await _refreshed(recorder)
+    assert recorder._cursor.mark == 0
+    monkeypatch.setattr(cursor, "GAP_TIMEOUT", -1)
+    await _refreshed(recorder)
+    assert recorder.applied == ["kept"]
+    assert recorder._cursor.mark == 2
+
+
+@pytest.fixture
+def webhook():
+    """Local HTTP endpoint recording the events POSTed to it."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.headers["Idempotency-Key"], json.loads(body)))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/events", received
+    server.shutdown()
+    server.server_close()
+
+
+async def test_http_sink_posts_events(webhook):
+    """Test that the webhook sink POSTs each event with its idempotency key."""
+    url, received = webhook
+    client.post("/courses", json=build_course_payload())
+
+    assert await _dispatcher(HttpSink(url, timeout=5)).run_once() == 1
+    ((key, body),) = received
+    (event,) = await _events()
+    assert key == str(event.id)
+    assert body["event_type"] == "course.created"
+    assert event.dispatched_at is not None
@@ -0,0 +1,49 @@
+"""Integration test for the pre-forked production server."""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from tests.conftest import TEST_DATABASE_URL
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_server_serves_with_multiple_workers_and_stops_gracefully():
+    """Test that workers share the socket and exit cleanly on SIGTERM."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--host", "127.0.0.1"]
+        + ["--port", str(port), "--workers", "2", "--connection-budget", "6"],
+        # Each worker's change hub also holds a LISTEN connection on Postgres.
+        env={**os.environ, "DATABASE_URL": TEST_DATABASE_URL},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/health")
+                break
+            except httpx.TransportError:
+                assert time.monotonic() < deadline, "server did not start"
+                time.sleep(0.2)
+        assert response.status_code == 200
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        output = proc.communicate(timeout=30)[0].decode()
+
+    assert proc.returncode == 0
+    assert "2 worker(s)" in output
+    assert "pool_size=2" in output
+    assert output.count("Application shutdown complete") == 2
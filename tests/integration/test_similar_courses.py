@@ -0,0 +1,98 @@
+"""Integration tests for similar-course recommendations."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.similarity import COURSE_FEATURES, SimilarityIndex
+from app.main import app
+from tests.conftest import build_course_payload
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    """Each test starts from an unloaded index (tables are truncated)."""
+    monkeypatch.setattr(app.state, "similarity_index", SimilarityIndex())
+
+
+def _course(title, tags, category="DevOps", prerequisites=(), **overrides):
+    payload = build_course_payload(
+        title=title,
+        tags=list(tags),
+        category=category,
+        prerequisites=list(prerequisites),
+        **overrides,
+    )
+    return client.post("/courses", json=payload).json()["id"]
+
+
+def _similar(course_id, **params):
+    response = client.get(f"/courses/{course_id}/similar", params=params)
+    assert response.status_code == 200
+    return [(item["course"]["title"], item["score"]) for item in response.json()]
+
+
+def test_ranks_by_shared_features():
+    """Test that more shared tags, category and prerequisites rank higher."""
+    source = _course("Source", ["docker", "kubernetes", "helm"], prerequisites=["Git"])
+    _course("Close", ["docker", "kubernetes", "helm"], prerequisites=["Git"])
+    _course("Partial", ["docker"], category="Cloud")
+    _course("Unrelated", ["excel"], category="Office")
+    _course("Draft twin", ["docker", "kubernetes", "helm"], status="draft")
+
+    ranked = _similar(source)
+
+    assert [title for title, _ in ranked] == ["Close", "Partial"]
+    assert ranked[0][1] == 1.0
+    assert 0 < ranked[1][1] < 1
+    assert len(_similar(source, limit=1)) == 1
+
+
+def test_shared_learners_count():
+    """Test that courses sharing enrollees are related."""
+    source = _course("Source", ["a"], category=None)
+    other = _course("Other", ["b"], category=None)
+    assert _similar(source) == []
+
+    for course_id in (source, other):
+        client.post(
+            f"/courses/{course_id}/enrollments",
+            json={"name": "Ada", "email": "Ada@example.com"},
+        )
+
+    assert [title for title, _ in _similar(source)] == ["Other"]
+
+
+def test_updates_apply_incrementally(statements):
+    """Test that course changes reach a loaded index without a reload."""
+    source = _course("Source", ["terraform"])
+    other = _course("Other", ["excel"], category="Office")
+    assert _similar(source) == []
+
+    statements.clear()
+    client.patch(f"/courses/{other}", json={"tags": ["terraform"]})
+    client.post("/courses", json=build_course_payload(title="New", tags=["terraform"]))
+
+    assert {title for title, _ in _similar(source)} == {"Other", "New"}
+    feature_query = str(COURSE_FEATURES).split("\n")[0]
+    assert not any(s.startswith(feature_query) for s in statements)
+
+
+def test_unpublished_and_deleted_courses_drop_out():
+    """Test that archived and deleted courses stop being recommended."""
+    source = _course("Source", ["go"])
+    archived = _course("Archived", ["go"])
+    deleted = _course("Deleted", ["go"])
+    _course("Kept", ["go"])
+    assert len(_similar(source)) == 3
+
+    client.patch(f"/courses/{archived}", json={"status": "archived"})
+    client.delete(f"/courses/{deleted}")
+
+    assert [title for title, _ in _similar(source)] == ["Kept"]
+
+
+def test_unknown_course_returns_404():
+    """Test that similar courses of a missing course is a 404."""
+    assert client.get("/courses/missing/similar").status_code == 404
@@ -0,0 +1,111 @@
+"""Integration tests for the slow query log."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.deadlines import current_route
+from app.db.slow_queries import SlowQueryLog, slow_query_log
+from app.main import app
+from tests.conftest import test_engine as engine
+from tests.conftest import test_session_factory as session_factory
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture
+def recorder():
+    """Install a fresh slow query log on the test engine."""
+    log = SlowQueryLog(threshold_ms=20, explain_sample_rate=1.0, size=10)
+    log.install(engine.sync_engine)
+    yield log
+    log.remove(engine.sync_engine)
+
+
+async def test_records_slow_statement_with_redacted_params_and_plan(recorder):
+    """Test that a slow SELECT is logged with its route, types and plan."""
+    token = current_route.set("report_route")
+    try:
+        async with session_factory() as session:
+            result = await session.execute(
+                text("SELECT pg_sleep(0.05), :email AS email"),
+                {"email": "learner@example.com"},
+            )
+            # The explain runs in a savepoint and leaves the result intact.
+            assert result.one().email == "learner@example.com"
+            assert await session.scalar(text("SELECT 1")) == 1
+    finally:
+        current_route.reset(token)
+
+    [entry] = recorder.snapshot()
+    assert entry["route"] == "report_route"
+    assert entry["duration_ms"] >= 20
+    assert "learner@example.com" not in str(entry)
+    assert entry["parameters"] == ["str"]
+    plan = "\n".join(entry["plan"])
+    assert "actual time" in plan
+    assert "Execution Time" in plan
+
+
+async def test_fast_statements_are_not_recorded(recorder):
+    """Test that statements under the threshold are ignored."""
+    async with session_factory() as session:
+        await session.execute(text("SELECT 1"))
+
+    assert recorder.snapshot() == []
+
+
+async def test_ring_buffer_keeps_most_recent_entries():
+    """Test that the log is bounded and lists the newest entries first."""
+    log = SlowQueryLog(threshold_ms=0, explain_sample_rate=0, size=2)
+    log.install(engine.sync_engine)
+    try:
+        async with session_factory() as session:
+            for value in (1, 2, 3):
+                await session.execute(text(f"SELECT {value}"))
+    finally:
+        log.remove(engine.sync_engine)
+
+    assert [entry["statement"] for entry in log.snapshot()] == [
+        "SELECT 3",
+        "SELECT 2",
+    ]
+    assert all(entry["plan"] is None for entry in log.snapshot())
+
+
+def test_admin_endpoint_reports_route_of_slow_statements(monkeypatch):
+    """Test that slow statements issued by a route show up under admin."""
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    monkeypatch.setattr(slow_query_log, "explain_sample_rate", 0)
+    slow_query_log.install(engine.sync_engine)
+    try:
+        assert client.get("/courses").status_code == 200
+        slow_query_log.remove(engine.sync_engine)
+
+        data = client.get(
+            "/admin/slow-queries", headers={"Authorization": "Bearer secret"}
+        ).json()
+        assert data["threshold_ms"] == 0
+        assert any(entry["route"] == "list_courses" for entry in data["entries"])
+    finally:
+        slow_query_log.entries.clear()
+
+
+def test_admin_endpoint_is_hidden_without_a_configured_token(monkeypatch):
+    """Test that SQL and plans are not served unless an admin token is set."""
+    monkeypatch.setattr(settings, "admin_token", None)
+    response = client.get(
+        "/admin/slow-queries", headers={"Authorization": "Bearer anything"}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}])
+def test_admin_endpoint_rejects_a_missing_or_wrong_token(monkeypatch, headers):
+    """Test that only the configured bearer token is accepted."""
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    response = client.get("/admin/slow-queries", headers=headers)
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
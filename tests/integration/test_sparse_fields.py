@@ -0,0 +1,111 @@
+"""Integration tests for sparse fieldsets via ``fields``."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from tests.conftest import build_course_payload
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+def _create_course_with_children():
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    client.post(
+        f"/courses/{course_id}/enrollments",
+        json={"name": "Sparse User", "email": "sparse@example.com", "notes": "hi"},
+    )
+    client.post(
+        f"/courses/{course_id}/labs",
+        json={
+            "title": "Sparse Lab",
+            "resource_type": "terraform",
+            "resource_uri": "https://example.com/lab",
+        },
+    )
+    return course_id
+
+
+def test_list_courses_returns_only_requested_fields():
+    """Test that list_courses serializes only the requested fields."""
+    course_id = _create_course_with_children()
+
+    response = client.get(
+        "/courses?fields=id,title,category,difficulty,enrollment_count,lab_count"
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "id": course_id,
+            "title": "DevOps With Brian: CI/CD Foundations",
+            "category": "DevOps",
+            "difficulty": "intermediate",
+            "enrollment_count": 1,
+            "lab_count": 1,
+        }
+    ]
+
+
+def test_list_courses_sparse_query_skips_unselected_columns(statements):
+    """Test that unselected columns are not part of the course SELECT."""
+    _create_course_with_children()
+
+    statements.clear()
+    client.get("/courses?fields=id,title")
+    course_select = next(s for s in statements if "FROM courses" in s)
+    assert "courses.overview" not in course_select
+    assert "courses.supplemental_urls" not in course_select
+    assert "courses.title" in course_select
+
+
+def test_get_course_with_fields_and_expand():
+    """Test that sparse fields combine with expanded relations."""
+    course_id = _create_course_with_children()
+
+    response = client.get(f"/courses/{course_id}?fields=title&expand=labs")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"title", "labs"}
+    assert data["labs"][0]["title"] == "Sparse Lab"
+
+
+def test_get_course_sparse_without_counts_skips_count_queries(statements):
+    """Test that count queries only run when counts are requested."""
+    course_id = _create_course_with_children()
+
+    statements.clear()
+    client.get(f"/courses/{course_id}?fields=id,title")
+    assert not any("count(" in s for s in statements)
+
+
+def test_list_enrollments_with_fields():
+    """Test sparse fieldsets on enrollments."""
+    course_id = _create_course_with_children()
+
+    response = client.get(f"/courses/{course_id}/enrollments?fields=email")
+    assert response.status_code == 200
+    assert response.json() == [{"email": "sparse@example.com"}]
+
+
+def test_list_labs_with_fields():
+    """Test sparse fieldsets on labs."""
+    course_id = _create_course_with_children()
+
+    response = client.get(f"/courses/{course_id}/labs?fields=title,resource_type")
+    assert response.status_code == 200
+    assert response.json() == [{"title": "Sparse Lab", "resource_type": "terraform"}]
+
+
+def test_unknown_field_is_rejected():
+    """Test that unknown fields return 422."""
+    course_id = _create_course_with_children()
+
+    assert client.get("/courses?fields=id,secret").status_code == 422
+    assert client.get(f"/courses/{course_id}/labs?fields=bogus").status_code == 422
+    response = client.get(f"/courses/{course_id}/enrollments?fields=password")
+    assert response.status_code == 422
+    assert "password" in response.json()["detail"]
+
+
+def test_empty_fields_is_rejected():
+    """Test that an empty fieldset returns 422."""
+    assert client.get("/courses?fields=").status_code == 422
@@ -0,0 +1,56 @@
+"""Integration tests for responses built from persisted rows without validation."""
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.main import app
+from app.schemas import CourseBatchResponse, CourseDetail, Enrollment, LabExercise
+from tests.conftest import build_course_payload
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture
+def course_id():
+    """A course with one enrollment and one lab."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    client.post(
+        f"/courses/{course_id}/enrollments",
+        json={"name": "Ada Learner", "email": "ada@example.com", "notes": "Cohort 3"},
+    )
+    client.post(
+        f"/courses/{course_id}/labs",
+        json={
+            "title": "Deploy with Helm",
+            "resource_type": "kubernetes",
+            "resource_uri": "https://example.com/helm-lab",
+            "estimated_minutes": 45,
+        },
+    )
+    return course_id
+
+
+@pytest.mark.parametrize(
+    ("path", "schema"),
+    [
+        ("/courses", list[CourseDetail]),
+        ("/courses?expand=labs,enrollments", list[CourseDetail]),
+        ("/courses/{id}", CourseDetail),
+        ("/courses/{id}?expand=labs,enrollments", CourseDetail),
+        ("/courses:batchGet?ids={id},missing", CourseBatchResponse),
+        ("/courses/{id}/enrollments", list[Enrollment]),
+        ("/courses/{id}/labs", list[LabExercise]),
+    ],
+)
+def test_trusted_response_matches_validated_output(course_id, path, schema):
+    """Test that trusted responses equal the response model's own output."""
+    response = client.get(path.format(id=course_id))
+    assert response.status_code == 200
+
+    adapter = TypeAdapter(schema)
+    # Relations that were not expanded are left out, as with exclude_unset.
+    validated = adapter.dump_json(
+        adapter.validate_json(response.content), exclude_unset=True
+    )
+    assert response.content == validated
@@ -174,3 +174,55 @@ def test_update_difficulty_levels():
         )
         assert response.status_code == 200
         assert response.json()["difficulty"] == difficulty
+
+
+def test_update_with_current_etag_bumps_version():
+    """Test that If-Match with the current ETag updates and returns a new one."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    etag = client.get(f"/courses/{course_id}").headers["etag"]
+    assert etag == '"1"'
+
+    response = client.patch(
+        f"/courses/{course_id}", json={"title": "Edited"}, headers={"If-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"2"'
+    assert response.json()["version"] == 2
+
+
+def test_concurrent_editor_gets_412():
+    """Test that the second of two editors holding the same ETag is refused."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    etag = client.get(f"/courses/{course_id}").headers["etag"]
+
+    first = client.patch(
+        f"/courses/{course_id}", json={"title": "First"}, headers={"If-Match": etag}
+    )
+    second = client.patch(
+        f"/courses/{course_id}", json={"title": "Second"}, headers={"If-Match": etag}
+    )
+
+    assert first.status_code == 200
+    assert second.status_code == 412
+    assert second.headers["etag"] == first.headers["etag"]
+    assert client.get(f"/courses/{course_id}").json()["title"] == "First"
+
+
+def test_if_match_variants():
+    """Test wildcard, weak tags, empty patches and missing courses."""
+    course_id = client.post("/courses", json=build_course_payload()).json()["id"]
+    url = f"/courses/{course_id}"
+
+    wildcard = client.patch(url, json={"title": "Any"}, headers={"If-Match": "*"})
+    assert wildcard.status_code == 200
+    weak = client.patch(url, json={"title": "Weak"}, headers={"If-Match": 'W/"2"'})
+    assert weak.status_code == 412
+    listed = client.patch(url, json={}, headers={"If-Match": '"1", "2"'})
+    assert listed.status_code == 200
+    assert listed.headers["etag"] == '"2"'
+    assert client.patch(url, json={}, headers={"If-Match": '"1"'}).status_code == 412
+    missing = client.patch(
+        "/courses/missing", json={"title": "Gone"}, headers={"If-Match": '"1"'}
+    )
+    assert missing.status_code == 404
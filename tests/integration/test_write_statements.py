@@ -0,0 +1,108 @@
+"""Statement counts of the write routes, which read results via RETURNING."""
+
+import re
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from tests.conftest import build_course_payload
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+TABLE = re.compile(r"(?:INTO|FROM|UPDATE) (\w+)")
+
+
+def _verbs(statements):
+    """Each statement as its verb and first table, e.g. ``INSERT courses``."""
+    return [f"{s.split()[0]} {TABLE.search(s).group(1)}" for s in statements]
+
+
+def _draft_course():
+    payload = build_course_payload(status="draft", prerequisites=["Basic Linux"])
+    return client.post("/courses", json=payload).json()
+
+
+def test_create_course_is_one_insert(statements):
+    """Test that created_at/updated_at come back from the INSERT itself."""
+    payload = build_course_payload(status="draft", prerequisites=["Basic Linux"])
+    statements.clear()
+    response = client.post("/courses", json=payload)
+
+    assert response.status_code == 201
+    assert response.json()["created_at"] is not None
+    assert response.json()["enrollment_count"] == 0
+    assert _verbs(statements) == ["INSERT courses", "INSERT outbox_events"]
+    assert "RETURNING" in statements[0]
+
+
+def test_update_course_is_one_update(statements):
+    """Test that PATCH is a single UPDATE returning the row and its counts."""
+    course = _draft_course()
+    client.post(
+        f"/courses/{course['id']}/enrollments",
+        json={"name": "Ada", "email": "ada@example.com"},
+    )
+    statements.clear()
+    response = client.patch(f"/courses/{course['id']}", json={"title": "Renamed"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["title"] == "Renamed"
+    assert body["enrollment_count"] == 1
+    assert body["updated_at"] > course["updated_at"]
+    assert _verbs(statements) == ["UPDATE courses", "INSERT outbox_events"]
+
+
+def test_conditional_update_is_one_update(statements):
+    """Test that If-Match is checked by the UPDATE, not a prior SELECT."""
+    course = _draft_course()
+    statements.clear()
+    response = client.patch(
+        f"/courses/{course['id']}",
+        json={"title": "Renamed"},
+        headers={"If-Match": '"1"'},
+    )
+
+    assert response.status_code == 200
+    assert _verbs(statements) == ["UPDATE courses", "INSERT outbox_events"]
+    assert "version IN" in statements[0]
+
+
+def test_update_missing_course_is_one_statement(statements):
+    """Test that a PATCH of an unknown course fails on the UPDATE alone."""
+    statements.clear()
+    response = client.patch("/courses/missing", json={"title": "Renamed"})
+
+    assert response.status_code == 404
+    assert _verbs(statements) == ["UPDATE courses"]
+
+
+def test_child_inserts_skip_refresh(statements):
+    """Test that enrollments and labs are returned without a re-SELECT."""
+    course_id = _draft_course()["id"]
+    statements.clear()
+    enrolled = client.post(
+        f"/courses/{course_id}/enrollments",
+        json={"name": "Ada", "email": "ada@example.com"},
+    )
+    attached = client.post(
+        f"/courses/{course_id}/labs",
+        json={
+            "title": "Lab",
+            "resource_type": "yaml",
+            "resource_uri": "https://example.com/lab",
+        },
+    )
+
+    assert enrolled.status_code == attached.status_code == 201
+    assert enrolled.json()["created_at"] is not None
+    assert attached.json()["course_id"] == course_id
+    assert _verbs(statements) == [
+        "SELECT courses",
+        "INSERT enrollments",
+        "INSERT outbox_events",
+        "SELECT courses",
+        "INSERT lab_exercises",
+        "INSERT outbox_events",
+    ]
@@ -0,0 +1,94 @@
+"""Unit tests for admission control and its middleware."""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.admission import AdmissionController, AdmissionMiddleware
+
+
+async def test_controller_admits_up_to_max_concurrency():
+    """Test that free slots are granted immediately."""
+    controller = AdmissionController(max_concurrency=2, max_queue=0, queue_timeout=1)
+
+    assert await controller.acquire()
+    assert await controller.acquire()
+    assert controller.snapshot()["active"] == 2
+
+
+async def test_controller_rejects_when_queue_full():
+    """Test that requests beyond the queue bound are rejected at once."""
+    controller = AdmissionController(max_concurrency=1, max_queue=0, queue_timeout=1)
+    assert await controller.acquire()
+
+    assert not await controller.acquire()
+    assert controller.snapshot()["rejected_queue_full_total"] == 1
+
+
+async def test_controller_rejects_after_queue_deadline():
+    """Test that queued requests give up after the queue timeout."""
+    controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=0.05)
+    assert await controller.acquire()
+
+    assert not await controller.acquire()
+    stats = controller.snapshot()
+    assert stats["rejected_timeout_total"] == 1
+    assert stats["queued"] == 0
+
+
+async def test_controller_hands_slot_to_queued_request():
+    """Test that a released slot admits the next queued request."""
+    controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=1)
+    assert await controller.acquire()
+
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+    assert controller.snapshot()["queued"] == 1
+
+    controller.release()
+    assert await waiter
+    stats = controller.snapshot()
+    assert stats["active"] == 1
+    assert stats["admitted_total"] == 2
+
+
+def _app(controller):
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.get("/work")
+    async def work():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    app.add_middleware(AdmissionMiddleware, controller=controller, retry_after=3)
+    return app, release
+
+
+async def test_middleware_returns_503_with_retry_after_when_overloaded():
+    """Test that overload produces a fast 503 with Retry-After."""
+    controller = AdmissionController(max_concurrency=1, max_queue=0, queue_timeout=1)
+    app, release = _app(controller)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        in_flight = asyncio.create_task(client.get("/work"))
+        while controller.snapshot()["active"] == 0:
+            await asyncio.sleep(0)
+
+        rejected = await client.get("/work")
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "3"
+
+        # Exempt paths are served even while the worker is saturated.
+        assert (await client.get("/health")).status_code == 200
+
+        release.set()
+        assert (await in_flight).status_code == 200
+
+    assert controller.snapshot()["active"] == 0
@@ -0,0 +1,121 @@
+"""Unit tests for per-route deadline enforcement."""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.deadlines import (
+    DeadlineMiddleware,
+    current_deadline,
+    parse_route_timeouts,
+)
+
+
+def test_parse_route_timeouts():
+    """Test parsing of the ROUTE_TIMEOUTS setting."""
+    assert parse_route_timeouts("list_enrollments=60, get_course=2.5") == {
+        "list_enrollments": 60.0,
+        "get_course": 2.5,
+    }
+    assert parse_route_timeouts("") == {}
+
+
+def _app(default_timeout=None, route_timeouts=None):
+    app = FastAPI()
+    state = {"cancelled": False, "deadline": None}
+
+    @app.get("/slow")
+    async def slow():
+        state["deadline"] = current_deadline.get()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return {"ok": True}
+
+    @app.get("/fast")
+    async def fast():
+        state["deadline"] = current_deadline.get()
+        return {"ok": True}
+
+    app.add_middleware(
+        DeadlineMiddleware,
+        routes=app.router.routes,
+        default_timeout=default_timeout,
+        route_timeouts=route_timeouts or {},
+    )
+    return app, state
+
+
+async def _get(app, path):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path)
+
+
+async def test_deadline_exceeded_returns_structured_504():
+    """Test that a route over its deadline is cancelled with a 504."""
+    app, state = _app(route_timeouts={"slow": 0.05})
+
+    response = await _get(app, "/slow")
+    assert response.status_code == 504
+    assert response.json() == {
+        "detail": "Request deadline exceeded",
+        "route": "slow",
+        "timeout_seconds": 0.05,
+    }
+    assert state["cancelled"]
+
+
+async def test_deadline_is_visible_to_handler():
+    """Test that the handler sees the absolute deadline in the context."""
+    app, state = _app(default_timeout=10)
+
+    response = await _get(app, "/fast")
+    assert response.status_code == 200
+    assert state["deadline"] is not None
+
+
+async def test_zero_timeout_disables_deadline():
+    """Test that a per-route timeout of 0 turns enforcement off."""
+    app, state = _app(default_timeout=10, route_timeouts={"fast": 0})
+
+    assert (await _get(app, "/fast")).status_code == 200
+    assert state["deadline"] is None
+
+
+async def test_client_disconnect_cancels_handler():
+    """Test that in-flight work stops when the client goes away."""
+    app, state = _app(default_timeout=10)
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/slow",
+        "raw_path": b"/slow",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+    await app(scope, receive, send)
+
+    assert state["cancelled"]
+    assert sent == []
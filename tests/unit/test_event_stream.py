@@ -0,0 +1,52 @@
+"""Unit tests for SSE framing of course change events."""
+
+import json
+from datetime import UTC, datetime
+
+from app.api.routes.events import format_event
+from app.schemas import OutboxMessage
+
+
+def _message(event_type, payload):
+    return OutboxMessage(
+        id=42,
+        event_type=event_type,
+        aggregate_id="course-1",
+        payload=payload,
+        created_at=datetime(2026, 10, 19, tzinfo=UTC),
+    )
+
+
+def _data(frame: str) -> dict:
+    (line,) = [line for line in frame.splitlines() if line.startswith("data: ")]
+    return json.loads(line.removeprefix("data: "))
+
+
+def test_frame_carries_outbox_id_and_event_type():
+    """Test that the SSE id is the outbox id so clients can resume from it."""
+    frame = format_event(_message("lab.attached", {"lab": {"title": "Lab"}}))
+    assert frame.startswith("id: 42\nevent: lab.attached\n")
+    assert frame.endswith("\n\n")
+    assert _data(frame) == {"course_id": "course-1", "lab": {"title": "Lab"}}
+
+
+def test_enrollment_events_leave_out_learner_details():
+    """Test that learner names and emails are not broadcast."""
+    frame = format_event(
+        _message(
+            "enrollment.created",
+            {
+                "enrollment": {
+                    "id": "enrollment-1",
+                    "name": "Learner",
+                    "email": "learner@example.com",
+                    "created_at": "2026-10-19T00:00:00Z",
+                }
+            },
+        )
+    )
+    assert _data(frame) == {
+        "course_id": "course-1",
+        "enrollment_id": "enrollment-1",
+        "created_at": "2026-10-19T00:00:00Z",
+    }
@@ -0,0 +1,71 @@
+"""Unit tests for the in-memory catalog facet index."""
+
+import pytest
+
+from app.db import facets
+from app.db.facets import FacetIndex
+
+
+def _course(course_id, tags=(), category=None, difficulty="beginner", status="draft"):
+    return {
+        "course": {
+            "id": course_id,
+            "tags": list(tags),
+            "category": category,
+            "difficulty": difficulty,
+            "status": status,
+        }
+    }
+
+
+def _lab(course_id, resource_type):
+    return {"lab": {"course_id": course_id, "resource_type": resource_type}}
+
+
+@pytest.fixture
+def index():
+    index = FacetIndex()
+    index.apply("course.created", _course("a", ["docker", "helm"], "DevOps"))
+    index.apply("course.created", _course("b", ["docker"], status="published"))
+    index.apply("course.created", _course("c", ["excel"], "Office"))
+    index.apply("lab.attached", _lab("a", "yaml"))
+    index.apply("lab.attached", _lab("a", "yaml"))
+    index.apply("lab.attached", _lab("b", "link"))
+    return index
+
+
+def test_unfiltered_counts(index):
+    """Test that every course counts once per value it has."""
+    counts = index.counts({})
+    assert counts["tag"] == {"docker": 2, "helm": 1, "excel": 1}
+    assert counts["category"] == {"DevOps": 1, "Office": 1}
+    assert counts["resource_type"] == {"yaml": 1, "link": 1}
+
+
+def test_filters_intersect(index):
+    """Test that only courses matching every filter are counted."""
+    counts = index.counts({"tag": "docker", "status": "draft"})
+    assert counts["tag"] == {"docker": 1, "helm": 1}
+    assert counts["resource_type"] == {"yaml": 1}
+    assert index.counts({"tag": "missing"})["status"] == {}
+
+
+def test_large_matches_count_per_value(index, monkeypatch):
+    """Test that both filtered counting strategies agree."""
+    filters = {"difficulty": "beginner"}
+    scanned = index.counts(filters)
+    monkeypatch.setattr(facets, "SCAN_LIMIT", 0)
+    assert index.counts(filters) == scanned
+    assert scanned["tag"] == {"docker": 2, "helm": 1, "excel": 1}
+
+
+def test_update_keeps_labs_and_delete_evicts(index):
+    """Test that updates replace course values only, and deletes drop them."""
+    index.apply("course.updated", _course("a", ["terraform"], "DevOps"))
+    index.apply("course.deleted", _course("b"))
+    index.apply("lab.attached", _lab("b", "yaml"))
+
+    counts = index.counts({})
+    assert counts["tag"] == {"terraform": 1, "excel": 1}
+    assert counts["resource_type"] == {"yaml": 1}
+    assert len(index) == 2
@@ -0,0 +1,18 @@
+"""Unit tests for job retry backoff."""
+
+from app.jobs import retry_delay
+
+
+def test_retry_delay_doubles_per_attempt():
+    """Test that each failed attempt doubles the wait before the next one."""
+    assert [retry_delay(attempt, 2.0, 300) for attempt in (1, 2, 3, 4)] == [
+        2.0,
+        4.0,
+        8.0,
+        16.0,
+    ]
+
+
+def test_retry_delay_is_capped():
+    """Test that backoff never exceeds the configured maximum."""
+    assert retry_delay(20, 2.0, 300) == 300
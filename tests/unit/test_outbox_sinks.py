@@ -0,0 +1,28 @@
+"""Unit tests for outbox sink configuration."""
+
+import pytest
+
+from app.outbox import FileSink, HttpSink, parse_sinks
+
+
+def test_parse_sinks_builds_file_and_http_sinks():
+    """Test that file and webhook URLs map to their sink types."""
+    file_sink, http_sink = parse_sinks(
+        "file:///tmp/events.jsonl, https://crm.example.com/hooks", 3.0
+    )
+    assert isinstance(file_sink, FileSink)
+    assert str(file_sink.path) == "/tmp/events.jsonl"
+    assert isinstance(http_sink, HttpSink)
+    assert http_sink.url == "https://crm.example.com/hooks"
+    assert http_sink.timeout == 3.0
+
+
+def test_parse_sinks_allows_none():
+    """Test that an empty setting configures no sinks."""
+    assert parse_sinks("", 5.0) == []
+
+
+def test_parse_sinks_rejects_unknown_scheme():
+    """Test that a misconfigured sink fails fast."""
+    with pytest.raises(ValueError, match="Unsupported outbox sink"):
+        parse_sinks("kafka://broker:9092/events", 5.0)
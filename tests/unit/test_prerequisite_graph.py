@@ -0,0 +1,53 @@
+"""Unit tests for the in-memory prerequisite graph."""
+
+import pytest
+
+from app.db.prerequisites import (
+    PrerequisiteCycleError,
+    PrerequisiteGraph,
+    prerequisite_ids,
+)
+
+A, B, C, D = (f"00000000-0000-4000-8000-00000000000{n}" for n in range(1, 5))
+
+
+def _course(course_id, *prerequisites):
+    return {"course": {"id": course_id, "prerequisites": list(prerequisites)}}
+
+
+@pytest.fixture
+def graph():
+    graph = PrerequisiteGraph()
+    # D requires B and C, both of which require A.
+    graph.apply("course.created", _course(A, "Basic Linux"))
+    graph.apply("course.created", _course(B, A))
+    graph.apply("course.created", _course(C, A, "Git"))
+    graph.apply("course.created", _course(D, B, C))
+    return graph
+
+
+def test_prerequisite_ids_keeps_course_ids_in_order():
+    """Test that free-form entries are skipped and ids normalized and deduped."""
+    assert prerequisite_ids(["Git", B, A.upper(), B, ""]) == [B, A]
+
+
+def test_path_orders_requirements_first(graph):
+    """Test that each course follows everything it requires."""
+    assert graph.path(D) == [A, B, C, D]
+    assert graph.path(A) == [A]
+    assert graph.path("unknown") == ["unknown"]
+
+
+def test_cycle_reports_the_loop(graph):
+    """Test that edges closing a loop are found, and harmless ones are not."""
+    assert graph.cycle(A, [D]) in ([A, D, B, A], [A, D, C, A])
+    assert graph.cycle(A, [A]) == [A, A]
+    assert graph.cycle(B, [C, "Docker"]) is None
+
+
+def test_path_raises_on_existing_cycle(graph):
+    """Test that a cycle that slipped in is reported, not looped over."""
+    graph.apply("course.updated", _course(A, D))
+    with pytest.raises(PrerequisiteCycleError) as exc:
+        graph.path(D)
+    assert exc.value.cycle[0] == exc.value.cycle[-1]
@@ -0,0 +1,141 @@
+"""Unit tests for the production server entry point helpers."""
+
+import signal
+import socket
+import time
+
+import pytest
+
+from app import server
+from app.core.config import settings
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    [
+        ("max 100000\n", None),
+        ("200000 100000\n", 2),
+        ("150000 100000\n", 2),
+        ("50000 100000\n", 1),
+    ],
+)
+def test_cgroup_cpu_limit(tmp_path, content, expected):
+    """Test parsing of cgroup v2 cpu.max quotas into whole CPUs."""
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text(content)
+    assert server.cgroup_cpu_limit(cpu_max) == expected
+
+
+def test_cgroup_cpu_limit_missing_file(tmp_path):
+    """Test that a missing cgroup file means no limit."""
+    assert server.cgroup_cpu_limit(tmp_path / "absent") is None
+
+
+def test_available_cpus_honours_container_quota(monkeypatch):
+    """Test that the container quota caps the affinity CPU count."""
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)))
+    monkeypatch.setattr(server, "cgroup_cpu_limit", lambda: 2)
+    assert server.available_cpus() == 2
+
+
+def test_default_workers_prefers_web_concurrency(monkeypatch):
+    """Test that WEB_CONCURRENCY overrides CPU detection."""
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    assert server.default_workers() == 3
+
+
+def test_default_workers_uses_available_cpus(monkeypatch):
+    """Test that workers default to one per available CPU."""
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    monkeypatch.setattr(server, "available_cpus", lambda: 4)
+    assert server.default_workers() == 4
+
+
+@pytest.mark.parametrize(
+    ("budget", "workers", "reserved", "expected"),
+    [(20, 4, 0, 5), (9, 3, 0, 3), (20, 4, 1, 4), (2, 2, 0, 1)],
+)
+def test_pool_size_per_worker(budget, workers, reserved, expected):
+    """Test splitting the connection budget across workers."""
+    assert server.pool_size_per_worker(budget, workers, reserved) == expected
+
+
+def test_pool_size_per_worker_warns_about_unused_connections(caplog):
+    """Test that a budget that does not divide evenly is reported."""
+    assert server.pool_size_per_worker(10, 3) == 3
+    assert "1 of the 10 budgeted connection(s) stay unused" in caplog.text
+
+
+@pytest.mark.parametrize(("budget", "reserved"), [(2, 0), (7, 1)])
+def test_pool_size_per_worker_rejects_too_small_budget(budget, reserved):
+    """Test that every worker must get at least one pooled connection."""
+    with pytest.raises(ValueError, match="too small for 4 worker"):
+        server.pool_size_per_worker(budget, 4, reserved)
+
+
+@pytest.mark.parametrize(
+    ("url", "pgbouncer", "expected"),
+    [
+        ("postgresql+asyncpg://u:p@db/labforge", False, 1),
+        ("postgresql+asyncpg://u:p@db/labforge", True, 0),
+        ("sqlite+aiosqlite:///./labforge.db", False, 0),
+    ],
+)
+def test_reserved_connections_counts_the_listen_connection(
+    monkeypatch, url, pgbouncer, expected
+):
+    """Test that only a listening change hub takes a connection off the pool."""
+    monkeypatch.setattr(settings, "database_url", url)
+    monkeypatch.setattr(settings, "db_pgbouncer", pgbouncer)
+    assert server.reserved_connections() == expected
+
+
+def test_event_loop_and_http_fall_back_when_missing(monkeypatch):
+    """Test that the stdlib loop and h11 are used when extras are absent."""
+    monkeypatch.setattr(server, "_installed", lambda module: False)
+    assert server.event_loop() == "asyncio"
+    assert server.http_protocol() == "h11"
+
+
+def test_event_loop_and_http_prefer_fast_implementations(monkeypatch):
+    """Test that uvloop and httptools are forced when installed."""
+    monkeypatch.setattr(server, "_installed", lambda module: True)
+    assert server.event_loop() == "uvloop"
+    assert server.http_protocol() == "httptools"
+
+
+@pytest.fixture
+def restore_signals():
+    """Keep the supervisor's signal handlers out of the test process."""
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    yield
+    for sig, handler in handlers.items():
+        signal.signal(sig, handler)
+
+
+def test_supervisor_backs_off_and_gives_up_on_crash_loop(monkeypatch, restore_signals):
+    """Test that workers crashing on start are retried with backoff, then abandoned."""
+
+    def crash(app, sock, graceful_timeout):
+        raise RuntimeError("cannot start")
+
+    monkeypatch.setattr(server, "_run_worker", crash)
+    supervisor = server.Supervisor(
+        None,
+        socket.socket(),
+        workers=1,
+        graceful_timeout=1,
+        restart_backoff=0.2,
+        max_quick_failures=3,
+    )
+    spawned = []
+    spawn = supervisor.spawn
+    monkeypatch.setattr(
+        supervisor, "spawn", lambda: (spawned.append(time.monotonic()), spawn())
+    )
+
+    assert supervisor.run() == 1
+    assert len(spawned) == 3
+    # Restarts wait 0.2s, then 0.4s.
+    assert spawned[1] - spawned[0] >= 0.2
+    assert spawned[2] - spawned[1] >= 0.4
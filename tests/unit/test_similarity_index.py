@@ -0,0 +1,74 @@
+"""Unit tests for the in-memory course similarity index."""
+
+import math
+
+import pytest
+
+from app.db import similarity
+from app.db.similarity import SimilarityIndex
+
+
+def _course(course_id, tags=(), category=None, prerequisites=(), status="published"):
+    return {
+        "course": {
+            "id": course_id,
+            "tags": list(tags),
+            "category": category,
+            "prerequisites": list(prerequisites),
+            "status": status,
+        }
+    }
+
+
+def _enroll(course_id, email):
+    return {"enrollment": {"course_id": course_id, "email": email}}
+
+
+@pytest.fixture
+def index():
+    index = SimilarityIndex()
+    index.apply("course.created", _course("a", ["docker", "helm"], "DevOps"))
+    index.apply("course.created", _course("b", ["Docker"], "devops"))
+    index.apply("course.created", _course("c", ["excel"], "Office"))
+    return index
+
+
+def test_scores_are_weighted_cosine(index):
+    """Test scores against the cosine of the weighted feature vectors."""
+    # a = {tag:docker 2, tag:helm 2, category:devops 1}; b shares docker and devops.
+    expected = (4 + 1) / (math.sqrt(4 + 4 + 1) * math.sqrt(4 + 1))
+    assert index.similar("a", 10) == [("b", pytest.approx(expected))]
+    assert index.similar("c", 10) == []
+
+
+def test_enrollments_extend_vectors_incrementally(index):
+    """Test that learners extend vectors, case-insensitively and once each."""
+    for course_id in ("a", "c"):
+        index.apply("enrollment.created", _enroll(course_id, "Ada@example.com"))
+    index.apply("enrollment.created", _enroll("a", "ada@example.com"))
+
+    expected = 1 / (math.sqrt(4 + 4 + 1 + 1) * math.sqrt(4 + 1 + 1))
+    assert dict(index.similar("a", 10))["c"] == pytest.approx(expected)
+
+
+def test_updates_and_status_changes(index):
+    """Test that updates replace features and unpublished courses are skipped."""
+    index.apply("course.updated", _course("c", ["helm"], "Office"))
+    assert [course for course, _ in index.similar("a", 10)] == ["b", "c"]
+
+    index.apply("course.updated", _course("b", ["docker"], "DevOps", status="draft"))
+    index.evict("c")
+    assert index.similar("a", 10) == []
+
+
+def test_common_features_only_score_candidates(monkeypatch):
+    """Test that features past the candidate cap rescore but do not add courses."""
+    monkeypatch.setattr(similarity, "MAX_CANDIDATES", 2)
+    index = SimilarityIndex()
+    index.apply("course.created", _course("q", ["rare", "common"]))
+    index.apply("course.created", _course("r", ["rare", "common"]))
+    for i in range(5):
+        index.apply("course.created", _course(f"x{i}", ["common"]))
+
+    # "rare" makes r the only candidate; "common" still adds to its score.
+    assert index.similar("q", 10) == [("r", pytest.approx(1.0))]
@@ -0,0 +1,34 @@
+"""Unit tests for the slow query log."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.slow_queries import SlowQueryLog, redact_parameters
+
+
+def test_redacts_named_parameters_to_type_names():
+    """Test that named parameter values are replaced by their types."""
+    assert redact_parameters({"email": "a@example.com", "limit": 10}) == {
+        "email": "str",
+        "limit": "int",
+    }
+
+
+def test_redacts_positional_parameters_to_type_names():
+    """Test that positional parameter values are replaced by their types."""
+    assert redact_parameters(("secret", None)) == ["str", "NoneType"]
+
+
+def test_failed_statements_leave_no_state_on_the_connection():
+    """Test that timing a statement that raises leaks nothing onto the connection."""
+    engine = create_engine("sqlite://")
+    log = SlowQueryLog(threshold_ms=0, explain_sample_rate=0, size=10)
+    log.install(engine)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info == {}
+    assert [entry["statement"] for entry in log.snapshot()] == ["SELECT 1"]
@@ -0,0 +1,132 @@
+"""Unit tests for the tuned SQLite profile."""
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+from app.core.config import Settings
+from app.db import session as db_session
+from app.db import sqlite_tuning
+from app.db.session import engine_options
+from app.main import _catalog_snapshotter
+
+
+def _settings(tmp_path, **overrides) -> Settings:
+    return Settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'labforge.db'}",
+        db_sqlite_tuned=True,
+        **overrides,
+    )
+
+
+def _engine(config: Settings, *, read_only: bool):
+    engine = create_async_engine(
+        config.database_url, **engine_options(config, read_only=read_only)
+    )
+    sqlite_tuning.install(engine.sync_engine, config, read_only=read_only)
+    return engine
+
+
+def _request(method: str) -> Request:
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+def test_profile_needs_opt_in_and_a_database_file(tmp_path):
+    """Test that only an opted-in file database gets the tuned profile."""
+    assert sqlite_tuning.sqlite_tuned(_settings(tmp_path))
+    assert not sqlite_tuning.sqlite_tuned(
+        _settings(tmp_path).model_copy(update={"db_sqlite_tuned": False})
+    )
+    assert not sqlite_tuning.sqlite_tuned(
+        Settings(database_url="sqlite+aiosqlite:///:memory:", db_sqlite_tuned=True)
+    )
+
+
+def test_one_writer_connection_and_a_read_pool(tmp_path):
+    """Test that writes get a single connection and reads a pool."""
+    config = _settings(tmp_path, db_sqlite_read_pool_size=6)
+    writer = engine_options(config)
+    reader = engine_options(config, read_only=True)
+    assert (writer["pool_size"], writer["max_overflow"]) == (1, 0)
+    assert (reader["pool_size"], reader["max_overflow"]) == (6, 0)
+
+
+async def test_pragmas_applied_on_connect(tmp_path):
+    """Test that every connection runs with the configured pragmas."""
+    config = _settings(tmp_path, db_sqlite_busy_timeout_ms=1234)
+    writer = _engine(config, read_only=False)
+    reader = _engine(config, read_only=True)
+    try:
+        async with writer.connect() as conn:
+            assert await conn.scalar(text("PRAGMA journal_mode")) == "wal"
+            assert await conn.scalar(text("PRAGMA synchronous")) == 1
+            assert await conn.scalar(text("PRAGMA busy_timeout")) == 1234
+            assert await conn.scalar(text("PRAGMA query_only")) == 0
+            raw = (await conn.get_raw_connection()).driver_connection
+            assert raw._conn.isolation_level == "IMMEDIATE"
+        async with reader.connect() as conn:
+            assert await conn.scalar(text("PRAGMA query_only")) == 1
+    finally:
+        await reader.dispose()
+        await writer.dispose()
+
+
+async def test_readers_see_a_snapshot_during_a_write(tmp_path):
+    """Test that a read is not blocked by, and cannot see, an open write."""
+    config = _settings(tmp_path)
+    writer = _engine(config, read_only=False)
+    reader = _engine(config, read_only=True)
+    try:
+        async with writer.begin() as conn:
+            await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        async with writer.begin() as conn:
+            await conn.execute(text("INSERT INTO items VALUES (1)"))
+            async with reader.connect() as read_conn:
+                count = await read_conn.scalar(text("SELECT count(*) FROM items"))
+            assert count == 0
+        async with reader.connect() as read_conn:
+            assert await read_conn.scalar(text("SELECT count(*) FROM items")) == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await read_conn.execute(text("INSERT INTO items VALUES (2)"))
+    finally:
+        await reader.dispose()
+        await writer.dispose()
+
+
+async def test_get_session_routes_reads_to_the_read_pool(tmp_path, monkeypatch):
+    """Test that GET requests use the read engine and writes the writer."""
+    monkeypatch.setattr(db_session, "settings", _settings(tmp_path))
+    monkeypatch.setattr(db_session, "_engine", None)
+    monkeypatch.setattr(db_session, "_read_engine", None)
+    for factory in (db_session.async_session_factory, db_session.read_session_factory):
+        monkeypatch.setattr(factory, "kw", dict(factory.kw))
+    try:
+        binds = {}
+        for method in ("GET", "POST"):
+            sessions = db_session.get_session(_request(method))
+            binds[method] = (await anext(sessions)).bind
+            await sessions.aclose()
+        assert binds["GET"] is db_session.get_read_engine()
+        assert binds["POST"] is db_session.get_engine()
+        assert binds["GET"] is not binds["POST"]
+    finally:
+        await db_session.dispose_engine()
+
+
+async def test_catalog_snapshotter_renders_on_the_read_pool(tmp_path, monkeypatch):
+    """Test that the read-only catalog rebuild leaves the writer to requests."""
+    monkeypatch.setattr(db_session, "settings", _settings(tmp_path))
+    monkeypatch.setattr(db_session, "_engine", None)
+    monkeypatch.setattr(db_session, "_read_engine", None)
+    for factory in (db_session.async_session_factory, db_session.read_session_factory):
+        monkeypatch.setattr(factory, "kw", dict(factory.kw))
+    try:
+        snapshotter = _catalog_snapshotter(FastAPI())
+        async with snapshotter.sessions() as session:
+            assert session.bind is db_session.get_read_engine()
+            assert session.bind is not db_session.get_engine()
+    finally:
+        await db_session.dispose_engine()